@@ -0,0 +1,48 @@
+"""review counters
+
+Revision ID: 3f1c9a7d2b40
+Revises: 869608b1f81a
+Create Date: 2026-10-18 09:15:12.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b40'
+down_revision: Union[str, Sequence[str], None] = '869608b1f81a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('review_counters',
+    sa.Column('scope', sa.String(length=64), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('scope')
+    )
+    # Backfill from existing reviews: per status, per author and per author+status.
+    op.execute(
+        "INSERT INTO review_counters (scope, count) "
+        "SELECT 'status:' || lower(CAST(status AS VARCHAR)), count(*) "
+        "FROM reviews GROUP BY status"
+    )
+    op.execute(
+        "INSERT INTO review_counters (scope, count) "
+        "SELECT 'user:' || CAST(user_id AS VARCHAR), count(*) "
+        "FROM reviews GROUP BY user_id"
+    )
+    op.execute(
+        "INSERT INTO review_counters (scope, count) "
+        "SELECT 'user:' || CAST(user_id AS VARCHAR) || ':status:' || lower(CAST(status AS VARCHAR)), count(*) "
+        "FROM reviews GROUP BY user_id, status"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('review_counters')
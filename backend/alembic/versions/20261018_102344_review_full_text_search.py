@@ -0,0 +1,75 @@
+"""review full-text search
+
+Revision ID: a84e0c5f71d2
+Revises: 3f1c9a7d2b40
+Create Date: 2026-10-18 10:23:44.905127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a84e0c5f71d2'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("""
+            ALTER TABLE reviews ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('russian', coalesce(title, '') || ' ' || coalesce(movie_title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(movie_title, '')), 'A') ||
+                setweight(to_tsvector('russian', coalesce(content, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(content, '')), 'B')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_reviews_search_vector ON reviews USING gin (search_vector)")
+    elif dialect == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE reviews_fts USING fts5(
+                title, movie_title, content,
+                content='reviews', content_rowid='id',
+                tokenize='porter unicode61 remove_diacritics 2'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER reviews_fts_ai AFTER INSERT ON reviews BEGIN
+                INSERT INTO reviews_fts (rowid, title, movie_title, content)
+                VALUES (new.id, new.title, new.movie_title, new.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER reviews_fts_ad AFTER DELETE ON reviews BEGIN
+                INSERT INTO reviews_fts (reviews_fts, rowid, title, movie_title, content)
+                VALUES ('delete', old.id, old.title, old.movie_title, old.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER reviews_fts_au AFTER UPDATE OF title, movie_title, content ON reviews BEGIN
+                INSERT INTO reviews_fts (reviews_fts, rowid, title, movie_title, content)
+                VALUES ('delete', old.id, old.title, old.movie_title, old.content);
+                INSERT INTO reviews_fts (rowid, title, movie_title, content)
+                VALUES (new.id, new.title, new.movie_title, new.content);
+            END
+        """)
+        op.execute("INSERT INTO reviews_fts (reviews_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_reviews_search_vector', table_name='reviews')
+        op.drop_column('reviews', 'search_vector')
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS reviews_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS reviews_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS reviews_fts_ai")
+        op.execute("DROP TABLE IF EXISTS reviews_fts")
@@ -0,0 +1,35 @@
+"""review title trigram indexes
+
+Revision ID: c27d94e1a3b8
+Revises: a84e0c5f71d2
+Create Date: 2026-10-18 11:42:07.318546
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27d94e1a3b8'
+down_revision: Union[str, Sequence[str], None] = 'a84e0c5f71d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_reviews_title_trgm ON reviews USING gin (title gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_reviews_movie_title_trgm ON reviews USING gin (movie_title gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_reviews_movie_title_trgm', table_name='reviews')
+    op.drop_index('ix_reviews_title_trgm', table_name='reviews')
@@ -0,0 +1,65 @@
+"""feed query indexes
+
+Revision ID: 5e0b7f3c9d16
+Revises: c27d94e1a3b8
+Create Date: 2026-10-18 13:05:18.702944
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0b7f3c9d16'
+down_revision: Union[str, Sequence[str], None] = 'c27d94e1a3b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+APPROVED_ONLY = sa.text("status = 'APPROVED'")
+PENDING_ONLY = sa.text("status = 'PENDING'")
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ('ix_reviews_approved_created_at', 'reviews', ['created_at', 'id'], APPROVED_ONLY),
+    ('ix_reviews_approved_likes', 'reviews', ['likes', 'id'], APPROVED_ONLY),
+    ('ix_reviews_user_created_at', 'reviews', ['user_id', 'created_at', 'id'], None),
+    ('ix_reviews_user_likes', 'reviews', ['user_id', 'likes', 'id'], None),
+    ('ix_reviews_pending_created_at', 'reviews', ['created_at', 'id'], PENDING_ONLY),
+    ('ix_likes_review_id', 'likes', ['review_id'], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=where,
+                sqlite_where=where,
+                if_not_exists=True,
+            )
+        # Superseded by ix_reviews_user_created_at, which leads with user_id.
+        op.drop_index(
+            'ix_reviews_user_id', table_name='reviews',
+            postgresql_concurrently=True, if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_reviews_user_id', 'reviews', ['user_id'], unique=False,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
@@ -0,0 +1,36 @@
+"""review like deltas
+
+Revision ID: 4d8b2f6a1c39
+Revises: 9a4c1e7f2b53
+Create Date: 2026-10-18 16:30:27.504118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8b2f6a1c39'
+down_revision: Union[str, Sequence[str], None] = '9a4c1e7f2b53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('review_like_deltas',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('review_id', sa.Integer(), nullable=False),
+    sa.Column('delta', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['review_id'], ['reviews.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_review_like_deltas_review_id'), 'review_like_deltas', ['review_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_review_like_deltas_review_id'), table_name='review_like_deltas')
+    op.drop_table('review_like_deltas')
@@ -0,0 +1,37 @@
+"""moderation claims
+
+Revision ID: b61e3a9c0d74
+Revises: 4d8b2f6a1c39
+Create Date: 2026-10-18 17:18:46.091352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b61e3a9c0d74'
+down_revision: Union[str, Sequence[str], None] = '4d8b2f6a1c39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('moderation_claims',
+    sa.Column('review_id', sa.Integer(), nullable=False),
+    sa.Column('moderator_id', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['moderator_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['review_id'], ['reviews.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('review_id')
+    )
+    op.create_index(op.f('ix_moderation_claims_moderator_id'), 'moderation_claims', ['moderator_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_moderation_claims_moderator_id'), table_name='moderation_claims')
+    op.drop_table('moderation_claims')
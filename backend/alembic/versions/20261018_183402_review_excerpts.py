@@ -0,0 +1,47 @@
+"""review excerpts
+
+Revision ID: e3f9a5b2c810
+Revises: b61e3a9c0d74
+Create Date: 2026-10-18 18:34:02.665481
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f9a5b2c810'
+down_revision: Union[str, Sequence[str], None] = 'b61e3a9c0d74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same rule as app.db.models.make_excerpt: first 300 characters, trailing
+# spaces trimmed, ellipsis appended when the content was cut.
+EXCERPT_LENGTH = 300
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reviews', sa.Column('excerpt', sa.String(length=EXCERPT_LENGTH + 1), nullable=True))
+    op.add_column('reviews', sa.Column('content_length', sa.Integer(), nullable=True))
+    op.execute(
+        f"""
+        UPDATE reviews SET
+            content_length = length(content),
+            excerpt = CASE
+                WHEN length(content) > {EXCERPT_LENGTH}
+                THEN rtrim(substr(content, 1, {EXCERPT_LENGTH}), ' ') || '…'
+                ELSE content
+            END
+        """
+    )
+    op.alter_column('reviews', 'excerpt', nullable=False)
+    op.alter_column('reviews', 'content_length', nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('reviews', 'content_length')
+    op.drop_column('reviews', 'excerpt')
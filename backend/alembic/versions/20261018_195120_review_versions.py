@@ -0,0 +1,28 @@
+"""review versions
+
+Revision ID: 7c2e8d4b9f15
+Revises: e3f9a5b2c810
+Create Date: 2026-10-18 19:51:20.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e8d4b9f15'
+down_revision: Union[str, Sequence[str], None] = 'e3f9a5b2c810'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reviews', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('reviews', 'version')
@@ -1,8 +1,9 @@
 from fastapi import APIRouter
-from app.api.endpoints import auth, users, reviews
+from app.api.endpoints import auth, users, reviews, system
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(reviews.router, prefix="/reviews", tags=["reviews"])
+api_router.include_router(system.router, prefix="/system", tags=["system"])
@@ -1,39 +1,62 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import app.schemas.user as user_schemas
+from app.services.async_service import AsyncService
+from app.services.auth_service import AuthService
 from app.services.user_service import UserService
 import app.db.models as models
-from app.db.session import get_db
-from app.dependencies import get_current_user
+from app.db.session import get_async_db
+from app.dependencies import get_current_user, get_read_db, get_token_claims
+from app.utils.query_budget import query_budget
 
 
 router = APIRouter(tags=["auth"])
 
 
-def get_user_service(db: Session = Depends(get_db)) -> UserService:
-    return UserService(db)
+def get_async_user_service(db: AsyncSession = Depends(get_read_db)) -> AsyncService[UserService]:
+    return AsyncService(db, UserService)
+
+
+def get_async_user_writer(db: AsyncSession = Depends(get_async_db)) -> AsyncService[UserService]:
+    return AsyncService(db, UserService)
+
+
+def get_auth_service(db: AsyncSession = Depends(get_async_db)) -> AuthService:
+    return AuthService(AsyncService(db, UserService))
 
 
 @router.post("/register", response_model=user_schemas.Token, status_code=status.HTTP_201_CREATED)
-def register_user(
+@query_budget(5)
+async def register_user(
     user_in: user_schemas.UserCreate,
-    user_service: UserService = Depends(get_user_service)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
-    return user_service.register_user(user_in)
+    return await auth_service.register_user(user_in)
 
 
 @router.post("/login", response_model=user_schemas.Token)
-def login_user(
+@query_budget(2)
+async def login_user(
     user_in: user_schemas.UserCreate,
-    user_service: UserService = Depends(get_user_service)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
-    return user_service.login_user(user_in)
+    return await auth_service.login_user(user_in)
 
 
 @router.get("/me", response_model=user_schemas.UserOut)
-def get_current_user_info(
+@query_budget(3)
+async def get_current_user_info(
     current_user: models.User = Depends(get_current_user),
-    user_service: UserService = Depends(get_user_service)
+    user_service: AsyncService[UserService] = Depends(get_async_user_service)
+):
+    return await user_service.call(UserService.get_current_user_info, current_user)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(5)
+async def logout_user(
+    claims: dict = Depends(get_token_claims),
+    user_service: AsyncService[UserService] = Depends(get_async_user_writer)
 ):
-    return user_service.get_current_user_info(current_user)
+    await user_service.call(UserService.logout, claims)
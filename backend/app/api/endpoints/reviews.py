@@ -1,111 +1,318 @@
-from fastapi import APIRouter, Depends, Path, status
-from typing import Optional
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, Path, Query, Response, status
+from typing import Any, Dict, Mapping, Optional, Type, Union
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import app.schemas.review as review_schemas
-from app.dependencies import get_current_user, get_current_admin, get_current_user_optional
+from app.api.compression import choose_encoding, compress
+from app.api.responses import (
+    encoded_json_response,
+    json_response,
+    model_json,
+    model_response,
+    not_modified
+)
+from app.core.config import settings
+from app.dependencies import (
+    get_current_user,
+    get_current_admin,
+    get_current_user_optional,
+    get_read_db,
+    mark_recent_writer
+)
+from app.services.async_service import AsyncService
 from app.services.review_service import ReviewService
-from app.db.session import get_db
+from app.db.session import get_async_db
+from app.utils.etag import etag_matches, make_etag
+from app.utils.feed_cache import public_feed_cache
+from app.utils.fields import parse_fields
+from app.utils.query_budget import query_budget
 import app.db.models as models
 
 
 router = APIRouter(tags=["reviews"])
 
 
-def get_review_service(db: Session = Depends(get_db)) -> ReviewService:
-    return ReviewService(db)
+def get_review_service(db: AsyncSession = Depends(get_async_db)) -> AsyncService[ReviewService]:
+    return AsyncService(db, ReviewService)
+
+
+def get_review_reader(db: AsyncSession = Depends(get_read_db)) -> AsyncService[ReviewService]:
+    return AsyncService(db, ReviewService)
+
+
+def get_feed_reader(
+    primary: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_read_db)
+) -> AsyncService[ReviewService]:
+    # A tagged page must be at least as new as the version in its tag. The
+    # version moves on the primary, so a lagging replica could serve an older
+    # page under the new tag and 304s would keep it alive until the next
+    # bump; tagged feeds are read from the primary. Anonymous pages are
+    # cached in the shared tier, so it sees about one query per page and
+    # version.
+    db = primary if public_feed_cache.issues_validators else read_db
+    return AsyncService(db, ReviewService)
+
+
+def _page_include(fields: Optional[str], model: Type[BaseModel]) -> Optional[Dict[str, Any]]:
+    # Rows of a sparse page are built without the unselected fields; the
+    # include keeps defaults such as is_liked=null out of the payload too.
+    selected = parse_fields(fields, model)
+    if selected is None:
+        return None
+    return {"reviews": {"__all__": set(selected)}, "pagination": True, "cursor": True}
+
+
+def _feed_etag(params: BaseModel, current_user: Optional[models.User]) -> Optional[str]:
+    # The feed version moves on every change to the public feed, so the tag
+    # is known without touching the database. Without a shared version store
+    # no worker can vouch for the others' writes, and no tag is issued.
+    validator = public_feed_cache.validator()
+    if validator is None:
+        return None
+    return make_etag(
+        "feed",
+        validator,
+        public_feed_cache.normalize(params),
+        current_user.id if current_user else None
+    )
+
+
+def _cached_feed_response(
+    cache_key: str,
+    body: Union[str, bytes],
+    encoding: Optional[str],
+    headers: Mapping[str, str]
+) -> Response:
+    # Anonymous pages are compressed once per cache entry; the compression
+    # middleware passes responses that already have a Content-Encoding.
+    if encoding is not None:
+        encoded = public_feed_cache.lookup_encoded(cache_key, encoding)
+        if encoded is not None:
+            return encoded_json_response(encoded, encoding, headers)
+    
+    body = body.encode() if isinstance(body, str) else body
+    if encoding is None or len(body) < settings.COMPRESSION_MINIMUM_SIZE:
+        return json_response(body, headers)
+    encoded = compress(body, encoding)
+    public_feed_cache.store_encoded(cache_key, encoding, encoded)
+    return encoded_json_response(encoded, encoding, headers)
 
 
 @router.get("/public", response_model=review_schemas.PaginatedReviewsResponse)
-def get_public_reviews(
+@query_budget(6)
+async def get_public_reviews(
     params: review_schemas.PublicPaginationParams = Depends(),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
     current_user: Optional[models.User] = Depends(get_current_user_optional),
-    review_service: ReviewService = Depends(get_review_service)
+    review_service: AsyncService[ReviewService] = Depends(get_feed_reader)
 ):
-    return review_service.get_public_reviews(params, current_user)
+    include = _page_include(params.fields, review_schemas.ReviewResponse)
+    etag = _feed_etag(params, current_user)
+    if etag is not None and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    etag_headers = {"ETag": etag} if etag is not None else {}
+    
+    if current_user is not None:
+        return model_response(
+            await review_service.call(ReviewService.get_public_reviews, params, current_user),
+            headers=etag_headers,
+            include=include
+        )
+    
+    # Anonymous pages are identical for every visitor. The session is only
+    # opened lazily, so a hit never reaches the database.
+    encoding = choose_encoding(accept_encoding) if settings.COMPRESSION_ENABLED else None
+    cache_key, cached = public_feed_cache.lookup(params)
+    if cached is not None:
+        return _cached_feed_response(cache_key, cached, encoding, {"X-Cache": "HIT", **etag_headers})
+    
+    feed = await review_service.call(ReviewService.get_public_reviews, params, None)
+    body = model_json(feed, include)
+    public_feed_cache.store(cache_key, body.decode())
+    return _cached_feed_response(cache_key, body, encoding, {"X-Cache": "MISS", **etag_headers})
 
 
 @router.get("/my", response_model=review_schemas.PaginatedMyReviewsResponse)
-def get_my_reviews(
+@query_budget(6)
+async def get_my_reviews(
     params: review_schemas.PaginationParams = Depends(),
     current_user: models.User = Depends(get_current_user),
-    review_service: ReviewService = Depends(get_review_service)
+    review_service: AsyncService[ReviewService] = Depends(get_review_reader)
 ):
-    return review_service.get_my_reviews(params, current_user)
+    return model_response(
+        await review_service.call(ReviewService.get_my_reviews, params, current_user),
+        include=_page_include(params.fields, review_schemas.MyReviewResponse)
+    )
 
 
 @router.get("/moderation", response_model=review_schemas.PaginatedReviewsResponse)
-def get_moderation_reviews(
+@query_budget(5)
+async def get_moderation_reviews(
     params: review_schemas.PublicPaginationParams = Depends(),
     current_user: models.User = Depends(get_current_admin),
-    review_service: ReviewService = Depends(get_review_service)
+    review_service: AsyncService[ReviewService] = Depends(get_review_reader)
+):
+    return model_response(
+        await review_service.call(ReviewService.get_moderation_reviews, params),
+        include=_page_include(params.fields, review_schemas.ReviewResponse)
+    )
+
+
+@router.post(
+    "/moderation/bulk",
+    response_model=review_schemas.BulkModerationResponse,
+    dependencies=[Depends(mark_recent_writer)]
+)
+async def bulk_moderate_reviews(
+    request: review_schemas.BulkModerationRequest,
+    current_user: models.User = Depends(get_current_admin),
+    review_service: AsyncService[ReviewService] = Depends(get_review_service)
+):
+    return await review_service.call(ReviewService.bulk_moderate, request)
+
+
+@router.post(
+    "/moderation/claim",
+    response_model=review_schemas.ModerationClaimResponse,
+    dependencies=[Depends(mark_recent_writer)]
+)
+@query_budget(6)
+async def claim_moderation_reviews(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: models.User = Depends(get_current_admin),
+    review_service: AsyncService[ReviewService] = Depends(get_review_service)
+):
+    return model_response(
+        await review_service.call(ReviewService.claim_moderation_reviews, current_user, limit),
+        headers=response.headers
+    )
+
+
+@router.delete(
+    "/moderation/claim",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(mark_recent_writer)]
+)
+@query_budget(3)
+async def release_moderation_claims(
+    current_user: models.User = Depends(get_current_admin),
+    review_service: AsyncService[ReviewService] = Depends(get_review_service)
 ):
-    return review_service.get_moderation_reviews(params)
+    await review_service.call(ReviewService.release_moderation_claims, current_user)
 
 
 @router.get("/{review_id}", response_model=review_schemas.DetailReviewResponse)
-def get_review_detail(
+@query_budget(6)
+async def get_review_detail(
     review_id: int = Path(..., ge=1),
+    fields: Optional[str] = Query(None, min_length=1, max_length=200),
+    if_none_match: Optional[str] = Header(None),
     current_user: Optional[models.User] = Depends(get_current_user_optional),
-    review_service: ReviewService = Depends(get_review_service)
+    review_service: AsyncService[ReviewService] = Depends(get_review_reader)
 ):
-    return review_service.get_review_detail(review_id, current_user)
+    selected = parse_fields(fields, review_schemas.DetailReviewResponse)
+    etag = await review_service.call(ReviewService.get_review_etag, review_id, current_user, fields)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    # The tag is read before the body: if the review changes in between, the
+    # client holds an older tag and simply gets a 200 next time.
+    return model_response(
+        await review_service.call(ReviewService.get_review_detail, review_id, current_user, fields),
+        headers={"ETag": etag},
+        include=selected and set(selected)
+    )
 
 
-@router.post("/", response_model=review_schemas.ReviewCreateResponse, status_code=status.HTTP_201_CREATED)
-def create_review(
+@router.post(
+    "/",
+    response_model=review_schemas.ReviewCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(mark_recent_writer)]
+)
+@query_budget(12)
+async def create_review(
     review_in: review_schemas.ReviewCreate,
     current_user: models.User = Depends(get_current_user),
-    review_service: ReviewService = Depends(get_review_service)
+    review_service: AsyncService[ReviewService] = Depends(get_review_service)
 ):
-    return review_service.create_review(review_in, current_user)
+    return await review_service.call(ReviewService.create_review, review_in, current_user)
 
 
-@router.delete("/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_review(
+@router.delete(
+    "/{review_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(mark_recent_writer)]
+)
+@query_budget(12)
+async def delete_review(
     review_id: int = Path(..., ge=1),
     current_user: models.User = Depends(get_current_user),
-    review_service: ReviewService = Depends(get_review_service)
+    review_service: AsyncService[ReviewService] = Depends(get_review_service)
 ):
-    review_service.delete_review(review_id, current_user)
+    await review_service.call(ReviewService.delete_review, review_id, current_user)
 
 
-@router.put("/{review_id}", response_model=review_schemas.DetailReviewResponse)
-def edit_review(
+@router.put(
+    "/{review_id}",
+    response_model=review_schemas.DetailReviewResponse,
+    dependencies=[Depends(mark_recent_writer)]
+)
+@query_budget(16)
+async def edit_review(
     review_in: review_schemas.ReviewCreate,
     review_id: int = Path(..., ge=1),
     current_user: models.User = Depends(get_current_user),
-    review_service: ReviewService = Depends(get_review_service)
+    review_service: AsyncService[ReviewService] = Depends(get_review_service)
 ):
-    return review_service.edit_review(review_id, review_in, current_user)
+    return await review_service.call(ReviewService.edit_review, review_id, review_in, current_user)
 
 
-@router.post("/{review_id}/like", response_model=review_schemas.LikeToggleResponse)
-def toggle_like(
+@router.post(
+    "/{review_id}/like",
+    response_model=review_schemas.LikeToggleResponse,
+    dependencies=[Depends(mark_recent_writer)]
+)
+@query_budget(8)
+async def toggle_like(
     review_id: int = Path(..., ge=1),
     current_user: models.User = Depends(get_current_user),
-    review_service: ReviewService = Depends(get_review_service)
+    review_service: AsyncService[ReviewService] = Depends(get_review_service)
 ):
-    return review_service.toggle_like(review_id, current_user)
+    return await review_service.call(ReviewService.toggle_like, review_id, current_user)
 
 
 
 
-@router.post("/{review_id}/approve", status_code=status.HTTP_200_OK)
-def approve_review(
+@router.post(
+    "/{review_id}/approve",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(mark_recent_writer)]
+)
+@query_budget(16)
+async def approve_review(
     review_id: int = Path(..., ge=1),
     current_user: models.User = Depends(get_current_admin),
-    review_service: ReviewService = Depends(get_review_service)
+    review_service: AsyncService[ReviewService] = Depends(get_review_service)
 ):
-    review_service.approve_review(review_id)
+    await review_service.call(ReviewService.approve_review, review_id)
     return
 
 
-@router.post("/{review_id}/reject", status_code=status.HTTP_200_OK)
-def reject_review(
+@router.post(
+    "/{review_id}/reject",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(mark_recent_writer)]
+)
+@query_budget(16)
+async def reject_review(
     review_id: int = Path(..., ge=1),
     current_user: models.User = Depends(get_current_admin),
-    review_service: ReviewService = Depends(get_review_service)
+    review_service: AsyncService[ReviewService] = Depends(get_review_service)
 ):
-    review_service.reject_review(review_id)
+    await review_service.call(ReviewService.reject_review, review_id)
     return
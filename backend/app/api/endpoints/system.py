@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+
+import app.schemas.system as system_schemas
+from app.dependencies import get_current_admin
+from app.services.system_service import SystemService
+from app.db.session import database_pools
+from app.utils.password_hasher import password_hasher
+import app.db.models as models
+
+
+router = APIRouter(tags=["system"])
+
+
+def get_system_service() -> SystemService:
+    return SystemService(database_pools(), password_hasher)
+
+
+@router.get("/db-pools", response_model=system_schemas.DatabasePoolsResponse)
+async def get_database_pools(
+    current_user: models.User = Depends(get_current_admin),
+    system_service: SystemService = Depends(get_system_service)
+):
+    return system_service.get_database_pools()
+
+
+@router.get("/password-hasher", response_model=system_schemas.PasswordHasherStatus)
+async def get_password_hasher(
+    current_user: models.User = Depends(get_current_admin),
+    system_service: SystemService = Depends(get_system_service)
+):
+    return system_service.get_password_hasher()
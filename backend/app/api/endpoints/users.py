@@ -1,21 +1,24 @@
-from fastapi import APIRouter, Depends, Path, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Path
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import app.schemas.user as user_schemas
+from app.services.async_service import AsyncService
 from app.services.user_service import UserService
-from app.db.session import get_db
+from app.dependencies import get_read_db
+from app.utils.query_budget import query_budget
 
 
 router = APIRouter(tags=["users"])
 
 
-def get_user_service(db: Session = Depends(get_db)) -> UserService:
-    return UserService(db)
+def get_user_service(db: AsyncSession = Depends(get_read_db)) -> AsyncService[UserService]:
+    return AsyncService(db, UserService)
 
 
 @router.get("/{user_id}", response_model=user_schemas.UserBase)
-def get_user_by_id(
+@query_budget(3)
+async def get_user_by_id(
     user_id: int = Path(..., ge=1),
-    user_service: UserService = Depends(get_user_service)
+    user_service: AsyncService[UserService] = Depends(get_user_service)
 ):
-    return user_service.get_user_by_id(user_id)
+    return await user_service.call(UserService.get_user_by_id, user_id)
@@ -0,0 +1,58 @@
+import time
+
+from fastapi import APIRouter, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.query_budget import route_template
+from app.db import query_tracker
+from app.db.session import database_pools
+from app.utils import metrics
+
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    # The serving worker refreshes its own gauges; the other workers' values
+    # are as of their last request.
+    metrics.record_pools(database_pools())
+    metrics.record_threadpool()
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
+class MetricsMiddleware:
+    # Labels requests with the matched route template. SQL counts come from
+    # the tracker QueryBudgetMiddleware opens around this middleware.
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.IN_PROGRESS.dec()
+            metrics.observe_request(
+                scope["method"],
+                route_template(scope),
+                status,
+                time.perf_counter() - started,
+                query_tracker.current()
+            )
+            metrics.record_pools(database_pools())
+            metrics.record_threadpool()
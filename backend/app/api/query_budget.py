@@ -0,0 +1,30 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.db import query_tracker
+from app.utils.query_budget import check_request
+
+
+def route_template(scope: Scope) -> str:
+    # scope["route"] is set by the router on a match. Templates, never raw
+    # paths, so per-route labels and log lines stay bounded.
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+class QueryBudgetMiddleware:
+    # Outermost request hook: opens the per-request statement tracker (which
+    # MetricsMiddleware also reads) and checks the finished request against
+    # the endpoint's @query_budget and the repeated-statement threshold.
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries, token = query_tracker.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            query_tracker.finish(token)
+        check_request(scope["method"], route_template(scope), scope.get("endpoint"), queries)
@@ -0,0 +1,41 @@
+from typing import Any, Mapping, Optional, Union
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.api.compression import weak_etag
+
+
+def model_json(model: BaseModel, include: Optional[Any] = None) -> bytes:
+    return model.__pydantic_serializer__.to_json(model, include=include)
+
+
+def json_response(content: Union[bytes, str], headers: Optional[Mapping[str, str]] = None) -> Response:
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def encoded_json_response(
+    content: bytes,
+    encoding: str,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    headers = dict(headers or {})
+    if "ETag" in headers:
+        headers["ETag"] = weak_etag(headers["ETag"])
+    headers["Content-Encoding"] = encoding
+    headers["Vary"] = "Accept-Encoding"
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def model_response(
+    model: BaseModel,
+    headers: Optional[Mapping[str, str]] = None,
+    include: Optional[Any] = None
+) -> Response:
+    # Serializes with the model's compiled pydantic-core serializer and hands
+    # FastAPI finished bytes, which skips its response_model re-validation.
+    # Routes keep response_model for the OpenAPI schema.
+    return json_response(model_json(model, include), headers)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
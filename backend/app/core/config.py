@@ -1,10 +1,91 @@
+from enum import Enum
+from typing import Optional
 from pydantic_settings import BaseSettings
 
+
+class CountStrategy(str, Enum):
+    EXACT = "exact"
+    COUNTERS = "counters"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+
+
+class LikeCounterMode(str, Enum):
+    DIRECT = "direct"
+    BUFFERED = "buffered"
+
+
 class Settings(BaseSettings):
     DATABASE_URL: str
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    # Embed username and role in access tokens and authenticate from the
+    # claims alone. Role changes then apply from the next login.
+    JWT_CLAIMS_AUTH: bool = False
+    TOKEN_DENYLIST_REFRESH_SECONDS: float = 30
+    PASSWORD_HASH_WORKERS: int = 2
+    # Hash/verify calls allowed to run or wait at once; more are refused with 503.
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # Applied per engine and per worker process: every uvicorn worker holds a
+    # sync and an async engine, each opening up to DB_POOL_SIZE + DB_MAX_OVERFLOW.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Comma-separated; GET endpoints read from these when set.
+    DATABASE_REPLICA_URLS: str = ""
+    READ_YOUR_WRITES_SECONDS: float = 5
+
+    PUBLIC_REVIEWS_COUNT_STRATEGY: CountStrategy = CountStrategy.EXACT
+    MY_REVIEWS_COUNT_STRATEGY: CountStrategy = CountStrategy.EXACT
+    MODERATION_COUNT_STRATEGY: CountStrategy = CountStrategy.EXACT
+    REVIEW_COUNT_CACHE_TTL_SECONDS: int = 30
+    REVIEW_COUNT_CACHE_MAX_ENTRIES: int = 1024
+
+    FEED_CACHE_ENABLED: bool = True
+    FEED_CACHE_TTL_SECONDS: int = 30
+    FEED_CACHE_MAX_ENTRIES: int = 512
+    # "package.module:factory" returning an app.utils.feed_cache.SharedFeedCache;
+    # the public feed carries ETags only when one is configured
+    FEED_CACHE_SHARED_BACKEND: Optional[str] = None
+
+    # JSON/text responses of at least COMPRESSION_MINIMUM_SIZE bytes go out
+    # brotli- or gzip-encoded, as the client accepts; brotli needs the Brotli
+    # package. Anonymous feed pages are cached already compressed.
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Serves /metrics in the Prometheus text format. With several uvicorn
+    # workers, set PROMETHEUS_MULTIPROC_DIR in the process environment (not
+    # .env) to an empty directory so every worker's samples are aggregated.
+    METRICS_ENABLED: bool = True
+
+    # Requests over their endpoint's @query_budget, or running one statement
+    # SQL_REPEAT_WARNING_THRESHOLD or more times (0 disables), are logged as
+    # warnings; with SQL_QUERY_BUDGET_STRICT they raise instead (tests).
+    SQL_REPEAT_WARNING_THRESHOLD: int = 5
+    SQL_QUERY_BUDGET_STRICT: bool = False
+
+    # "buffered" records like deltas in review_like_deltas and folds them into
+    # reviews.likes every LIKE_DELTA_FLUSH_SECONDS, so likers of a hot review
+    # do not queue on its row lock. Sorting by likes then lags by one flush.
+    LIKE_COUNTER_MODE: LikeCounterMode = LikeCounterMode.DIRECT
+    LIKE_DELTA_FLUSH_SECONDS: float = 1.0
+    LIKE_DELTA_FLUSH_BATCH_SIZE: int = 5000
+
+    MODERATION_CLAIM_LEASE_SECONDS: int = 600
+
+    FUZZY_SEARCH_THRESHOLD: float = 0.3
+    FUZZY_SEARCH_MAX_CANDIDATES: int = 1000
+    # SQLite fallback only: how often the in-process title index is rebuilt
+    # to pick up reviews written by other workers.
+    FUZZY_SEARCH_INDEX_REFRESH_SECONDS: float = 60
 
     class Config:
         env_file = ".env"
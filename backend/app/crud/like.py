@@ -1,6 +1,12 @@
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Set, Tuple
+from sqlalchemy import delete, exists, func, insert, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 import app.db.models as models
+from app.crud.like_delta import CRUDLikeDelta
+from app.db.utils import dialect_name, is_retryable_error
+from app.exceptions import LikeConflictError
 
 class CRUDLike:
     @staticmethod
@@ -14,6 +20,21 @@ class CRUDLike:
             .first()
         )
 
+    @staticmethod
+    def get_liked_review_ids(db: Session, user_id: int, review_ids: Iterable[int]) -> Set[int]:
+        review_ids = list(review_ids)
+        if not review_ids:
+            return set()
+        rows = (
+            db.query(models.Like.review_id)
+            .filter(
+                models.Like.user_id == user_id,
+                models.Like.review_id.in_(review_ids)
+            )
+            .all()
+        )
+        return {row.review_id for row in rows}
+
     @staticmethod
     def create_like(db: Session, user_id: int, review_id: int) -> models.Like:
         like = models.Like(user_id=user_id, review_id=review_id)
@@ -29,19 +50,153 @@ class CRUDLike:
         db: Session,
         user_id: int,
         review_id: int,
-        review: models.Review
-    ) -> Tuple[bool, int]:  # (is_liked, new_likes_count)
-        existing_like = CRUDLike.get_like(db, user_id, review_id)
-        
-        if existing_like:
-            db.delete(existing_like)
-            review.likes -= 1
-            is_liked = False
-        else:
-            new_like = models.Like(user_id=user_id, review_id=review_id)
-            db.add(new_like)
-            review.likes += 1
-            is_liked = True
-        
-        db.commit()
-        return is_liked, review.likes
+        buffered: bool = False
+    ) -> Optional[Tuple[bool, int]]:
+        # Returns (is_liked, new_likes_count), or None when the review is
+        # missing or not approved. The like row and the counter change in
+        # SQL, so concurrent toggles never lose an update. A toggle that
+        # found the like inserted by a concurrent request (neither deleted
+        # nor inserted) is retried and then removes it. With buffered=True
+        # the change is appended to review_like_deltas instead of updating
+        # the reviews row; the count returned includes unflushed deltas.
+        toggle = _toggle_postgres if dialect_name(db) == "postgresql" else _toggle_stepwise
+        for attempt in range(1, LIKE_TOGGLE_ATTEMPTS + 1):
+            try:
+                outcome = toggle(db, user_id, review_id, buffered)
+            except DBAPIError as exc:
+                db.rollback()
+                if attempt == LIKE_TOGGLE_ATTEMPTS or not is_retryable_error(exc):
+                    raise
+                continue
+            # A missing or unapproved review matched none of the guarded
+            # statements, so there is nothing to roll back.
+            if outcome is None:
+                return None
+            removed, added, likes = outcome
+            if removed or added:
+                db.commit()
+                return bool(added), likes
+            # The counter UPDATE still ran with a zero change and moved the
+            # row version; discard it so a conflict does not invalidate the
+            # review's cached pages and ETags.
+            db.rollback()
+        raise LikeConflictError()
+
+
+LIKE_TOGGLE_ATTEMPTS = 3
+
+
+def _approved(review_id: int):
+    return exists().where(
+        models.Review.id == review_id,
+        models.Review.status == models.ReviewStatus.APPROVED
+    )
+
+
+def _like_filter(user_id: int, review_id: int):
+    return (models.Like.user_id == user_id, models.Like.review_id == review_id)
+
+
+def _bump_likes(review_id: int, delta):
+    return (
+        update(models.Review)
+        .where(
+            models.Review.id == review_id,
+            models.Review.status == models.ReviewStatus.APPROVED
+        )
+        .values(likes=models.Review.likes + delta, version=models.Review.version + 1)
+        .returning(models.Review.likes)
+    )
+
+
+def _buffered_likes(review_id: int, *columns, unrecorded=0):
+    return (
+        select(*columns, models.Review.likes + CRUDLikeDelta.pending_expr(review_id) + unrecorded)
+        .where(
+            models.Review.id == review_id,
+            models.Review.status == models.ReviewStatus.APPROVED
+        )
+    )
+
+
+def _toggle_postgres(
+    db: Session,
+    user_id: int,
+    review_id: int,
+    buffered: bool
+) -> Optional[Tuple[int, int, int]]:
+    # One statement: data-modifying CTEs delete the like or, if there was
+    # none, insert it, and the counter moves by the net change.
+    removed = (
+        delete(models.Like)
+        .where(*_like_filter(user_id, review_id), _approved(review_id))
+        .returning(models.Like.id)
+        .cte("removed")
+    )
+    added = (
+        postgresql.insert(models.Like)
+        .from_select(
+            ["user_id", "review_id"],
+            select(literal(user_id), literal(review_id))
+            .where(_approved(review_id), ~exists(select(removed.c.id)))
+        )
+        .on_conflict_do_nothing(constraint="uq_user_review")
+        .returning(models.Like.id)
+        .cte("added")
+    )
+    removed_count = select(func.count()).select_from(removed).scalar_subquery()
+    added_count = select(func.count()).select_from(added).scalar_subquery()
+    net = added_count - removed_count
+    if buffered:
+        recorded = (
+            insert(models.ReviewLikeDelta)
+            .from_select(["review_id", "delta"], select(literal(review_id), net).where(net != 0))
+            .returning(models.ReviewLikeDelta.id)
+            .cte("recorded")
+        )
+        # The outer SELECT sees the snapshot from before the CTEs ran, so
+        # the new delta is added explicitly.
+        statement = _buffered_likes(
+            review_id, removed_count, added_count, unrecorded=net
+        ).add_cte(recorded)
+    else:
+        updated = _bump_likes(review_id, net).cte("updated")
+        statement = select(removed_count, added_count, updated.c.likes)
+    row = db.execute(statement).first()
+    return tuple(row) if row else None
+
+
+def _toggle_stepwise(
+    db: Session,
+    user_id: int,
+    review_id: int,
+    buffered: bool
+) -> Optional[Tuple[int, int, int]]:
+    # SQLite has no data-modifying CTEs; the DELETE opens the write
+    # transaction, so the following statements run under the writer lock.
+    removed = db.execute(
+        delete(models.Like)
+        .where(*_like_filter(user_id, review_id), _approved(review_id))
+        .returning(models.Like.id)
+    ).all()
+    added = []
+    if not removed:
+        added = db.execute(
+            sqlite.insert(models.Like)
+            .from_select(
+                ["user_id", "review_id"],
+                select(literal(user_id), literal(review_id)).where(_approved(review_id))
+            )
+            .on_conflict_do_nothing()
+            .returning(models.Like.id)
+        ).all()
+    net = len(added) - len(removed)
+    if buffered:
+        if net:
+            db.execute(insert(models.ReviewLikeDelta).values(review_id=review_id, delta=net))
+        likes = db.execute(_buffered_likes(review_id)).scalar()
+    else:
+        likes = db.execute(_bump_likes(review_id, net)).scalar()
+    if likes is None:
+        return None
+    return len(removed), len(added), likes
@@ -0,0 +1,86 @@
+from collections import defaultdict
+from typing import Dict, Iterable
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+import app.db.models as models
+
+
+class CRUDLikeDelta:
+    @staticmethod
+    def pending_expr(review_id: int):
+        return func.coalesce(
+            select(func.sum(models.ReviewLikeDelta.delta))
+            .where(models.ReviewLikeDelta.review_id == review_id)
+            .scalar_subquery(),
+            0
+        )
+
+    @staticmethod
+    def latest_id_expr(review_id: int):
+        # Grows with every buffered toggle until the deltas are flushed.
+        return func.coalesce(
+            select(func.max(models.ReviewLikeDelta.id))
+            .where(models.ReviewLikeDelta.review_id == review_id)
+            .scalar_subquery(),
+            0
+        )
+
+    @staticmethod
+    def get_likes(db: Session, review_ids: Iterable[int]) -> Dict[int, int]:
+        # Stored count plus pending deltas, read in one statement: a flush
+        # commits the UPDATE of reviews.likes and the DELETE of its deltas
+        # together, so a single snapshot sees each delta exactly once.
+        review_ids = list(review_ids)
+        if not review_ids:
+            return {}
+        rows = (
+            db.query(
+                models.Review.id,
+                (models.Review.likes + CRUDLikeDelta.pending_expr(models.Review.id)).label("likes")
+            )
+            .filter(models.Review.id.in_(review_ids))
+            .all()
+        )
+        return {row.id: row.likes for row in rows}
+
+    @staticmethod
+    def flush(db: Session, batch_size: int) -> int:
+        # Folds up to batch_size deltas into reviews.likes and deletes them in
+        # one transaction; readers use get_likes so both sides come from the
+        # same snapshot.
+        # SKIP LOCKED lets flushers in other workers take disjoint batches.
+        rows = (
+            db.query(
+                models.ReviewLikeDelta.id,
+                models.ReviewLikeDelta.review_id,
+                models.ReviewLikeDelta.delta
+            )
+            .order_by(models.ReviewLikeDelta.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not rows:
+            return 0
+
+        totals: Dict[int, int] = defaultdict(int)
+        for row in rows:
+            totals[row.review_id] += row.delta
+        # Ascending review ids keep concurrent flushers from deadlocking. Rows
+        # netting to zero are still touched: their version has to move once
+        # the pending deltas it was paired with are gone.
+        for review_id in sorted(totals):
+            db.execute(
+                update(models.Review)
+                .where(models.Review.id == review_id)
+                .values(
+                    likes=models.Review.likes + totals[review_id],
+                    version=models.Review.version + 1
+                )
+            )
+        db.execute(
+            delete(models.ReviewLikeDelta)
+            .where(models.ReviewLikeDelta.id.in_([row.id for row in rows]))
+        )
+        db.commit()
+        return len(rows)
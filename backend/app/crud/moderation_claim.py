@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Iterable, List, Optional
+from sqlalchemy import or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+import app.db.models as models
+from app.db.utils import dialect_name
+
+
+class CRUDModerationClaim:
+    @staticmethod
+    def claim(
+        db: Session,
+        moderator_id: int,
+        limit: int,
+        now: datetime,
+        expires_at: datetime
+    ) -> List[int]:
+        # Oldest pending reviews that are unclaimed, whose lease expired, or
+        # that this moderator already holds (their lease is renewed). Rows
+        # another transaction is claiming right now are skipped, not waited
+        # on, so concurrent moderators get disjoint batches.
+        claim = models.ModerationClaim
+        candidate_ids = [
+            row.id
+            for row in (
+                db.query(models.Review.id)
+                .outerjoin(claim, claim.review_id == models.Review.id)
+                .filter(
+                    models.Review.status == models.ReviewStatus.PENDING,
+                    or_(
+                        claim.review_id.is_(None),
+                        claim.expires_at <= now,
+                        claim.moderator_id == moderator_id
+                    )
+                )
+                .order_by(models.Review.created_at, models.Review.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True, of=models.Review)
+                .all()
+            )
+        ]
+        if not candidate_ids:
+            db.commit()
+            return []
+
+        insert = postgresql.insert if dialect_name(db) == "postgresql" else sqlite.insert
+        statement = insert(claim).values([
+            {"review_id": review_id, "moderator_id": moderator_id, "expires_at": expires_at}
+            for review_id in candidate_ids
+        ])
+        # Re-checked at write time: a lease committed after the SELECT's
+        # snapshot is never taken over.
+        statement = statement.on_conflict_do_update(
+            index_elements=[claim.review_id],
+            set_={
+                "moderator_id": statement.excluded.moderator_id,
+                "expires_at": statement.excluded.expires_at,
+            },
+            where=or_(claim.expires_at <= now, claim.moderator_id == moderator_id)
+        ).returning(claim.review_id)
+        claimed = {row.review_id for row in db.execute(statement)}
+        db.commit()
+        return [review_id for review_id in candidate_ids if review_id in claimed]
+
+    @staticmethod
+    def release(
+        db: Session,
+        moderator_id: int,
+        review_ids: Optional[Iterable[int]] = None
+    ) -> int:
+        query = db.query(models.ModerationClaim).filter(
+            models.ModerationClaim.moderator_id == moderator_id
+        )
+        if review_ids is not None:
+            query = query.filter(models.ModerationClaim.review_id.in_(list(review_ids)))
+        released = query.delete(synchronize_session=False)
+        db.commit()
+        return released
+
+    @staticmethod
+    def clear(db: Session, review_ids: Iterable[int]) -> None:
+        # Called inside the moderation transaction; the caller commits.
+        review_ids = list(review_ids)
+        if not review_ids:
+            return
+        db.query(models.ModerationClaim).filter(
+            models.ModerationClaim.review_id.in_(review_ids)
+        ).delete(synchronize_session=False)
@@ -1,8 +1,39 @@
-from typing import Optional, List, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc
+import json
+from typing import Hashable, Iterable, Optional, List, Set, Tuple
+from sqlalchemy.orm import Query, Session, defer, joinedload, load_only
+from sqlalchemy import Integer, Row, any_, asc, bindparam, desc, literal, text, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
 import app.db.models as models
 import app.schemas.review as review
+from app.core.config import CountStrategy
+from app.crud.like_delta import CRUDLikeDelta
+from app.crud.moderation_claim import CRUDModerationClaim
+from app.crud.review_counter import CRUDReviewCounter
+from app.db.search import ReviewSearch, review_search
+from app.db.utils import dialect_name
+from app.utils.count_cache import review_count_cache
+from app.utils.fields import FieldSet, selects
+from app.utils.pagination import KeysetPosition
+
+
+# Feed rows only need the author's id and username; password_hash and the
+# rest of the users row stay unloaded.
+AUTHOR_SUMMARY = (
+    joinedload(models.Review.author, innerjoin=True)
+    .load_only(models.User.id, models.User.username)
+)
+
+# Review columns behind each selectable response field. id and the keyset
+# columns are always loaded; "content" maps to content or excerpt by mode.
+FIELD_COLUMNS = {
+    "title": ("title",),
+    "movie_title": ("movie_title",),
+    "content_length": ("content_length",),
+    "status": ("status",),
+    "author": ("user_id",),
+}
+KEY_COLUMNS = ("id", "created_at", "likes")
+
 
 class CRUDReview:
     @staticmethod
@@ -10,11 +41,34 @@ class CRUDReview:
         return db.query(models.Review).filter(models.Review.id == review_id).first()
 
     @staticmethod
-    def get_with_author(db: Session, review_id: int) -> Optional[models.Review]:
-        from sqlalchemy.orm import joinedload
+    def get_with_author(
+        db: Session,
+        review_id: int,
+        fields: Optional[FieldSet] = None
+    ) -> Optional[models.Review]:
+        if fields is None:
+            return (
+                db.query(models.Review)
+                .options(joinedload(models.Review.author))
+                .filter(models.Review.id == review_id)
+                .first()
+            )
+        # Visibility checks need status and user_id whatever was selected.
+        query = db.query(models.Review).filter(models.Review.id == review_id)
+        query = CRUDReview._project(query, review.ContentMode.FULL, fields, ("status", "user_id"))
+        return CRUDReview._with_author(query, fields).first()
+
+    @staticmethod
+    def get_version(db: Session, review_id: int, with_pending_likes: bool = False) -> Optional[Row]:
+        # Everything a conditional GET needs, without loading the review body.
+        pending = CRUDLikeDelta.latest_id_expr(review_id) if with_pending_likes else literal(0)
         return (
-            db.query(models.Review)
-            .options(joinedload(models.Review.author))
+            db.query(
+                models.Review.version,
+                models.Review.status,
+                models.Review.user_id,
+                pending.label("pending_likes_marker")
+            )
             .filter(models.Review.id == review_id)
             .first()
         )
@@ -28,14 +82,17 @@ class CRUDReview:
             **review_data
         )
         db.add(review)
+        CRUDReviewCounter.apply(db, [(user_id, models.ReviewStatus.PENDING, 1)])
         db.commit()
         db.refresh(review)
         return review
 
     @staticmethod
     def update(db: Session, review: models.Review, **update_data) -> models.Review:
+        old_status = review.status
         for field, value in update_data.items():
             setattr(review, field, value)
+        CRUDReview._move_counters(db, review.user_id, old_status, review.status)
         db.commit()
         db.refresh(review)
         return review
@@ -43,15 +100,61 @@ class CRUDReview:
     @staticmethod
     def delete(db: Session, review: models.Review) -> None:
         db.delete(review)
+        CRUDReviewCounter.apply(db, [(review.user_id, review.status, -1)])
         db.commit()
 
+    @staticmethod
+    def get_many_with_author(db: Session, review_ids: List[int]) -> List[models.Review]:
+        if not review_ids:
+            return []
+        return (
+            db.query(models.Review)
+            .options(AUTHOR_SUMMARY)
+            .filter(CRUDReview._id_in(db, review_ids))
+            .order_by(models.Review.created_at, models.Review.id)
+            .all()
+        )
+
     @staticmethod
     def change_status(db: Session, review: models.Review, status: str) -> models.Review:
+        CRUDReview._move_counters(db, review.user_id, review.status, status)
+        CRUDModerationClaim.clear(db, [review.id])
         review.status = status
         db.commit()
         db.refresh(review)
         return review
 
+    @staticmethod
+    def change_pending_status(db: Session, review_ids: List[int], status: str) -> List[int]:
+        # One UPDATE ... RETURNING moves every still-pending review; rows that
+        # are missing or already moderated are simply not returned.
+        rows = db.execute(
+            update(models.Review)
+            .where(
+                CRUDReview._id_in(db, review_ids),
+                models.Review.status == models.ReviewStatus.PENDING
+            )
+            .values(status=status, version=models.Review.version + 1)
+            .returning(models.Review.id, models.Review.user_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        CRUDReviewCounter.apply(db, [
+            change
+            for row in rows
+            for change in (
+                (row.user_id, models.ReviewStatus.PENDING, -1),
+                (row.user_id, status, 1)
+            )
+        ])
+        CRUDModerationClaim.clear(db, [row.id for row in rows])
+        db.commit()
+        return [row.id for row in rows]
+
+    @staticmethod
+    def get_existing_ids(db: Session, review_ids: List[int]) -> Set[int]:
+        rows = db.query(models.Review.id).filter(CRUDReview._id_in(db, review_ids)).all()
+        return {row.id for row in rows}
+
     @staticmethod
     def get_public_reviews(
         db: Session,
@@ -60,32 +163,21 @@ class CRUDReview:
         sort_by: str = review.SortBy.CREATED_AT,
         sort_order: str = review.SortOrder.DESC,
         search: Optional[str] = None,
-        author_id: Optional[int] = None
-    ) -> Tuple[List[models.Review], int]:
-        query = db.query(models.Review).filter(models.Review.status == models.ReviewStatus.APPROVED)
+        author_id: Optional[int] = None,
+        after: Optional[KeysetPosition] = None,
+        with_total: bool = True,
+        search_mode: str = review.SearchMode.FULLTEXT,
+        content_mode: str = review.ContentMode.FULL,
+        fields: Optional[FieldSet] = None
+    ) -> Tuple[List[models.Review], Optional[int]]:
+        searcher = CRUDReview._searcher(db, search, search_mode)
+        query = CRUDReview._public_query(db, searcher, author_id)
         
-        if author_id:
-            query = query.filter(models.Review.user_id == author_id)
+        total = query.count() if with_total else None
         
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                (models.Review.title.ilike(search_term)) |
-                (models.Review.movie_title.ilike(search_term))
-            )
-        
-        total = query.count()
-        
-        
-        sort_column = None
-        if sort_by == review.SortBy.LIKES:
-            sort_column = models.Review.likes
-        else:
-            sort_column = models.Review.created_at
-        if sort_order == review.SortOrder.ASC:
-            query = query.order_by(asc(sort_column))
-        else:
-            query = query.order_by(desc(sort_column))
+        query = CRUDReview._order_and_seek(query, sort_by, sort_order, after, searcher)
+        query = CRUDReview._project(query, content_mode, fields)
+        query = CRUDReview._with_author(query, fields)
         
         reviews = query.offset(skip).limit(limit).all()
         return reviews, total
@@ -98,28 +190,20 @@ class CRUDReview:
         limit: int = 20,
         sort_by: str = review.SortBy.CREATED_AT,
         sort_order: str = review.SortOrder.DESC,
-        search: Optional[str] = None
-    ) -> Tuple[List[models.Review], int]:
-        query = db.query(models.Review).filter(models.Review.user_id == user_id)
-        
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                (models.Review.title.ilike(search_term)) |
-                (models.Review.movie_title.ilike(search_term))
-            )
+        search: Optional[str] = None,
+        after: Optional[KeysetPosition] = None,
+        with_total: bool = True,
+        search_mode: str = review.SearchMode.FULLTEXT,
+        content_mode: str = review.ContentMode.FULL,
+        fields: Optional[FieldSet] = None
+    ) -> Tuple[List[models.Review], Optional[int]]:
+        searcher = CRUDReview._searcher(db, search, search_mode)
+        query = CRUDReview._user_query(db, user_id, searcher)
         
-        total = query.count()
+        total = query.count() if with_total else None
         
-        sort_column = None
-        if sort_by == review.SortBy.LIKES:
-            sort_column = models.Review.likes
-        else:
-            sort_column = models.Review.created_at
-        if sort_order == review.SortOrder.ASC:
-            query = query.order_by(asc(sort_column))
-        else:
-            query = query.order_by(desc(sort_column))
+        query = CRUDReview._order_and_seek(query, sort_by, sort_order, after, searcher)
+        query = CRUDReview._project(query, content_mode, fields)
         
         reviews = query.offset(skip).limit(limit).all()
         return reviews, total
@@ -128,9 +212,220 @@ class CRUDReview:
     def get_pending_reviews(
         db: Session,
         skip: int = 0,
-        limit: int = 20
-    ) -> Tuple[List[models.Review], int]:
-        query = db.query(models.Review).filter(models.Review.status == models.ReviewStatus.PENDING)
-        total = query.count()
-        reviews = query.order_by(desc(models.Review.created_at)).offset(skip).limit(limit).all()
+        limit: int = 20,
+        after: Optional[KeysetPosition] = None,
+        with_total: bool = True,
+        content_mode: str = review.ContentMode.FULL,
+        fields: Optional[FieldSet] = None
+    ) -> Tuple[List[models.Review], Optional[int]]:
+        query = CRUDReview._pending_query(db)
+        total = query.count() if with_total else None
+        query = CRUDReview._order_and_seek(
+            query, review.SortBy.CREATED_AT, review.SortOrder.DESC, after
+        )
+        query = CRUDReview._project(query, content_mode, fields)
+        reviews = (
+            CRUDReview._with_author(query, fields)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
         return reviews, total
+
+    @staticmethod
+    def count_public_reviews(
+        db: Session,
+        strategy: CountStrategy,
+        search: Optional[str] = None,
+        author_id: Optional[int] = None,
+        search_mode: str = review.SearchMode.FULLTEXT
+    ) -> Tuple[int, bool]:  # (total, is_exact)
+        if search:
+            scope = None
+        elif author_id:
+            scope = CRUDReviewCounter.user_scope(author_id, models.ReviewStatus.APPROVED)
+        else:
+            scope = CRUDReviewCounter.status_scope(models.ReviewStatus.APPROVED)
+        return CRUDReview._count(
+            db,
+            CRUDReview._public_query(db, CRUDReview._searcher(db, search, search_mode), author_id),
+            strategy,
+            scope,
+            ("public", author_id, CRUDReview._normalize_search(search), search_mode)
+        )
+
+    @staticmethod
+    def count_user_reviews(
+        db: Session,
+        strategy: CountStrategy,
+        user_id: int,
+        search: Optional[str] = None,
+        search_mode: str = review.SearchMode.FULLTEXT
+    ) -> Tuple[int, bool]:  # (total, is_exact)
+        return CRUDReview._count(
+            db,
+            CRUDReview._user_query(db, user_id, CRUDReview._searcher(db, search, search_mode)),
+            strategy,
+            None if search else CRUDReviewCounter.user_scope(user_id),
+            ("user", user_id, CRUDReview._normalize_search(search), search_mode)
+        )
+
+    @staticmethod
+    def count_pending_reviews(db: Session, strategy: CountStrategy) -> Tuple[int, bool]:  # (total, is_exact)
+        return CRUDReview._count(
+            db,
+            CRUDReview._pending_query(db),
+            strategy,
+            CRUDReviewCounter.status_scope(models.ReviewStatus.PENDING),
+            ("pending",)
+        )
+
+    @staticmethod
+    def sort_column(sort_by: str):
+        if sort_by == review.SortBy.LIKES:
+            return models.Review.likes
+        return models.Review.created_at
+
+    @staticmethod
+    def _order_and_seek(
+        query: Query,
+        sort_by: str,
+        sort_order: str,
+        after: Optional[KeysetPosition],
+        searcher: Optional[ReviewSearch] = None
+    ) -> Query:
+        if sort_by == review.SortBy.RELEVANCE and searcher is not None:
+            # Relevance is computed per query, so it is paged by offset only.
+            direction = asc if sort_order == review.SortOrder.ASC else desc
+            return query.order_by(direction(searcher.rank()), direction(models.Review.id))
+        
+        # id breaks ties so the order is total and a keyset position is unambiguous.
+        sort_key = tuple_(CRUDReview.sort_column(sort_by), models.Review.id)
+        if sort_order == review.SortOrder.ASC:
+            if after is not None:
+                query = query.filter(sort_key > tuple_(*after))
+            return query.order_by(asc(CRUDReview.sort_column(sort_by)), asc(models.Review.id))
+        if after is not None:
+            query = query.filter(sort_key < tuple_(*after))
+        return query.order_by(desc(CRUDReview.sort_column(sort_by)), desc(models.Review.id))
+
+    @staticmethod
+    def _public_query(db: Session, searcher: Optional[ReviewSearch], author_id: Optional[int]) -> Query:
+        query = db.query(models.Review).filter(models.Review.status == models.ReviewStatus.APPROVED)
+        
+        if author_id:
+            query = query.filter(models.Review.user_id == author_id)
+        
+        if searcher is not None:
+            query = searcher.filter(query)
+        return query
+
+    @staticmethod
+    def _user_query(db: Session, user_id: int, searcher: Optional[ReviewSearch]) -> Query:
+        query = db.query(models.Review).filter(models.Review.user_id == user_id)
+        
+        if searcher is not None:
+            query = searcher.filter(query)
+        return query
+
+    @staticmethod
+    def _pending_query(db: Session) -> Query:
+        return db.query(models.Review).filter(models.Review.status == models.ReviewStatus.PENDING)
+
+    @staticmethod
+    def _searcher(db: Session, search: Optional[str], search_mode: str) -> Optional[ReviewSearch]:
+        if not search:
+            return None
+        return review_search(db, search, fuzzy=search_mode == review.SearchMode.FUZZY)
+
+    @staticmethod
+    def _normalize_search(search: Optional[str]) -> Optional[str]:
+        return search.strip().lower() if search else None
+
+    @staticmethod
+    def _with_content(query: Query, content_mode: str) -> Query:
+        # Excerpt listings read the short excerpt column and never pull the
+        # (up to 5000 character) content off disk.
+        if content_mode == review.ContentMode.EXCERPT:
+            return query.options(defer(models.Review.content))
+        return query
+
+    @staticmethod
+    def _project(
+        query: Query,
+        content_mode: str,
+        fields: Optional[FieldSet],
+        required: Iterable[str] = ()
+    ) -> Query:
+        if fields is None:
+            return CRUDReview._with_content(query, content_mode)
+        columns = set(KEY_COLUMNS) | set(required)
+        for name in fields:
+            columns.update(FIELD_COLUMNS.get(name, ()))
+        if "content" in fields:
+            columns.add("excerpt" if content_mode == review.ContentMode.EXCERPT else "content")
+        return query.options(load_only(*(getattr(models.Review, name) for name in sorted(columns))))
+
+    @staticmethod
+    def _with_author(query: Query, fields: Optional[FieldSet]) -> Query:
+        if not selects(fields, "author"):
+            return query
+        return query.options(AUTHOR_SUMMARY)
+
+    @staticmethod
+    def _id_in(db: Session, review_ids: List[int]):
+        # Postgres gets a single array parameter, so the statement text (and
+        # its cached plan) does not depend on how many ids were sent.
+        if dialect_name(db) == "postgresql":
+            return models.Review.id == any_(bindparam("review_ids", review_ids, type_=ARRAY(Integer)))
+        return models.Review.id.in_(review_ids)
+
+    @staticmethod
+    def _move_counters(db: Session, user_id: int, old_status: str, new_status: str) -> None:
+        if old_status == new_status:
+            return
+        CRUDReviewCounter.apply(db, [(user_id, old_status, -1), (user_id, new_status, 1)])
+
+    @staticmethod
+    def _count(
+        db: Session,
+        query: Query,
+        strategy: CountStrategy,
+        counter_scope: Optional[str],
+        cache_key: Hashable
+    ) -> Tuple[int, bool]:
+        if strategy == CountStrategy.COUNTERS:
+            if counter_scope is not None:
+                return CRUDReviewCounter.get(db, counter_scope), True
+            # Free-text filters have no counter to read; fall back to the TTL cache.
+            strategy = CountStrategy.CACHED
+
+        if strategy == CountStrategy.ESTIMATED and counter_scope is None:
+            # Nor can they be estimated: EXPLAIN needs the statement rendered
+            # with literal values, which the FTS regconfig cast and user text
+            # containing ':' do not survive.
+            strategy = CountStrategy.CACHED
+
+        if strategy == CountStrategy.CACHED:
+            cached = review_count_cache.get(cache_key)
+            if cached is not None:
+                return cached, False
+            total = query.count()
+            review_count_cache.set(cache_key, total)
+            return total, True
+
+        if strategy == CountStrategy.ESTIMATED and dialect_name(db) == "postgresql":
+            return CRUDReview._estimate_count(db, query), False
+
+        return query.count(), True
+
+    @staticmethod
+    def _estimate_count(db: Session, query: Query) -> int:
+        statement = query.statement.compile(
+            dialect=db.get_bind().dialect,
+            compile_kwargs={"literal_binds": True}
+        )
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {statement}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,64 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+import app.db.models as models
+from app.db.utils import dialect_name
+
+# (user_id, status, delta)
+CounterChange = Tuple[int, str, int]
+
+
+class CRUDReviewCounter:
+    @staticmethod
+    def status_scope(status: str) -> str:
+        return f"status:{models.ReviewStatus(status).value}"
+
+    @staticmethod
+    def user_scope(user_id: int, status: Optional[str] = None) -> str:
+        if status is None:
+            return f"user:{user_id}"
+        return f"user:{user_id}:status:{models.ReviewStatus(status).value}"
+
+    @staticmethod
+    def get(db: Session, scope: str) -> int:
+        counter = db.query(models.ReviewCounter).filter(models.ReviewCounter.scope == scope).first()
+        return counter.count if counter else 0
+
+    @staticmethod
+    def apply(db: Session, changes: Iterable[CounterChange]) -> None:
+        # Counters are adjusted in the caller's transaction and commit with it.
+        deltas: Dict[str, int] = defaultdict(int)
+        for user_id, status, delta in changes:
+            deltas[CRUDReviewCounter.status_scope(status)] += delta
+            deltas[CRUDReviewCounter.user_scope(user_id)] += delta
+            deltas[CRUDReviewCounter.user_scope(user_id, status)] += delta
+
+        rows = [
+            {"scope": scope, "count": delta}
+            for scope, delta in sorted(deltas.items())
+            if delta != 0
+        ]
+        if not rows:
+            return
+        # One upsert, so concurrent first writes to a scope cannot both
+        # insert; rows go in scope order so overlapping batches lock counters
+        # in the same order and cannot deadlock.
+        insert = postgresql.insert if dialect_name(db) == "postgresql" else sqlite.insert
+        statement = insert(models.ReviewCounter).values(rows)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[models.ReviewCounter.scope],
+            set_={"count": models.ReviewCounter.count + statement.excluded.count}
+        ))
+
+    @staticmethod
+    def rebuild(db: Session) -> None:
+        rows: List[Tuple[int, str, int]] = (
+            db.query(models.Review.user_id, models.Review.status, func.count(models.Review.id))
+            .group_by(models.Review.user_id, models.Review.status)
+            .all()
+        )
+        db.query(models.ReviewCounter).delete(synchronize_session=False)
+        CRUDReviewCounter.apply(db, rows)
+        db.commit()
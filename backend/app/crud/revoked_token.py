@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import List, Tuple
+from sqlalchemy.orm import Session
+import app.db.models as models
+
+
+class CRUDRevokedToken:
+    @staticmethod
+    def add(db: Session, *, jti: str, user_id: int, expires_at: datetime) -> models.RevokedToken:
+        token = models.RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at)
+        db.merge(token)
+        db.commit()
+        return token
+
+    @staticmethod
+    def get_active(db: Session, now: datetime) -> List[Tuple[str, datetime]]:
+        rows = db.query(models.RevokedToken.jti, models.RevokedToken.expires_at).filter(
+            models.RevokedToken.expires_at > now
+        ).all()
+        return [(jti, expires_at) for jti, expires_at in rows]
+
+    @staticmethod
+    def purge_expired(db: Session, now: datetime) -> int:
+        deleted = db.query(models.RevokedToken).filter(
+            models.RevokedToken.expires_at <= now
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, func, UniqueConstraint, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, event, func, text, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 import enum
+from datetime import datetime, timezone
 from app.db.base import Base
 
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class Role(enum.StrEnum):
     USER = "user"
     ADMIN = "admin"
@@ -28,17 +33,52 @@ class User(Base):
     likes = relationship("Like", back_populates="user", cascade="all, delete-orphan")
 
 
+REVIEW_EXCERPT_LENGTH = 300
+
+
+def make_excerpt(content: str) -> str:
+    # Mirrored by the backfill in the review_excerpts migration.
+    if len(content) <= REVIEW_EXCERPT_LENGTH:
+        return content
+    return content[:REVIEW_EXCERPT_LENGTH].rstrip(" ") + "…"
+
+
+APPROVED_ONLY = text("status = 'APPROVED'")
+PENDING_ONLY = text("status = 'PENDING'")
+
+
 class Review(Base):
     __tablename__ = "reviews"
+    # Shaped after the feed queries: equality filters first, then the keyset
+    # (sort column, id). Enum columns store member names, hence 'APPROVED'.
+    __table_args__ = (
+        Index("ix_reviews_approved_created_at", "created_at", "id",
+              postgresql_where=APPROVED_ONLY, sqlite_where=APPROVED_ONLY),
+        Index("ix_reviews_approved_likes", "likes", "id",
+              postgresql_where=APPROVED_ONLY, sqlite_where=APPROVED_ONLY),
+        Index("ix_reviews_user_created_at", "user_id", "created_at", "id"),
+        Index("ix_reviews_user_likes", "user_id", "likes", "id"),
+        Index("ix_reviews_pending_created_at", "created_at", "id",
+              postgresql_where=PENDING_ONLY, sqlite_where=PENDING_ONLY),
+    )
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String(100), nullable=False)
     movie_title = Column(String(100), nullable=False)
     content = Column(Text, nullable=False)
+    # Derived from content whenever it is set, so feed listings can defer
+    # the full body.
+    excerpt = Column(String(REVIEW_EXCERPT_LENGTH + 1), nullable=False)
+    content_length = Column(Integer, nullable=False)
     status = Column(Enum(ReviewStatus), nullable=False, default=ReviewStatus.PENDING)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set on the Python side as well so every backend stores the same precision,
+    # which keyset pagination on (created_at, id) relies on.
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
     likes = Column(Integer, nullable=False, default=0)
+    # Bumped on every change to the row; review ETags are derived from it.
+    # Core UPDATEs bump it explicitly, ORM flushes through _bump_version.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     author = relationship("User", back_populates="reviews")
     user_likes = relationship("Like", back_populates="review", cascade="all, delete-orphan")
@@ -48,10 +88,23 @@ class Review(Base):
     #    return len(self.user_likes) if self.user_likes else 0
 
 
+@event.listens_for(Review.content, "set")
+def _derive_excerpt(review: Review, content: str, old_content, initiator) -> None:
+    if content is not None:
+        review.excerpt = make_excerpt(content)
+        review.content_length = len(content)
+
+
+@event.listens_for(Review, "before_update")
+def _bump_version(mapper, connection, review: Review) -> None:
+    review.version = Review.version + 1
+
+
 class Like(Base):
     __tablename__ = "likes"
     __table_args__ = (
         UniqueConstraint('user_id', 'review_id', name='uq_user_review'),
+        Index("ix_likes_review_id", "review_id"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -61,3 +114,38 @@ class Like(Base):
 
     user = relationship("User", back_populates="likes")
     review = relationship("Review", back_populates="user_likes")
+
+
+class ReviewCounter(Base):
+    __tablename__ = "review_counters"
+
+    # "status:<status>", "user:<id>" or "user:<id>:status:<status>"
+    scope = Column(String(64), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ReviewLikeDelta(Base):
+    __tablename__ = "review_like_deltas"
+
+    # Append-only +1/-1 rows written instead of updating reviews.likes when
+    # LIKE_COUNTER_MODE is "buffered"; folded into reviews.likes in batches.
+    id = Column(Integer, primary_key=True)
+    review_id = Column(Integer, ForeignKey("reviews.id", ondelete="CASCADE"), nullable=False, index=True)
+    delta = Column(Integer, nullable=False)
+
+
+class ModerationClaim(Base):
+    __tablename__ = "moderation_claims"
+
+    # A moderator's lease on a pending review; an expired row counts as free.
+    review_id = Column(Integer, ForeignKey("reviews.id", ondelete="CASCADE"), primary_key=True)
+    moderator_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,82 @@
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+_QUOTED = re.compile(r"'(?:[^']|'')*'")
+_NAMED_PARAMS = re.compile(r"%\(\w+\)s")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+# Expanded IN lists differ in length per call: "(?, ?, ?)" -> "(...)".
+_VALUE_LISTS = re.compile(r"\(\s*[?$%:][^()]*?(?:,\s*[?$%:][^()]*?)+\)")
+
+
+def fingerprint(statement: str) -> str:
+    statement = " ".join(statement.split())
+    statement = _QUOTED.sub("?", statement)
+    statement = _NAMED_PARAMS.sub("?", statement)
+    statement = _NUMBERS.sub("?", statement)
+    return _VALUE_LISTS.sub("(...)", statement)
+
+
+class RequestQueries:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[fingerprint(statement)] += 1
+
+    def most_repeated(self) -> Optional[Tuple[str, int]]:
+        if not self.statements:
+            return None
+        return self.statements.most_common(1)[0]
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def start() -> Tuple[RequestQueries, object]:
+    queries = RequestQueries()
+    return queries, _current.set(queries)
+
+
+def finish(token: object) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+# Registered on the Engine class, so the sync, async and replica engines are
+# all covered. ORM code run through AsyncSession.run_sync keeps the request's
+# context, so statements are attributed to the request that issued them.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    queries = _current.get()
+    started = conn.info.get("query_started")
+    if queries is None or not started:
+        return
+    queries.record(statement, time.perf_counter() - started.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context) -> None:
+    # after_cursor_execute does not fire for failed statements.
+    started = context.connection.info.get("query_started") if context.connection else None
+    if started:
+        started.pop()
@@ -0,0 +1,64 @@
+import hashlib
+import hmac
+import itertools
+import time
+from typing import Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+
+class ReplicaSet:
+    def __init__(self, engines: Sequence[AsyncEngine] = ()):
+        self.engines = list(engines)
+        self._session_factories = [
+            async_sessionmaker(engine, class_=AsyncSession, autoflush=False)
+            for engine in self.engines
+        ]
+        self._next = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def session(self) -> AsyncSession:
+        index = next(self._next) % len(self._session_factories)
+        return self._session_factories[index]()
+
+    def owns(self, db) -> bool:
+        return getattr(db, "bind", None) in self.engines
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+class ReadYourWrites:
+    # Shared by every worker without shared state: a write response carries a
+    # signed "<user_id>.<written_at_ms>.<signature>" marker in HEADER, the
+    # client echoes it on later requests, and reads presenting a valid marker
+    # for the same user within window_seconds stay on the primary.
+    HEADER = "X-Last-Write"
+
+    def __init__(self, secret: str, window_seconds: float):
+        self._secret = secret.encode()
+        self.window_seconds = window_seconds
+
+    def issue(self, user_id: int) -> str:
+        payload = f"{user_id}.{int(time.time() * 1000)}"
+        return f"{payload}.{self._sign(payload)}"
+
+    def is_recent(self, marker: Optional[str], user_id: Optional[int]) -> bool:
+        if not marker or user_id is None:
+            return False
+        payload, _, signature = marker.rpartition(".")
+        marker_user, _, written_at = payload.partition(".")
+        if not hmac.compare_digest(signature, self._sign(payload)) or marker_user != str(user_id):
+            return False
+        try:
+            age = time.time() - int(written_at) / 1000
+        except ValueError:
+            return False
+        # abs(): workers on other hosts may have clocks slightly ahead.
+        return abs(age) <= self.window_seconds
+
+    def _sign(self, payload: str) -> str:
+        return hmac.new(self._secret, payload.encode(), hashlib.sha256).hexdigest()[:32]
@@ -0,0 +1,251 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import (
+    DDL, bindparam, case, column, event, false, func, literal, literal_column, select, table
+)
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.elements import ColumnElement
+import app.db.models as models
+from app.core.config import settings
+from app.db.utils import dialect_name
+from app.utils.ngram import NGramIndex
+
+
+# Postgres keeps a generated tsvector over title/movie_title (weight A) and
+# content (weight B), in both Russian and English so either language stems.
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE reviews ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian', coalesce(title, '') || ' ' || coalesce(movie_title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(movie_title, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(content, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_reviews_search_vector ON reviews USING gin (search_vector)",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_reviews_title_trgm ON reviews USING gin (title gin_trgm_ops)",
+    "CREATE INDEX ix_reviews_movie_title_trgm ON reviews USING gin (movie_title gin_trgm_ops)",
+]
+
+# SQLite keeps an external-content FTS5 index in sync with triggers.
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE reviews_fts USING fts5(
+        title, movie_title, content,
+        content='reviews', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER reviews_fts_ai AFTER INSERT ON reviews BEGIN
+        INSERT INTO reviews_fts (rowid, title, movie_title, content)
+        VALUES (new.id, new.title, new.movie_title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_fts_ad AFTER DELETE ON reviews BEGIN
+        INSERT INTO reviews_fts (reviews_fts, rowid, title, movie_title, content)
+        VALUES ('delete', old.id, old.title, old.movie_title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_fts_au AFTER UPDATE OF title, movie_title, content ON reviews BEGIN
+        INSERT INTO reviews_fts (reviews_fts, rowid, title, movie_title, content)
+        VALUES ('delete', old.id, old.title, old.movie_title, old.content);
+        INSERT INTO reviews_fts (rowid, title, movie_title, content)
+        VALUES (new.id, new.title, new.movie_title, new.content);
+    END
+    """,
+]
+
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(models.Review.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(models.Review.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    models.Review.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS reviews_fts").execute_if(dialect="sqlite")
+)
+
+
+class ReviewSearch:
+    # Substring match on title and movie_title; used when the backend has no
+    # full-text index.
+    def __init__(self, term: str):
+        self.term = term
+
+    def filter(self, query: Query) -> Query:
+        search_term = f"%{self.term}%"
+        return query.filter(
+            (models.Review.title.ilike(search_term)) |
+            (models.Review.movie_title.ilike(search_term))
+        )
+
+    def rank(self) -> ColumnElement:
+        return literal(0)
+
+
+class PostgresReviewSearch(ReviewSearch):
+    search_vector = literal_column("reviews.search_vector")
+
+    def _tsquery(self) -> ColumnElement:
+        return func.websearch_to_tsquery("russian", self.term).op("||")(
+            func.websearch_to_tsquery("english", self.term)
+        )
+
+    def filter(self, query: Query) -> Query:
+        return query.filter(self.search_vector.op("@@")(self._tsquery()))
+
+    def rank(self) -> ColumnElement:
+        return func.ts_rank_cd(self.search_vector, self._tsquery())
+
+
+class SQLiteReviewSearch(ReviewSearch):
+    fts_table = table("reviews_fts", column("rowid"))
+    # FTS5 takes the table name itself as the MATCH and bm25() operand.
+    fts_ref = literal_column("reviews_fts")
+
+    def _match_expression(self) -> str:
+        # Every word is quoted so FTS5 syntax in user input is matched literally,
+        # and prefix-matched so partially typed words still hit.
+        words = self.term.split()
+        return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+
+    def filter(self, query: Query) -> Query:
+        expression = self._match_expression()
+        if not expression:
+            # An empty MATCH is an FTS5 syntax error; no words means no filter.
+            return query
+        return (
+            query.join(self.fts_table, self.fts_table.c.rowid == models.Review.id)
+            .filter(self.fts_ref.match(expression))
+        )
+
+    def rank(self) -> ColumnElement:
+        # bm25() is lower-is-better; negate it so every backend ranks higher-is-better.
+        return -func.bm25(self.fts_ref)
+
+
+class PostgresFuzzyReviewSearch(ReviewSearch):
+    # pg_trgm word similarity on title and movie_title, served by the trigram
+    # GIN indexes. The query arrives with its status/author filters applied,
+    # so the candidate cap keeps the best FUZZY_SEARCH_MAX_CANDIDATES rows in
+    # scope and pages and counts never sort or count beyond them.
+    def filter(self, query: Query) -> Query:
+        term = literal(self.term)
+        candidates = (
+            query.with_entities(models.Review.id)
+            .filter(term.op("<%")(models.Review.title) | term.op("<%")(models.Review.movie_title))
+            .order_by(self.rank().desc(), models.Review.id.desc())
+            .limit(settings.FUZZY_SEARCH_MAX_CANDIDATES)
+            .subquery()
+        )
+        return query.filter(models.Review.id.in_(select(candidates.c.id)))
+
+    def rank(self) -> ColumnElement:
+        return func.greatest(
+            func.word_similarity(self.term, models.Review.title),
+            func.word_similarity(self.term, models.Review.movie_title)
+        )
+
+
+# Fallback for SQLite: a process-wide trigram index over review titles. It is
+# loaded on first use and kept current from this process's committed ORM
+# changes; other workers' writes are picked up by the periodic reload.
+review_title_index = NGramIndex(settings.FUZZY_SEARCH_INDEX_REFRESH_SECONDS)
+
+
+class SQLiteFuzzyReviewSearch(ReviewSearch):
+    def __init__(self, term: str, db: Session):
+        super().__init__(term)
+        _ensure_title_index(db)
+        self.matches = review_title_index.search(term, threshold=settings.FUZZY_SEARCH_THRESHOLD)
+        self.candidates: Optional[List[Tuple[int, float]]] = None
+
+    def filter(self, query: Query) -> Query:
+        if self.candidates is None:
+            self.candidates = self._scoped_candidates(query)
+        if not self.candidates:
+            return query.filter(false())
+        return query.filter(models.Review.id.in_([doc_id for doc_id, _ in self.candidates]))
+
+    def rank(self) -> ColumnElement:
+        if not self.candidates:
+            return literal(0)
+        return case(dict(self.candidates), value=models.Review.id, else_=0)
+
+    def _scoped_candidates(self, query: Query) -> List[Tuple[int, float]]:
+        # The index knows nothing of status or author, so the matches are
+        # narrowed by the query's own filters before the cap; capping first
+        # would drop in-scope rows from /my and author pages. The ids are
+        # rendered inline: the match list can outgrow SQLite's bound
+        # parameter limit.
+        if not self.matches:
+            return []
+        in_scope = {
+            review_id for (review_id,) in query.with_entities(models.Review.id).filter(
+                models.Review.id.in_(bindparam(
+                    "fuzzy_match_ids",
+                    [doc_id for doc_id, _ in self.matches],
+                    expanding=True,
+                    literal_execute=True
+                ))
+            )
+        }
+        scoped = [match for match in self.matches if match[0] in in_scope]
+        return scoped[:settings.FUZZY_SEARCH_MAX_CANDIDATES]
+
+
+def _ensure_title_index(db: Session) -> None:
+    if not review_title_index.is_stale():
+        return
+    rows = db.execute(
+        select(models.Review.id, models.Review.title, models.Review.movie_title)
+    ).all()
+    review_title_index.load((review_id, (title, movie_title)) for review_id, title, movie_title in rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_title_changes(session: Session, flush_context) -> None:
+    if not review_title_index.loaded:
+        return
+    changes = session.info.setdefault("review_title_changes", [])
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, models.Review):
+            changes.append((obj.id, (obj.title, obj.movie_title)))
+    for obj in session.deleted:
+        if isinstance(obj, models.Review):
+            changes.append((obj.id, None))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_title_changes(session: Session) -> None:
+    for review_id, fields in session.info.pop("review_title_changes", []):
+        if fields is None:
+            review_title_index.remove(review_id)
+        else:
+            review_title_index.add(review_id, fields)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_title_changes(session: Session) -> None:
+    session.info.pop("review_title_changes", None)
+
+
+def review_search(db: Session, term: str, fuzzy: bool = False) -> ReviewSearch:
+    dialect = dialect_name(db)
+    if dialect == "postgresql":
+        if fuzzy:
+            db.execute(select(func.set_config(
+                "pg_trgm.word_similarity_threshold",
+                str(settings.FUZZY_SEARCH_THRESHOLD),
+                True
+            )))
+            return PostgresFuzzyReviewSearch(term)
+        return PostgresReviewSearch(term)
+    if dialect == "sqlite":
+        if fuzzy:
+            return SQLiteFuzzyReviewSearch(term, db)
+        return SQLiteReviewSearch(term)
+    return ReviewSearch(term)
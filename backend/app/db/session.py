@@ -1,13 +1,86 @@
+from typing import Any, Dict, Type
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import Pool
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from app.db.routing import ReadYourWrites, ReplicaSet
 
-engine = create_engine(settings.DATABASE_URL)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def engine_options(url: str, poolclass: Type[Pool]) -> Dict[str, Any]:
+    # SQLite keeps SQLAlchemy's default pools (in-memory databases need a
+    # single shared connection), so sizing only applies to server databases.
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    **engine_options(settings.DATABASE_URL, InstrumentedQueuePool)
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    **engine_options(settings.DATABASE_URL, InstrumentedAsyncAdaptedQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False
+)
+
+read_replicas = ReplicaSet([
+    create_async_engine(
+        async_database_url(url),
+        **engine_options(url, InstrumentedAsyncAdaptedQueuePool)
+    )
+    for url in (part.strip() for part in settings.DATABASE_REPLICA_URLS.split(","))
+    if url
+])
+read_your_writes = ReadYourWrites(settings.SECRET_KEY, settings.READ_YOUR_WRITES_SECONDS)
+
+def database_pools() -> Dict[str, Pool]:
+    pools = {
+        "sync": engine.pool,
+        "async": async_engine.pool,
+    }
+    for index, replica in enumerate(read_replicas.engines):
+        pools[f"replica-{index}"] = replica.pool
+    return pools
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
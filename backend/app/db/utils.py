@@ -0,0 +1,20 @@
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+
+def dialect_name(db: Session) -> str:
+    bind = db.get_bind()
+    return getattr(bind.dialect, "name", "") if bind is not None else ""
+
+
+# serialization_failure and deadlock_detected on Postgres; SQLite reports a
+# busy writer lock as "database is locked".
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+
+def is_retryable_error(exc: DBAPIError) -> bool:
+    orig = exc.orig
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if sqlstate in RETRYABLE_SQLSTATES:
+        return True
+    return "database is locked" in str(orig)
@@ -1,20 +1,59 @@
-from fastapi import Depends, Header, HTTPException
+from fastapi import Depends, Header, HTTPException, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
 from typing import Optional
 from jose import JWTError
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.crud.revoked_token import CRUDRevokedToken
+from app.db.session import get_async_db, read_replicas, read_your_writes
 import app.db.models as models
 from app.utils.security import verify_token
+from app.utils.token_denylist import token_denylist
 from app.exceptions import AuthenticationError, UserNotFoundError, PermissionDeniedError
 
 bearer_scheme = HTTPBearer()
 
-def get_current_user(
+READ_METHODS = {"GET", "HEAD"}
+
+
+async def get_read_db(
+    request: Request,
+    primary: AsyncSession = Depends(get_async_db)
+):
+    # Mutations, and reads by users who wrote within the read-your-writes
+    # window, stay on the primary; other reads go to a replica if configured.
+    if (
+        not read_replicas.enabled
+        or request.method not in READ_METHODS
+        or read_your_writes.is_recent(
+            request.headers.get(read_your_writes.HEADER),
+            _bearer_user_id(request.headers.get("Authorization"))
+        )
+    ):
+        yield primary
+        return
+    async with read_replicas.session() as db:
+        yield db
+
+
+def _bearer_user_id(authorization: Optional[str]) -> Optional[int]:
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    try:
+        payload = verify_token(authorization[7:])
+        return int(payload.get("sub")) if payload else None
+    except (JWTError, ValueError, TypeError):
+        return None
+
+
+async def get_token_claims(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: Session = Depends(get_db)
-) -> models.User:
+    # The deny-list is refreshed from the primary: a lagging replica would
+    # hand back a table without the latest revocations.
+    db: AsyncSession = Depends(get_async_db)
+) -> dict:
     credentials_exception = AuthenticationError("Could not validate credentials")
 
     token = credentials.credentials
@@ -29,13 +68,54 @@ def get_current_user(
     except (JWTError, ValueError, TypeError):
         raise credentials_exception
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    if token_denylist.is_stale():
+        entries = await db.run_sync(CRUDRevokedToken.get_active, datetime.now(timezone.utc))
+        token_denylist.load(entries)
+    if token_denylist.is_revoked(payload.get("jti")):
+        raise AuthenticationError("Token has been revoked")
+    
+    return payload
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_read_db),
+    primary: AsyncSession = Depends(get_async_db)
+) -> models.User:
+    payload = await get_token_claims(credentials, db)
+    user_id = int(payload["sub"])
+    
+    if settings.JWT_CLAIMS_AUTH and "username" in payload and "role" in payload:
+        return _principal_from_claims(user_id, payload)
+    
+    user = await db.get(models.User, user_id)
+    if user is None and read_replicas.owns(db):
+        # The account may be newer than the replica.
+        user = await primary.get(models.User, user_id)
     if user is None:
         raise UserNotFoundError()
     
     return user
 
 
+def _principal_from_claims(user_id: int, payload: dict) -> models.User:
+    # Transient, never added to a session: services only read id, username
+    # and role from the current user.
+    try:
+        role = models.Role(payload["role"])
+    except ValueError:
+        raise AuthenticationError("Could not validate credentials")
+    return models.User(id=user_id, username=payload["username"], role=role)
+
+
+async def mark_recent_writer(
+    response: Response,
+    current_user: models.User = Depends(get_current_user)
+) -> None:
+    # Routes that return a Response themselves must copy response.headers.
+    response.headers[read_your_writes.HEADER] = read_your_writes.issue(current_user.id)
+
+
 def get_current_admin(
     current_user: models.User = Depends(get_current_user)
 ) -> models.User:
@@ -44,9 +124,10 @@ def get_current_admin(
     return current_user
 
 
-def get_current_user_optional(
+async def get_current_user_optional(
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    primary: AsyncSession = Depends(get_async_db)
 ) -> Optional[models.User]:
     if not authorization or not authorization.startswith("Bearer "):
         return None
@@ -55,6 +136,6 @@ def get_current_user_optional(
         def __init__(self, token: str):
             self.credentials = token
     try:
-        return get_current_user(Credentials(token), db)
+        return await get_current_user(Credentials(token), db, primary)
     except (HTTPException, AuthenticationError, UserNotFoundError):
         return None
@@ -62,3 +62,35 @@ class InvalidReviewStateError(AppException):
     
     def __init__(self, detail: Optional[str] = None, **kwargs: Any):
         super().__init__(detail=detail, **kwargs)
+
+
+class InvalidCursorError(AppException):
+    status_code = 400
+    default_detail = "Invalid pagination cursor"
+    
+    def __init__(self, detail: Optional[str] = None, **kwargs: Any):
+        super().__init__(detail=detail, **kwargs)
+
+
+class InvalidFieldsError(AppException):
+    status_code = 400
+    default_detail = "Invalid fields selection"
+    
+    def __init__(self, detail: Optional[str] = None, **kwargs: Any):
+        super().__init__(detail=detail, **kwargs)
+
+
+class LikeConflictError(AppException):
+    status_code = 409
+    default_detail = "Like was changed by a concurrent request, please retry"
+    
+    def __init__(self, detail: Optional[str] = None, **kwargs: Any):
+        super().__init__(detail=detail, **kwargs)
+
+
+class ServiceUnavailableError(AppException):
+    status_code = 503
+    default_detail = "Service temporarily unavailable"
+    
+    def __init__(self, detail: Optional[str] = None, **kwargs: Any):
+        super().__init__(detail=detail, **kwargs)
@@ -1,18 +1,49 @@
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.core.config import settings
+from app.core.config import settings, LikeCounterMode
 from app.api.api import api_router
+from app.api.compression import CompressionMiddleware
+from app.api.metrics import MetricsMiddleware, router as metrics_router
+from app.api.query_budget import QueryBudgetMiddleware
+from app.db.routing import ReadYourWrites
+from app.db.session import AsyncSessionLocal, async_engine, read_replicas
+from app.services.like_counter_flusher import LikeCounterFlusher
+from app.utils.metrics import mark_process_dead
+from app.utils.password_hasher import password_hasher
+
+
+like_counter_flusher = LikeCounterFlusher(
+    AsyncSessionLocal,
+    interval_seconds=settings.LIKE_DELTA_FLUSH_SECONDS,
+    batch_size=settings.LIKE_DELTA_FLUSH_BATCH_SIZE
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.LIKE_COUNTER_MODE == LikeCounterMode.BUFFERED:
+        like_counter_flusher.start()
+    yield
+    await like_counter_flusher.stop()
+    await async_engine.dispose()
+    await read_replicas.dispose()
+    password_hasher.shutdown()
+    mark_process_dead()
+
 
 app = FastAPI(
     title="Absolute Cinema Reviews API",
     description="API для публикации и модерации рецензий на фильмы",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 
@@ -22,8 +53,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[ReadYourWrites.HEADER],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+app.add_middleware(QueryBudgetMiddleware)
+
 app.include_router(api_router, prefix="/api")
 
 @app.get("/")
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, Optional, List
 from datetime import datetime
 from enum import Enum
 import app.db.models as models
@@ -9,11 +9,29 @@ ReviewStatus = models.ReviewStatus
 class SortBy(str, Enum):
     CREATED_AT = "created_at"
     LIKES = "likes"
+    RELEVANCE = "relevance"
 
 class SortOrder(str, Enum):
     ASC = "asc"
     DESC = "desc"
 
+class SearchMode(str, Enum):
+    FULLTEXT = "fulltext"
+    FUZZY = "fuzzy"
+
+class ContentMode(str, Enum):
+    FULL = "full"
+    EXCERPT = "excerpt"
+
+class ModerationAction(str, Enum):
+    APPROVE = "approve"
+    REJECT = "reject"
+
+class ModerationOutcome(str, Enum):
+    APPLIED = "applied"
+    NOT_FOUND = "not_found"
+    ALREADY_PROCESSED = "already_processed"
+
 
 class ReviewCreate(BaseModel):
     title: str = Field(..., min_length=5, max_length=100)
@@ -30,7 +48,14 @@ class PaginationParams(BaseModel):
     limit: int = Field(20, ge=1, le=100)
     sort: SortBy = SortBy.CREATED_AT
     order: SortOrder = SortOrder.DESC
-    search: Optional[str] = Field(None, min_length=2, max_length=50)
+    # Stripped before the length check, so a blank term is rejected.
+    search: Optional[Annotated[str, StringConstraints(strip_whitespace=True, min_length=2, max_length=50)]] = None
+    search_mode: SearchMode = SearchMode.FULLTEXT
+    # "excerpt" returns the stored excerpt in place of the full content.
+    content: ContentMode = ContentMode.FULL
+    cursor: Optional[str] = Field(None, min_length=1, max_length=256)
+    # Comma-separated response fields, e.g. "title,likes"; id is always returned.
+    fields: Optional[str] = Field(None, min_length=1, max_length=200)
 
 
 class PublicPaginationParams(PaginationParams):
@@ -42,6 +67,12 @@ class PaginationInfo(BaseModel):
     total_pages: int
     total_items: int
     items_per_page: int
+    total_is_exact: bool = True
+
+
+class CursorPaginationInfo(BaseModel):
+    next_cursor: Optional[str] = None
+    has_more: bool
 
 
 class AuthorInfo(BaseModel):
@@ -57,6 +88,7 @@ class BaseReviewResponse(BaseModel):
     title: str
     movie_title: str
     content: str
+    content_length: int
     status: ReviewStatus
     likes: int
     created_at: datetime
@@ -73,6 +105,7 @@ class ReviewResponse(BaseReviewResponse):
 class PaginatedReviewsResponse(BaseModel):
     reviews: List[ReviewResponse]
     pagination: PaginationInfo
+    cursor: Optional[CursorPaginationInfo] = None
 
 
 class MyReviewResponse(BaseReviewResponse):
@@ -82,6 +115,7 @@ class MyReviewResponse(BaseReviewResponse):
 class PaginatedMyReviewsResponse(BaseModel):
     reviews: List[MyReviewResponse]
     pagination: PaginationInfo
+    cursor: Optional[CursorPaginationInfo] = None
 
 
 class DetailReviewResponse(ReviewResponse):
@@ -95,3 +129,23 @@ class ReviewCreateResponse(BaseModel):
 class LikeToggleResponse(BaseModel):
     likes: int
     is_liked: bool
+
+
+class BulkModerationRequest(BaseModel):
+    review_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    action: ModerationAction
+
+
+class BulkModerationResult(BaseModel):
+    id: int
+    outcome: ModerationOutcome
+
+
+class BulkModerationResponse(BaseModel):
+    applied: int
+    results: List[BulkModerationResult]
+
+
+class ModerationClaimResponse(BaseModel):
+    reviews: List[ReviewResponse]
+    lease_expires_at: datetime
@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+
+class PoolStatus(BaseModel):
+    pool_class: str
+    size: Optional[int] = None
+    checked_out: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+    max_overflow: Optional[int] = None
+    timeout_seconds: Optional[float] = None
+    checkouts: Optional[int] = None
+    timeouts: Optional[int] = None
+    overflow_events: Optional[int] = None
+    wait_seconds_total: Optional[float] = None
+    wait_seconds_max: Optional[float] = None
+    wait_seconds_avg: Optional[float] = None
+
+
+class DatabasePoolsResponse(BaseModel):
+    pools: Dict[str, PoolStatus]
+
+
+class HashOperationStats(BaseModel):
+    count: int
+    seconds_total: float
+    seconds_max: float
+
+
+class PasswordHasherStatus(BaseModel):
+    workers: int
+    max_pending: int
+    pending: int
+    pending_max: int
+    rejected: int
+    operations: Dict[str, HashOperationStats]
@@ -0,0 +1,26 @@
+from typing import Any, Callable, Generic, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+S = TypeVar("S")
+T = TypeVar("T")
+
+
+class AsyncService(Generic[S]):
+    # Runs a sync service on an AsyncSession. run_sync executes the ORM code in
+    # a greenlet on the event loop, so its queries go through the async driver
+    # (asyncpg/aiosqlite) without occupying a threadpool worker.
+    def __init__(self, db: AsyncSession, factory: Callable[[Session], S]):
+        self.db = db
+        self.factory = factory
+
+    async def call(self, method: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self.db.run_sync(
+            lambda session: method(self.factory(session), *args, **kwargs)
+        )
+
+    async def release(self) -> None:
+        # Ends the read transaction and returns its connection to the pool
+        # before a long non-database step; the next call starts a new one.
+        # Loaded objects are expired and reload on their next use.
+        await self.db.rollback()
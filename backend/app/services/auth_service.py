@@ -0,0 +1,34 @@
+import app.schemas.user as user_schemas
+from app.exceptions import AuthenticationError
+from app.services.async_service import AsyncService
+from app.services.user_service import UserService
+from app.utils.password_hasher import PasswordHasher, password_hasher
+
+
+class AuthService:
+    # Database work runs on the async session; bcrypt runs in the hasher's
+    # process pool between those steps, so no session work waits on hashing.
+    # The lookup's transaction is ended before hashing: hashing may queue up
+    # to PASSWORD_HASH_MAX_PENDING requests, more than the pool's connections,
+    # and none of them should hold one while they wait.
+    def __init__(
+        self,
+        users: AsyncService[UserService],
+        hasher: PasswordHasher = password_hasher
+    ):
+        self.users = users
+        self.hasher = hasher
+
+    async def register_user(self, user_data: user_schemas.UserCreate) -> user_schemas.Token:
+        await self.users.call(UserService.ensure_username_available, user_data.username)
+        await self.users.release()
+        password_hash = await self.hasher.hash(user_data.password)
+        return await self.users.call(UserService.register_user, user_data, password_hash)
+
+    async def login_user(self, credentials: user_schemas.UserCreate) -> user_schemas.Token:
+        user = await self.users.call(UserService.get_login_user, credentials.username)
+        password_hash = user.password_hash
+        await self.users.release()
+        if not await self.hasher.verify(credentials.password, password_hash):
+            raise AuthenticationError()
+        return await self.users.call(UserService.issue_token, user)
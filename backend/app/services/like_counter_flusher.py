@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.crud.like_delta import CRUDLikeDelta
+from app.utils.feed_cache import public_feed_cache
+
+logger = logging.getLogger(__name__)
+
+
+class LikeCounterFlusher:
+    # Background task of the buffered like-counter mode: every interval it
+    # folds review_like_deltas into reviews.likes, batch by batch, until the
+    # table is drained. Each worker process runs one.
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval_seconds: float,
+        batch_size: int
+    ):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.feed_cache = public_feed_cache
+        self._task: Optional[asyncio.Task] = None
+
+    async def flush(self) -> int:
+        flushed = 0
+        async with self.session_factory() as db:
+            while True:
+                rows = await db.run_sync(CRUDLikeDelta.flush, self.batch_size)
+                flushed += rows
+                if rows < self.batch_size:
+                    break
+        if flushed:
+            self.feed_cache.bump()
+        return flushed
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Flushing like deltas failed")
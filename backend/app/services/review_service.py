@@ -1,21 +1,42 @@
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
 from sqlalchemy.orm import Session
 from math import ceil
 import app.db.models as models
 import app.schemas.review as review_schemas
+from app.core.config import settings, CountStrategy, LikeCounterMode
 from app.crud.review import CRUDReview
 from app.crud.like import CRUDLike
+from app.crud.like_delta import CRUDLikeDelta
+from app.crud.moderation_claim import CRUDModerationClaim
+from app.utils.feed_cache import public_feed_cache
+from app.utils.etag import make_etag
+from app.utils.fields import FieldSet, parse_fields, selects
+from app.utils.pagination import KeysetPosition, encode_cursor, decode_cursor
 from app.exceptions import (
     ReviewNotFoundError,
     PermissionDeniedError,
     InvalidReviewStateError
 )
 
+
+# Response fields copied from the review row as-is.
+REVIEW_COLUMN_FIELDS = ("title", "movie_title", "content_length", "status", "created_at")
+
+MODERATION_STATUSES = {
+    review_schemas.ModerationAction.APPROVE: models.ReviewStatus.APPROVED,
+    review_schemas.ModerationAction.REJECT: models.ReviewStatus.REJECTED,
+}
+
+
 class ReviewService:
     def __init__(self, db: Session):
         self.db = db
         self.review_crud = CRUDReview()
         self.like_crud = CRUDLike()
+        self.like_delta_crud = CRUDLikeDelta()
+        self.claim_crud = CRUDModerationClaim()
+        self.feed_cache = public_feed_cache
     
 
     def get_public_reviews(
@@ -24,20 +45,46 @@ class ReviewService:
         current_user: Optional[models.User]
     ) -> review_schemas.PaginatedReviewsResponse:
         
-        skip = (pagination.page - 1) * pagination.limit
+        fields = parse_fields(pagination.fields, review_schemas.ReviewResponse)
+        sort = self._effective_sort(pagination)
+        after = self._decode_cursor(pagination.cursor, sort, pagination.order)
+        skip = 0 if after else (pagination.page - 1) * pagination.limit
         
+        count_strategy = settings.PUBLIC_REVIEWS_COUNT_STRATEGY
         reviews, total = self.review_crud.get_public_reviews(
             db=self.db,
             skip=skip,
-            limit=pagination.limit,
-            sort_by=pagination.sort,
+            limit=pagination.limit + 1,
+            sort_by=sort,
             sort_order=pagination.order,
             search=pagination.search,
-            author_id=pagination.author_id
+            author_id=pagination.author_id,
+            after=after,
+            search_mode=pagination.search_mode,
+            content_mode=pagination.content,
+            fields=fields,
+            with_total=count_strategy == CountStrategy.EXACT
         )
+        total_is_exact = True
+        if total is None:
+            total, total_is_exact = self.review_crud.count_public_reviews(
+                db=self.db,
+                strategy=count_strategy,
+                search=pagination.search,
+                author_id=pagination.author_id,
+                search_mode=pagination.search_mode
+            )
         
+        reviews, has_more = self._trim_page(reviews, pagination.limit)
+        liked_review_ids = self._get_liked_review_ids(
+            reviews,
+            current_user.id if current_user else None,
+            fields
+        )
+        current_likes = self._get_current_likes(reviews, fields)
+        excerpt = pagination.content == review_schemas.ContentMode.EXCERPT
         review_responses = [
-            self._build_review_response(review, current_user)
+            self._build_review_response(review, liked_review_ids, current_likes, excerpt, fields)
             for review in reviews
         ]
         
@@ -46,8 +93,10 @@ class ReviewService:
             pagination=self._build_pagination_info(
                 page=pagination.page,
                 limit=pagination.limit,
-                total=total
-            )
+                total=total,
+                total_is_exact=total_is_exact
+            ),
+            cursor=self._build_cursor_info(reviews, has_more, sort, pagination.order)
         )
     
     def get_my_reviews(
@@ -56,29 +105,42 @@ class ReviewService:
         current_user: models.User
     ) -> review_schemas.PaginatedMyReviewsResponse:
 
-        skip = (pagination.page - 1) * pagination.limit
+        fields = parse_fields(pagination.fields, review_schemas.MyReviewResponse)
+        sort = self._effective_sort(pagination)
+        after = self._decode_cursor(pagination.cursor, sort, pagination.order)
+        skip = 0 if after else (pagination.page - 1) * pagination.limit
         
+        count_strategy = settings.MY_REVIEWS_COUNT_STRATEGY
         reviews, total = self.review_crud.get_user_reviews(
             db=self.db,
             user_id=current_user.id,
             skip=skip,
-            limit=pagination.limit,
-            sort_by=pagination.sort,
+            limit=pagination.limit + 1,
+            sort_by=sort,
             sort_order=pagination.order,
-            search=pagination.search
+            search=pagination.search,
+            after=after,
+            search_mode=pagination.search_mode,
+            content_mode=pagination.content,
+            fields=fields,
+            with_total=count_strategy == CountStrategy.EXACT
         )
+        total_is_exact = True
+        if total is None:
+            total, total_is_exact = self.review_crud.count_user_reviews(
+                db=self.db,
+                strategy=count_strategy,
+                user_id=current_user.id,
+                search=pagination.search,
+                search_mode=pagination.search_mode
+            )
         
+        reviews, has_more = self._trim_page(reviews, pagination.limit)
+        liked_review_ids = self._get_liked_review_ids(reviews, current_user.id, fields)
+        current_likes = self._get_current_likes(reviews, fields)
+        excerpt = pagination.content == review_schemas.ContentMode.EXCERPT
         review_responses = [
-            review_schemas.MyReviewResponse(
-                id=review.id,
-                title=review.title,
-                movie_title=review.movie_title,
-                content=review.content,
-                status=review.status,
-                likes=review.likes,
-                created_at=review.created_at,
-                is_liked=self._is_review_liked_by_user(review.id, current_user.id)
-            )
+            self._build_my_review_response(review, liked_review_ids, current_likes, excerpt, fields)
             for review in reviews
         ]
         
@@ -87,8 +149,10 @@ class ReviewService:
             pagination=self._build_pagination_info(
                 page=pagination.page,
                 limit=pagination.limit,
-                total=total
-            )
+                total=total,
+                total_is_exact=total_is_exact
+            ),
+            cursor=self._build_cursor_info(reviews, has_more, sort, pagination.order)
         )
     
     def get_moderation_reviews(
@@ -96,29 +160,32 @@ class ReviewService:
         pagination: review_schemas.PublicPaginationParams
     ) -> review_schemas.PaginatedReviewsResponse:
 
-        skip = (pagination.page - 1) * pagination.limit
+        fields = parse_fields(pagination.fields, review_schemas.ReviewResponse)
+        sort, order = review_schemas.SortBy.CREATED_AT, review_schemas.SortOrder.DESC
+        after = self._decode_cursor(pagination.cursor, sort, order)
+        skip = 0 if after else (pagination.page - 1) * pagination.limit
         
+        count_strategy = settings.MODERATION_COUNT_STRATEGY
         reviews, total = self.review_crud.get_pending_reviews(
             db=self.db,
             skip=skip,
-            limit=pagination.limit
+            limit=pagination.limit + 1,
+            after=after,
+            content_mode=pagination.content,
+            fields=fields,
+            with_total=count_strategy == CountStrategy.EXACT
         )
+        total_is_exact = True
+        if total is None:
+            total, total_is_exact = self.review_crud.count_pending_reviews(
+                db=self.db,
+                strategy=count_strategy
+            )
         
+        reviews, has_more = self._trim_page(reviews, pagination.limit)
+        excerpt = pagination.content == review_schemas.ContentMode.EXCERPT
         review_responses = [
-            review_schemas.ReviewResponse(
-                id=review.id,
-                title=review.title,
-                movie_title=review.movie_title,
-                content=review.content,
-                status=review.status,
-                likes=review.likes,
-                created_at=review.created_at,
-                author=review_schemas.AuthorInfo(
-                    id=review.author.id,
-                    username=review.author.username
-                ),
-                is_liked=None
-            )
+            self._build_review_response(review, None, {}, excerpt, fields)
             for review in reviews
         ]
         
@@ -127,40 +194,61 @@ class ReviewService:
             pagination=self._build_pagination_info(
                 page=pagination.page,
                 limit=pagination.limit,
-                total=total
-            )
+                total=total,
+                total_is_exact=total_is_exact
+            ),
+            cursor=self._build_cursor_info(reviews, has_more, sort, order)
         )
     
     def get_review_detail(
         self,
         review_id: int,
-        current_user: Optional[models.User]
+        current_user: Optional[models.User],
+        fields: Optional[str] = None
     ) -> review_schemas.DetailReviewResponse:
 
-        review = self.review_crud.get_with_author(self.db, review_id)
+        selected = parse_fields(fields, review_schemas.DetailReviewResponse)
+        review = self.review_crud.get_with_author(self.db, review_id, selected)
         if not review:
             raise ReviewNotFoundError()
         
-
-        is_author = current_user and current_user.id == review.user_id
-        is_admin = current_user and current_user.role == models.Role.ADMIN
+        self._ensure_visible(review.status, review.user_id, current_user)
         
-        if review.status != models.ReviewStatus.APPROVED and not is_author and not is_admin:
+        values = self._review_values(
+            review, None, self._get_current_likes([review], selected), False, selected, with_author=True
+        )
+        if selects(selected, "is_liked"):
+            values["is_liked"] = self._is_review_liked_by_user(
+                review.id, current_user.id if current_user else None
+            )
+        if selected is None:
+            return review_schemas.DetailReviewResponse(**values)
+        return review_schemas.DetailReviewResponse.model_construct(**values)
+    
+    def get_review_etag(
+        self,
+        review_id: int,
+        current_user: Optional[models.User],
+        fields: Optional[str] = None
+    ) -> str:
+
+        # Reads only the row version, so a matching If-None-Match is answered
+        # without loading or serializing the review.
+        selected = parse_fields(fields, review_schemas.DetailReviewResponse)
+        row = self.review_crud.get_version(self.db, review_id, self._likes_buffered())
+        if not row:
             raise ReviewNotFoundError()
         
-        return review_schemas.DetailReviewResponse(
-            id=review.id,
-            title=review.title,
-            movie_title=review.movie_title,
-            content=review.content,
-            status=review.status,
-            likes=review.likes,
-            author=review_schemas.AuthorInfo(
-                id=review.author.id,
-                username=review.author.username
-            ),
-            created_at=review.created_at,
-            is_liked=self._is_review_liked_by_user(review.id, current_user.id if current_user else None)
+        self._ensure_visible(row.status, row.user_id, current_user)
+        
+        return make_etag(
+            "review",
+            review_id,
+            row.version,
+            row.pending_likes_marker,
+            current_user.id if current_user else None,
+            current_user.role if current_user else None,
+            sorted(selected) if selected else None
         )
     
     def create_review(
@@ -189,6 +277,7 @@ class ReviewService:
             raise InvalidReviewStateError("Review has already been processed")
         
         self.review_crud.change_status(self.db, review,  models.ReviewStatus.APPROVED)
+        self.feed_cache.bump()
     
     def reject_review(self, review_id: int) -> None:
 
@@ -200,6 +289,58 @@ class ReviewService:
             raise InvalidReviewStateError("Review has already been processed")
         
         self.review_crud.change_status(self.db, review, models.ReviewStatus.REJECTED)
+        self.feed_cache.bump()
+    
+    def bulk_moderate(
+        self,
+        request: review_schemas.BulkModerationRequest
+    ) -> review_schemas.BulkModerationResponse:
+
+        review_ids = list(dict.fromkeys(request.review_ids))
+        status = MODERATION_STATUSES[request.action]
+        applied = set(self.review_crud.change_pending_status(self.db, review_ids, status))
+        
+        existing = applied
+        if len(applied) < len(review_ids):
+            existing = self.review_crud.get_existing_ids(self.db, review_ids)
+        if applied:
+            self.feed_cache.bump()
+        
+        return review_schemas.BulkModerationResponse(
+            applied=len(applied),
+            results=[
+                review_schemas.BulkModerationResult(
+                    id=review_id,
+                    outcome=self._moderation_outcome(review_id, applied, existing)
+                )
+                for review_id in review_ids
+            ]
+        )
+    
+    def claim_moderation_reviews(
+        self,
+        moderator: models.User,
+        limit: int
+    ) -> review_schemas.ModerationClaimResponse:
+
+        now = datetime.now(timezone.utc)
+        lease_expires_at = now + timedelta(seconds=settings.MODERATION_CLAIM_LEASE_SECONDS)
+        review_ids = self.claim_crud.claim(
+            db=self.db,
+            moderator_id=moderator.id,
+            limit=limit,
+            now=now,
+            expires_at=lease_expires_at
+        )
+        reviews = self.review_crud.get_many_with_author(self.db, review_ids)
+        
+        return review_schemas.ModerationClaimResponse(
+            reviews=[self._build_review_response(review, None, {}) for review in reviews],
+            lease_expires_at=lease_expires_at
+        )
+    
+    def release_moderation_claims(self, moderator: models.User) -> None:
+        self.claim_crud.release(self.db, moderator.id)
     
     def delete_review(self, review_id: int, current_user: models.User) -> None:
 
@@ -211,6 +352,7 @@ class ReviewService:
             raise PermissionDeniedError("You can only delete your own reviews")
         
         self.review_crud.delete(self.db, review)
+        self.feed_cache.bump()
     
     def edit_review(
         self,
@@ -234,6 +376,7 @@ class ReviewService:
             content=review_data.content,
             status=models.ReviewStatus.PENDING
         )
+        self.feed_cache.bump()
         
         return self.get_review_detail(review_id, current_user)
     
@@ -243,19 +386,19 @@ class ReviewService:
         current_user: models.User
     ) -> review_schemas.LikeToggleResponse:
 
-        review = self.review_crud.get(self.db, review_id)
-        if not review:
-            raise ReviewNotFoundError()
-        
-        if review.status != models.ReviewStatus.APPROVED:
-            raise InvalidReviewStateError("You can only like approved reviews")
-        
-        is_liked, likes_count = self.like_crud.toggle_like(
+        toggled = self.like_crud.toggle_like(
             db=self.db,
             user_id=current_user.id,
             review_id=review_id,
-            review=review
+            buffered=self._likes_buffered()
         )
+        if toggled is None:
+            if not self.review_crud.get(self.db, review_id):
+                raise ReviewNotFoundError()
+            raise InvalidReviewStateError("You can only like approved reviews")
+        
+        is_liked, likes_count = toggled
+        self.feed_cache.bump()
         
         return review_schemas.LikeToggleResponse(
             likes=likes_count,
@@ -266,27 +409,118 @@ class ReviewService:
     def _build_review_response(
         self,
         review: models.Review,
-        current_user: Optional[models.User]
+        liked_review_ids: Optional[Set[int]],
+        current_likes: Dict[int, int],
+        excerpt: bool = False,
+        fields: Optional[FieldSet] = None
     ) -> review_schemas.ReviewResponse:
 
-        return review_schemas.ReviewResponse(
-            id=review.id,
-            title=review.title,
-            movie_title=review.movie_title,
-            content=review.content,
-            status=review.status,
-            likes=review.likes,
-            created_at=review.created_at,
-            author=review_schemas.AuthorInfo(
+        # List rows come straight from typed columns, so they skip per-field
+        # validation; the page wrapper around them is still validated.
+        return review_schemas.ReviewResponse.model_construct(**self._review_values(
+            review, liked_review_ids, current_likes, excerpt, fields, with_author=True
+        ))
+    
+    def _build_my_review_response(
+        self,
+        review: models.Review,
+        liked_review_ids: Optional[Set[int]],
+        current_likes: Dict[int, int],
+        excerpt: bool = False,
+        fields: Optional[FieldSet] = None
+    ) -> review_schemas.MyReviewResponse:
+
+        return review_schemas.MyReviewResponse.model_construct(**self._review_values(
+            review, liked_review_ids, current_likes, excerpt, fields, with_author=False
+        ))
+    
+    def _review_values(
+        self,
+        review: models.Review,
+        liked_review_ids: Optional[Set[int]],
+        current_likes: Dict[int, int],
+        excerpt: bool,
+        fields: Optional[FieldSet],
+        with_author: bool
+    ) -> Dict[str, Any]:
+
+        # Only selected fields are read: the rest were never loaded, and
+        # touching them would lazy-load one row at a time.
+        values: Dict[str, Any] = {"id": review.id}
+        for name in REVIEW_COLUMN_FIELDS:
+            if selects(fields, name):
+                values[name] = getattr(review, name)
+        if selects(fields, "content"):
+            values["content"] = review.excerpt if excerpt else review.content
+        if selects(fields, "likes"):
+            values["likes"] = current_likes.get(review.id, review.likes)
+        if with_author and selects(fields, "author"):
+            values["author"] = review_schemas.AuthorInfo.model_construct(
                 id=review.author.id,
                 username=review.author.username
-            ),
-            is_liked=self._is_review_liked_by_user(
-                review.id,
-                current_user.id if current_user else None
             )
+        if selects(fields, "is_liked"):
+            values["is_liked"] = self._is_liked(review.id, liked_review_ids)
+        return values
+    
+    def _get_current_likes(
+        self,
+        reviews: List[models.Review],
+        fields: Optional[FieldSet] = None
+    ) -> Dict[int, int]:
+        if not self._likes_buffered() or not selects(fields, "likes"):
+            return {}
+        return self.like_delta_crud.get_likes(self.db, [review.id for review in reviews])
+    
+    @staticmethod
+    def _ensure_visible(
+        status: models.ReviewStatus,
+        author_id: int,
+        current_user: Optional[models.User]
+    ) -> None:
+        is_author = current_user and current_user.id == author_id
+        is_admin = current_user and current_user.role == models.Role.ADMIN
+        
+        if status != models.ReviewStatus.APPROVED and not is_author and not is_admin:
+            raise ReviewNotFoundError()
+    
+    @staticmethod
+    def _moderation_outcome(
+        review_id: int,
+        applied: Set[int],
+        existing: Set[int]
+    ) -> review_schemas.ModerationOutcome:
+        if review_id in applied:
+            return review_schemas.ModerationOutcome.APPLIED
+        if review_id in existing:
+            return review_schemas.ModerationOutcome.ALREADY_PROCESSED
+        return review_schemas.ModerationOutcome.NOT_FOUND
+    
+    @staticmethod
+    def _likes_buffered() -> bool:
+        return settings.LIKE_COUNTER_MODE == LikeCounterMode.BUFFERED
+    
+    def _get_liked_review_ids(
+        self,
+        reviews: List[models.Review],
+        user_id: Optional[int],
+        fields: Optional[FieldSet] = None
+    ) -> Optional[Set[int]]:
+
+        if not user_id or not selects(fields, "is_liked"):
+            return None
+        return self.like_crud.get_liked_review_ids(
+            self.db,
+            user_id,
+            [review.id for review in reviews]
         )
     
+    @staticmethod
+    def _is_liked(review_id: int, liked_review_ids: Optional[Set[int]]) -> Optional[bool]:
+        if liked_review_ids is None:
+            return None
+        return review_id in liked_review_ids
+    
     def _is_review_liked_by_user(
         self,
         review_id: int,
@@ -302,7 +536,8 @@ class ReviewService:
         self,
         page: int,
         limit: int,
-        total: int
+        total: int,
+        total_is_exact: bool = True
     ) -> review_schemas.PaginationInfo:
 
         total_pages = ceil(total / limit) if total > 0 else 1
@@ -310,5 +545,53 @@ class ReviewService:
             current_page=page,
             total_pages=total_pages,
             total_items=total,
-            items_per_page=limit
+            items_per_page=limit,
+            total_is_exact=total_is_exact
+        )
+    
+    @staticmethod
+    def _effective_sort(pagination: review_schemas.PaginationParams) -> review_schemas.SortBy:
+        if pagination.search and pagination.search_mode == review_schemas.SearchMode.FUZZY:
+            return review_schemas.SortBy.RELEVANCE
+        return pagination.sort
+
+    @staticmethod
+    def _decode_cursor(
+        cursor: Optional[str],
+        sort: review_schemas.SortBy,
+        order: review_schemas.SortOrder
+    ) -> Optional[KeysetPosition]:
+
+        if not cursor:
+            return None
+        return decode_cursor(cursor, sort.value, order.value)
+    
+    @staticmethod
+    def _trim_page(
+        reviews: List[models.Review],
+        limit: int
+    ) -> Tuple[List[models.Review], bool]:
+
+        # Pages are fetched with one extra row, which only signals that
+        # another page exists.
+        return reviews[:limit], len(reviews) > limit
+
+    @staticmethod
+    def _build_cursor_info(
+        reviews: List[models.Review],
+        has_more: bool,
+        sort: review_schemas.SortBy,
+        order: review_schemas.SortOrder
+    ) -> review_schemas.CursorPaginationInfo:
+
+        if not reviews or not has_more:
+            return review_schemas.CursorPaginationInfo(next_cursor=None, has_more=False)
+        if sort == review_schemas.SortBy.RELEVANCE:
+            return review_schemas.CursorPaginationInfo(next_cursor=None, has_more=True)
+        
+        last = reviews[-1]
+        sort_value = last.likes if sort == review_schemas.SortBy.LIKES else last.created_at
+        return review_schemas.CursorPaginationInfo(
+            next_cursor=encode_cursor(sort.value, order.value, (sort_value, last.id)),
+            has_more=True
         )
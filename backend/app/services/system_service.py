@@ -0,0 +1,26 @@
+from typing import Dict
+from sqlalchemy.pool import Pool
+import app.schemas.system as system_schemas
+from app.db.pool import pool_status
+from app.utils.password_hasher import PasswordHasher
+
+
+class SystemService:
+    def __init__(self, pools: Dict[str, Pool], hasher: PasswordHasher):
+        self.pools = pools
+        self.hasher = hasher
+
+    def get_database_pools(self) -> system_schemas.DatabasePoolsResponse:
+        return system_schemas.DatabasePoolsResponse(
+            pools={
+                name: system_schemas.PoolStatus(**pool_status(pool))
+                for name, pool in self.pools.items()
+            }
+        )
+
+    def get_password_hasher(self) -> system_schemas.PasswordHasherStatus:
+        return system_schemas.PasswordHasherStatus(
+            workers=self.hasher.workers,
+            max_pending=self.hasher.max_pending,
+            **self.hasher.stats.snapshot()
+        )
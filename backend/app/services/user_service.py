@@ -1,8 +1,12 @@
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 import app.db.models as models
 import app.schemas.user as user_schemas
+from app.core.config import settings
+from app.crud.revoked_token import CRUDRevokedToken
 from app.crud.user import CRUDUser
-from app.utils.security import hash_password, verify_password, create_access_token
+from app.utils.token_denylist import token_denylist
+from app.utils.security import create_access_token
 from app.exceptions import (
     UserNotFoundError,
     UserAlreadyExistsError,
@@ -14,6 +18,7 @@ class UserService:
     def __init__(self, db: Session):
         self.db = db
         self.user_crud = CRUDUser()
+        self.revoked_token_crud = CRUDRevokedToken()
     
     def get_user_by_id(
         self,
@@ -29,33 +34,34 @@ class UserService:
             username=user.username
         )
     
-    def register_user(self, user_data: user_schemas.UserCreate) -> user_schemas.Token:
-        existing_user = self.user_crud.get_by_username(self.db, user_data.username)
-        if existing_user:
+    def ensure_username_available(self, username: str) -> None:
+        if self.user_crud.get_by_username(self.db, username):
             raise UserAlreadyExistsError("Username already exists")
-
-        hashed_password = hash_password(user_data.password)
+    
+    def register_user(
+        self,
+        user_data: user_schemas.UserCreate,
+        password_hash: str
+    ) -> user_schemas.Token:
+        self.ensure_username_available(user_data.username)
         
         user = self.user_crud.create(
             db=self.db,
             username=user_data.username,
-            password_hash=hashed_password,
+            password_hash=password_hash,
             role=models.Role.USER
         )
         
-        access_token = create_access_token(data={"sub": str(user.id)})
-        
-        return user_schemas.Token(
-            access_token=access_token,
-            token_type="bearer"
-        )
+        return self.issue_token(user)
     
-    def login_user(self, credentials: user_schemas.UserCreate) -> user_schemas.Token:
-        user = self.user_crud.get_by_username(self.db, credentials.username)
-        
-        if not user or not verify_password(credentials.password, user.password_hash):
+    def get_login_user(self, username: str) -> models.User:
+        user = self.user_crud.get_by_username(self.db, username)
+        if not user:
             raise AuthenticationError()
-        access_token = create_access_token(data={"sub": str(user.id)})
+        return user
+    
+    def issue_token(self, user: models.User) -> user_schemas.Token:
+        access_token = create_access_token(data=self._token_claims(user))
         
         return user_schemas.Token(
             access_token=access_token,
@@ -68,3 +74,26 @@ class UserService:
             username=current_user.username,
             role=current_user.role
         )
+    
+    def logout(self, claims: dict) -> None:
+        jti = claims.get("jti")
+        if not jti:
+            raise AuthenticationError("Token cannot be revoked")
+        
+        now = datetime.now(timezone.utc)
+        expires_at = datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+        self.revoked_token_crud.purge_expired(self.db, now)
+        self.revoked_token_crud.add(
+            self.db,
+            jti=jti,
+            user_id=int(claims["sub"]),
+            expires_at=expires_at
+        )
+        token_denylist.add(jti, expires_at)
+    
+    @staticmethod
+    def _token_claims(user: models.User) -> dict:
+        claims = {"sub": str(user.id)}
+        if settings.JWT_CLAIMS_AUTH:
+            claims.update(username=user.username, role=models.Role(user.role).value)
+        return claims
@@ -0,0 +1,12 @@
+from app.core.config import settings
+from app.utils.ttl_cache import TTLCache
+
+
+class TTLCountCache(TTLCache[int]):
+    pass
+
+
+review_count_cache = TTLCountCache(
+    ttl_seconds=settings.REVIEW_COUNT_CACHE_TTL_SECONDS,
+    max_entries=settings.REVIEW_COUNT_CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,19 @@
+import hashlib
+import json
+from typing import Any, Optional
+
+
+def make_etag(*parts: Any) -> str:
+    raw = json.dumps(parts, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses the weak comparison: a W/ prefix is ignored.
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -0,0 +1,158 @@
+import importlib
+import json
+import threading
+from typing import Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.utils.ttl_cache import TTLCache
+
+
+class SharedFeedCache:
+    # Tier shared by all workers (Redis, Memcached, ...). Calls are made on the
+    # request path, so implementations should use short client timeouts.
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    def get_version(self) -> int:
+        raise NotImplementedError
+
+    def bump_version(self) -> int:
+        raise NotImplementedError
+
+
+class InMemorySharedFeedCache(SharedFeedCache):
+    # Single-process stand-in for a real shared tier. Entries honour the TTL
+    # and the size cap like the local tier, so pages orphaned by version bumps
+    # are evicted instead of accumulating.
+    def __init__(
+        self,
+        ttl_seconds: float = settings.FEED_CACHE_TTL_SECONDS,
+        max_entries: int = settings.FEED_CACHE_MAX_ENTRIES
+    ):
+        self._values: TTLCache[str] = TTLCache(ttl_seconds, max_entries)
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        return self._values.get(key)
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        self._values.set(key, value, ttl_seconds)
+
+    def get_version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def bump_version(self) -> int:
+        with self._lock:
+            self._version += 1
+            return self._version
+
+
+class PublicFeedCache:
+    # Stores serialized responses under "<version>:<normalized params>". A
+    # change anywhere in the public feed bumps the version, which orphans every
+    # cached page at once; orphans fall out through LRU eviction and the TTL.
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        shared: Optional[SharedFeedCache] = None,
+        enabled: bool = True
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.local: TTLCache[Union[str, bytes]] = TTLCache(ttl_seconds, max_entries)
+        self.shared = shared
+        self.enabled = enabled
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, params: BaseModel) -> Tuple[str, Optional[str]]:
+        key = f"{self.version()}:{self.normalize(params)}"
+        if not self.enabled:
+            return key, None
+
+        value = self.local.get(key)
+        if value is None and self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value)
+        return key, value
+
+    def store(self, key: str, value: str) -> None:
+        if not self.enabled:
+            return
+        self.local.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, value, self.ttl_seconds)
+
+    def lookup_encoded(self, key: str, encoding: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        return self.local.get(f"{key}|{encoding}")
+
+    def store_encoded(self, key: str, encoding: str, body: bytes) -> None:
+        # Compressed variants stay in the local tier only: each worker
+        # compresses a page once per feed version, the shared tier keeps the
+        # plain JSON.
+        if self.enabled:
+            self.local.set(f"{key}|{encoding}", body)
+
+    def version(self) -> int:
+        if self.shared is not None:
+            return self.shared.get_version()
+        with self._lock:
+            return self._version
+
+    @property
+    def issues_validators(self) -> bool:
+        # Only a shared version is seen by every worker: a local one misses
+        # writes served by other workers, so without a shared tier there is no
+        # validator and the feed goes out without an ETag.
+        return self.shared is not None
+
+    def validator(self) -> Optional[str]:
+        # Names the current feed state for ETags.
+        if not self.issues_validators:
+            return None
+        return str(self.shared.get_version())
+
+    def bump(self) -> None:
+        if self.shared is not None:
+            self.shared.bump_version()
+            return
+        with self._lock:
+            self._version += 1
+
+    def clear(self) -> None:
+        self.local.clear()
+        self.bump()
+
+    @staticmethod
+    def normalize(params: BaseModel) -> str:
+        values = params.model_dump(mode="json")
+        if values.get("search"):
+            values["search"] = values["search"].strip().lower()
+        return json.dumps(values, sort_keys=True, separators=(",", ":"))
+
+
+def load_shared_backend(path: Optional[str]) -> Optional[SharedFeedCache]:
+    # "package.module:factory", called without arguments.
+    if not path:
+        return None
+    module_name, _, attribute = path.partition(":")
+    factory = getattr(importlib.import_module(module_name), attribute)
+    return factory()
+
+
+public_feed_cache = PublicFeedCache(
+    ttl_seconds=settings.FEED_CACHE_TTL_SECONDS,
+    max_entries=settings.FEED_CACHE_MAX_ENTRIES,
+    shared=load_shared_backend(settings.FEED_CACHE_SHARED_BACKEND),
+    enabled=settings.FEED_CACHE_ENABLED
+)
@@ -0,0 +1,26 @@
+from typing import FrozenSet, Optional, Type
+
+from pydantic import BaseModel
+
+from app.exceptions import InvalidFieldsError
+
+
+FieldSet = FrozenSet[str]
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[FieldSet]:
+    # None means "every field". id is always returned so rows stay addressable.
+    if fields is None:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    if not names:
+        raise InvalidFieldsError("No fields requested")
+    unknown = names - model.model_fields.keys()
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return frozenset(names | {"id"})
+
+
+def selects(fields: Optional[FieldSet], name: str) -> bool:
+    return fields is None or name in fields
+
@@ -0,0 +1,102 @@
+import os
+from typing import Dict, Optional, Tuple
+
+import anyio.to_thread
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy.pool import Pool
+
+from app.db.pool import pool_status
+from app.db.query_tracker import RequestQueries
+
+
+# prometheus_client switches to file-backed values when this is set in the
+# environment before it is imported; every worker then writes its samples to
+# the directory and any worker can serve the aggregate. The directory must be
+# emptied before the server starts.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+POOL_FIELDS = ("size", "checked_out", "overflow", "checkouts", "timeouts", "wait_seconds_total")
+
+REQUESTS = Counter(
+    "http_requests_total", "Requests by route template and status code.",
+    ["method", "route", "status"]
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency by route template.",
+    ["method", "route"], buckets=LATENCY_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per request.",
+    ["method", "route"], buckets=QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per request.",
+    ["method", "route"], buckets=LATENCY_BUCKETS
+)
+# Gauges are summed over live workers, so a dead worker's values drop out.
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests being handled.",
+    multiprocess_mode="livesum"
+)
+POOL = Gauge(
+    "db_pool", "Connection pool state (checkouts, timeouts and wait are per-process totals).",
+    ["pool", "field"], multiprocess_mode="livesum"
+)
+THREADPOOL = Gauge(
+    "threadpool_threads", "Worker threads of the default anyio limiter (busy, waiting, capacity).",
+    ["state"], multiprocess_mode="livesum"
+)
+
+
+def observe_request(
+    method: str,
+    route: str,
+    status: int,
+    seconds: float,
+    queries: Optional[RequestQueries]
+) -> None:
+    REQUESTS.labels(method, route, str(status)).inc()
+    REQUEST_SECONDS.labels(method, route).observe(seconds)
+    if queries is not None:
+        REQUEST_QUERIES.labels(method, route).observe(queries.count)
+        REQUEST_DB_SECONDS.labels(method, route).observe(queries.seconds)
+
+
+def record_pools(pools: Dict[str, Pool]) -> None:
+    for name, pool in pools.items():
+        status = pool_status(pool)
+        for field in POOL_FIELDS:
+            if field in status:
+                POOL.labels(name, field).set(status[field])
+
+
+def record_threadpool() -> None:
+    # Must run on the event loop: the default limiter is per loop.
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    THREADPOOL.labels("busy").set(limiter.borrowed_tokens)
+    THREADPOOL.labels("waiting").set(limiter.statistics().tasks_waiting)
+    THREADPOOL.labels("capacity").set(limiter.total_tokens)
+
+
+def render() -> Tuple[bytes, str]:
+    registry = REGISTRY
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
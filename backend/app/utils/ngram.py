@@ -0,0 +1,110 @@
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def trigrams(value: str) -> FrozenSet[str]:
+    # Same shape as pg_trgm: lower-cased words padded with two leading spaces
+    # and one trailing space.
+    grams: Set[str] = set()
+    for word in _WORD_RE.findall(value.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class NGramIndex:
+    # In-memory trigram index over a few short text fields per document. It
+    # is per-process and only sees the changes its owner applies, so writes
+    # made by other workers appear once it is reloaded: is_stale() turns true
+    # every refresh_seconds (never, when None) after load().
+    def __init__(self, refresh_seconds: Optional[float] = None):
+        self.refresh_seconds = refresh_seconds
+        self._postings: Dict[str, Set[Tuple[int, int]]] = defaultdict(set)
+        self._documents: Dict[int, Tuple[FrozenSet[str], ...]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def is_stale(self) -> bool:
+        with self._lock:
+            if self._loaded_at is None:
+                return True
+            return (
+                self.refresh_seconds is not None
+                and time.monotonic() - self._loaded_at >= self.refresh_seconds
+            )
+
+    def load(self, documents: Iterable[Tuple[int, Iterable[str]]]) -> None:
+        # Built aside and swapped in, so searches never see a partial index.
+        fresh = NGramIndex()
+        for doc_id, fields in documents:
+            fresh.add(doc_id, fields)
+        with self._lock:
+            self._postings, self._documents = fresh._postings, fresh._documents
+            self._loaded_at = time.monotonic()
+
+    def add(self, doc_id: int, fields: Iterable[str]) -> None:
+        with self._lock:
+            self._remove(doc_id)
+            field_grams = tuple(trigrams(value or "") for value in fields)
+            self._documents[doc_id] = field_grams
+            for field_index, grams in enumerate(field_grams):
+                for gram in grams:
+                    self._postings[gram].add((doc_id, field_index))
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._documents.clear()
+            self._loaded_at = None
+
+    def search(
+        self, term: str, threshold: float, limit: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        # Score is the share of the term's trigrams found in the best-matching
+        # field, which tolerates typos and matches a term inside a longer title.
+        query_grams = trigrams(term)
+        if not query_grams:
+            return []
+
+        with self._lock:
+            hits: Dict[Tuple[int, int], int] = defaultdict(int)
+            for gram in query_grams:
+                for posting in self._postings.get(gram, ()):
+                    hits[posting] += 1
+
+        scores: Dict[int, float] = {}
+        for (doc_id, _), count in hits.items():
+            score = count / len(query_grams)
+            if score >= threshold and score > scores.get(doc_id, 0.0):
+                scores[doc_id] = score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return ranked[:limit]
+
+    def _remove(self, doc_id: int) -> None:
+        field_grams = self._documents.pop(doc_id, None)
+        if field_grams is None:
+            return
+        for field_index, grams in enumerate(field_grams):
+            for gram in grams:
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard((doc_id, field_index))
+                    if not postings:
+                        del self._postings[gram]
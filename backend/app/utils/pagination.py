@@ -0,0 +1,39 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+from app.exceptions import InvalidCursorError
+
+
+KeysetPosition = Tuple[Any, int]
+
+
+def encode_cursor(sort: str, order: str, position: KeysetPosition) -> str:
+    value, review_id = position
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, order, value, review_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, order: str) -> KeysetPosition:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, value, review_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursorError()
+
+    if cursor_sort != sort or cursor_order != order or not isinstance(review_id, int):
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+
+    if sort == "created_at":
+        try:
+            value = datetime.fromisoformat(value)
+        except (ValueError, TypeError):
+            raise InvalidCursorError()
+    elif not isinstance(value, int):
+        raise InvalidCursorError()
+
+    return value, review_id
@@ -0,0 +1,117 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.exceptions import ServiceUnavailableError
+from app.utils.security import hash_password, verify_password
+
+
+class HashStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.pending_max = 0
+        self.rejected = 0
+        self.operations: Dict[str, Dict[str, float]] = {}
+
+    def record(self, operation: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.operations.setdefault(
+                operation, {"count": 0, "seconds_total": 0.0, "seconds_max": 0.0}
+            )
+            entry["count"] += 1
+            entry["seconds_total"] += seconds
+            entry["seconds_max"] = max(entry["seconds_max"], seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pending": self.pending,
+                "pending_max": self.pending_max,
+                "rejected": self.rejected,
+                "operations": {name: dict(entry) for name, entry in self.operations.items()},
+            }
+
+
+class PasswordHasher:
+    # bcrypt is CPU-bound: it runs in a dedicated process pool so it neither
+    # blocks the event loop nor competes with request threads for the GIL.
+    # Work beyond max_pending (running + queued) is refused with a 503.
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.stats = HashStats()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", hash_password, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run("verify", verify_password, password, password_hash)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _run(self, operation: str, fn: Callable, *args: Any) -> Any:
+        with self.stats._lock:
+            if self.stats.pending >= self.max_pending:
+                self.stats.rejected += 1
+                raise ServiceUnavailableError(
+                    "Authentication is temporarily overloaded, retry later",
+                    headers={"Retry-After": "1"}
+                )
+            self.stats.pending += 1
+            self.stats.pending_max = max(self.stats.pending_max, self.stats.pending)
+
+        started = time.perf_counter()
+        executor = self._get_executor()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # A worker died (OOM kill, crash): the pool refuses all further
+            # work, so replace it for the next call and fail only this one.
+            self._discard_executor(executor)
+            raise ServiceUnavailableError(
+                "Authentication is temporarily unavailable, retry later",
+                headers={"Retry-After": "1"}
+            )
+        finally:
+            self.stats.record(operation, time.perf_counter() - started)
+            with self.stats._lock:
+                self.stats.pending -= 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs an event loop and threads
+                # can copy held locks into the child.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            # Concurrent failures of the same pool must not discard the
+            # replacement another call has already created.
+            if self._executor is not executor:
+                return
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
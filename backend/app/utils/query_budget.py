@@ -0,0 +1,44 @@
+import logging
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.db.query_tracker import RequestQueries
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+MAX_LOGGED_STATEMENT = 300
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries: int) -> Callable[[F], F]:
+    # Declares how many SQL statements one request to the endpoint may run.
+    # Apply below the route decorator; the endpoint itself is not wrapped.
+    def decorate(endpoint: F) -> F:
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+    return decorate
+
+
+def check_request(method: str, route: str, endpoint: Optional[Callable], queries: RequestQueries) -> None:
+    problems = []
+    budget = getattr(endpoint, "__query_budget__", None)
+    if budget is not None and queries.count > budget:
+        problems.append(f"{queries.count} queries, budget is {budget}")
+
+    threshold = settings.SQL_REPEAT_WARNING_THRESHOLD
+    repeated = queries.most_repeated()
+    if threshold and repeated is not None and repeated[1] >= threshold:
+        statement, times = repeated
+        problems.append(f"possible N+1, ran {times} times: {statement[:MAX_LOGGED_STATEMENT]}")
+
+    if not problems:
+        return
+    message = f"{method} {route}: " + "; ".join(problems)
+    if settings.SQL_QUERY_BUDGET_STRICT:
+        raise QueryBudgetExceeded(message)
+    logger.warning("SQL query budget: %s", message)
@@ -1,3 +1,4 @@
+import uuid
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from typing import Optional
@@ -23,6 +24,7 @@ def create_access_token(
     to_encode = data.copy()
     expire = datetime.utcnow() + expires_delta    
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -0,0 +1,60 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+
+
+class TokenDenyList:
+    # In-process mirror of the revoked_tokens table. It is reloaded at most
+    # every refresh_seconds, so a revocation made by another worker takes
+    # effect within that interval; the revoking worker sees it immediately.
+    # Local adds survive reloads until the table returns them: a reload whose
+    # read started before the revocation committed must not undo it.
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._expires: Dict[str, datetime] = {}
+        self._added: Dict[str, datetime] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def is_stale(self) -> bool:
+        with self._lock:
+            return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_seconds
+
+    def load(self, entries: Iterable[Tuple[str, datetime]]) -> None:
+        loaded = {jti: _aware(expires_at) for jti, expires_at in entries}
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self._added = {
+                jti: expires_at for jti, expires_at in self._added.items()
+                if jti not in loaded and expires_at > now
+            }
+            self._expires = {**loaded, **self._added}
+            self._loaded_at = time.monotonic()
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._expires[jti] = self._added[jti] = _aware(expires_at)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        with self._lock:
+            expires_at = self._expires.get(jti)
+        return expires_at is not None and expires_at > datetime.now(timezone.utc)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expires.clear()
+            self._added.clear()
+            self._loaded_at = None
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands timestamps back without tzinfo.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+token_denylist = TokenDenyList(settings.TOKEN_DENYLIST_REFRESH_SECONDS)
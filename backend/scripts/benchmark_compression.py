@@ -0,0 +1,89 @@
+"""Bytes sent and CPU cost of compressing review feed pages.
+
+For typical page sizes, compares identity, gzip and brotli at the
+configured levels, and the cost of a cache hit that reuses the
+pre-compressed body instead of compressing again. Run from backend/:
+
+    python -m scripts.benchmark_compression [--repeat 200]
+"""
+import argparse
+import os
+import random
+import string
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+import app.schemas.review as review_schemas  # noqa: E402
+from app.api.compression import ENCODINGS, compress  # noqa: E402
+from app.api.responses import model_json  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services.review_service import ReviewService  # noqa: E402
+from app.utils.feed_cache import PublicFeedCache  # noqa: E402
+from scripts.benchmark_serialization import make_reviews, pagination  # noqa: E402
+
+PAGE_SIZES = (5, 20, 100)
+# Real reviews do not repeat one sentence, so text is drawn from a seeded
+# vocabulary; otherwise compression ratios come out unrealistically high.
+RANDOM = random.Random(0)
+VOCABULARY = [
+    "".join(RANDOM.choices(string.ascii_lowercase, k=RANDOM.randint(2, 10)))
+    for _ in range(2000)
+]
+
+
+def prose(words: int) -> str:
+    return " ".join(RANDOM.choices(VOCABULARY, k=words)).capitalize() + "."
+
+
+def feed_page(rows: int, excerpt: bool) -> bytes:
+    service = ReviewService(db=None)
+    reviews = make_reviews(rows)
+    for review in reviews:
+        review.title = prose(5)
+        review.content = prose(RANDOM.randint(100, 500))
+    return model_json(review_schemas.PaginatedReviewsResponse(
+        reviews=[service._build_review_response(review, None, {}, excerpt) for review in reviews],
+        pagination=pagination(rows),
+    ))
+
+
+def measure(fn, repeat: int) -> float:
+    fn()
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    cache = PublicFeedCache(ttl_seconds=60, max_entries=64)
+    print(
+        f"gzip level {settings.COMPRESSION_GZIP_LEVEL}, "
+        f"brotli quality {settings.COMPRESSION_BROTLI_QUALITY}"
+    )
+    print(f"{'page':>16} {'encoding':>8} {'bytes':>8} {'ratio':>6} {'compress ms':>12} {'hit ms':>8}")
+    for rows in PAGE_SIZES:
+        for excerpt in (False, True):
+            body = feed_page(rows, excerpt)
+            label = f"{rows} rows {'excerpt' if excerpt else 'full'}"
+            print(f"{label:>16} {'identity':>8} {len(body):>8} {1:>6.2f} {'-':>12} {'-':>8}")
+            for encoding in ENCODINGS:
+                encoded = compress(body, encoding)
+                cache.store_encoded(label, encoding, encoded)
+                compress_ms = measure(lambda: compress(body, encoding), args.repeat)
+                hit_ms = measure(lambda: cache.lookup_encoded(label, encoding), args.repeat)
+                print(
+                    f"{label:>16} {encoding:>8} {len(encoded):>8} "
+                    f"{len(body) / len(encoded):>6.2f} {compress_ms:>12.3f} {hit_ms:>8.4f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
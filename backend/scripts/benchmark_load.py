@@ -0,0 +1,350 @@
+"""Throughput and latency of the API under a mixed request load.
+
+Seeds a database with users, approved and pending reviews, then replays a
+weighted mix of feed, detail, like-toggle, login and moderation calls from
+concurrent clients. Prints RPS and latency percentiles per operation as
+JSON, so runs from two releases can be diffed. Run from backend/:
+
+    python -m scripts.benchmark_load [--server inprocess|uvicorn] [--url URL]
+        [--concurrency 16] [--duration 30] [--mix feed=50,detail=25,...]
+        [--output run.json] [--compare baseline.json]
+
+The database comes from DATABASE_URL (a local SQLite file by default) and is
+dropped, recreated and seeded unless --no-seed is given, so never point it
+at data you want to keep. "inprocess" drives the ASGI app on the
+benchmark's own event loop, so the client's overhead is included in every
+number; "uvicorn" starts real worker processes; --url targets a server that
+is already running and already seeded. Needs the packages from
+tests/requirements.txt (httpx, aiosqlite) on top of requirements.txt.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark_load.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+
+import app.db.models as models  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.crud.review_counter import CRUDReviewCounter  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.utils.security import hash_password  # noqa: E402
+from scripts.benchmark_compression import prose  # noqa: E402
+
+PASSWORD = "benchmark123"
+ADMIN_USERNAME = "benchadmin"
+DEFAULT_MIX = "feed=50,detail=25,like=10,login=5,moderation=6,approve=4"
+PERCENTILES = (50, 90, 95, 99)
+OPERATIONS = ("feed", "detail", "like", "login", "moderation", "approve")
+
+
+def seed(users: int, reviews: int, pending: int) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    # One hash for every account; bcrypt per row would dominate seeding.
+    password_hash = hash_password(PASSWORD)
+    rng = random.Random(1)
+    db = SessionLocal()
+    try:
+        db.execute(insert(models.User), [
+            {"username": f"bench{index}", "password_hash": password_hash, "role": models.Role.USER}
+            for index in range(1, users + 1)
+        ] + [{"username": ADMIN_USERNAME, "password_hash": password_hash, "role": models.Role.ADMIN}])
+        rows = []
+        for index in range(1, reviews + pending + 1):
+            content = prose(rng.randint(100, 500))
+            rows.append({
+                "user_id": rng.randint(1, users),
+                "title": prose(5)[:100],
+                "movie_title": prose(2)[:100],
+                "content": content,
+                "excerpt": models.make_excerpt(content),
+                "content_length": len(content),
+                "status": models.ReviewStatus.APPROVED if index <= reviews else models.ReviewStatus.PENDING,
+                "likes": 0,
+            })
+        db.execute(insert(models.Review), rows)
+        db.commit()
+        CRUDReviewCounter.rebuild(db)
+    finally:
+        db.close()
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise SystemExit(f"unknown operation {name!r}, expected one of {', '.join(OPERATIONS)}")
+        weights[name] = int(weight)
+    return weights
+
+
+class Workload:
+    def __init__(self, client: httpx.AsyncClient, users: int, reviews: int, pending: int):
+        self.client = client
+        self.users = users
+        self.review_ids = list(range(1, reviews + 1))
+        self.pending_ids = list(range(reviews + 1, reviews + pending + 1))
+        self.feed_pages = max(1, min(reviews // 20, 50))
+        self.tokens: Dict[str, str] = {}
+
+    async def token(self, username: str) -> str:
+        if username not in self.tokens:
+            response = await self.client.post(
+                "/api/auth/login", json={"username": username, "password": PASSWORD}
+            )
+            response.raise_for_status()
+            self.tokens[username] = response.json()["access_token"]
+        return self.tokens[username]
+
+    async def headers(self, username: str) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {await self.token(username)}"}
+
+    async def feed(self, rng: random.Random, username: str) -> httpx.Response:
+        params = {"page": rng.randint(1, self.feed_pages), "content": "excerpt"}
+        if rng.random() < 0.2:
+            params["sort"] = "likes"
+        return await self.client.get("/api/reviews/public", params=params)
+
+    async def detail(self, rng: random.Random, username: str) -> httpx.Response:
+        return await self.client.get(
+            f"/api/reviews/{rng.choice(self.review_ids)}", headers=await self.headers(username)
+        )
+
+    async def like(self, rng: random.Random, username: str) -> httpx.Response:
+        return await self.client.post(
+            f"/api/reviews/{rng.choice(self.review_ids)}/like", headers=await self.headers(username)
+        )
+
+    async def login(self, rng: random.Random, username: str) -> httpx.Response:
+        return await self.client.post(
+            "/api/auth/login", json={"username": username, "password": PASSWORD}
+        )
+
+    async def moderation(self, rng: random.Random, username: str) -> httpx.Response:
+        return await self.client.get(
+            "/api/reviews/moderation", headers=await self.headers(ADMIN_USERNAME)
+        )
+
+    async def approve(self, rng: random.Random, username: str) -> Optional[httpx.Response]:
+        # Each pending review can be approved once; the operation stops when
+        # the seeded queue runs dry.
+        if not self.pending_ids:
+            return None
+        review_id = self.pending_ids.pop()
+        return await self.client.post(
+            f"/api/reviews/{review_id}/approve", headers=await self.headers(ADMIN_USERNAME)
+        )
+
+
+async def run_load(
+    workload: Workload, weights: Dict[str, int], concurrency: int, duration: float, warmup: float, seed_value: int
+) -> Dict[str, Any]:
+    names = list(weights)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    # Log every client in up front so token setup is not measured.
+    for worker in range(concurrency):
+        await workload.token(f"bench{worker % workload.users + 1}")
+    await workload.token(ADMIN_USERNAME)
+
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + warmup
+    stop_at = measure_from + duration
+
+    async def client_loop(worker: int) -> None:
+        rng = random.Random(seed_value + worker)
+        username = f"bench{worker % workload.users + 1}"
+        while loop.time() < stop_at:
+            name = rng.choices(names, weights=[weights[n] for n in names])[0]
+            started = time.perf_counter()
+            skipped = False
+            try:
+                response = await getattr(workload, name)(rng, username)
+                skipped = response is None
+                failed = not skipped and response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            elapsed = time.perf_counter() - started
+            if skipped or loop.time() < measure_from:
+                continue
+            latencies[name].append(elapsed)
+            errors[name] += failed
+
+    await asyncio.gather(*(client_loop(worker) for worker in range(concurrency)))
+
+    operations = {name: summarize(latencies[name], errors[name], duration) for name in names if latencies[name]}
+    everything = [value for values in latencies.values() for value in values]
+    return {"operations": operations, "total": summarize(everything, sum(errors.values()), duration)}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    # Nearest-rank, on values sorted by the caller.
+    rank = max(1, math.ceil(len(values) * pct / 100))
+    return values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, duration: float) -> Dict[str, Any]:
+    values = sorted(latencies)
+    if not values:
+        return {"requests": 0, "errors": errors, "rps": 0.0, "latency_ms": {}}
+    latency = {"mean": sum(values) / len(values)}
+    latency.update({f"p{pct}": percentile(values, pct) for pct in PERCENTILES})
+    latency["max"] = values[-1]
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / duration, 2),
+        "latency_ms": {key: round(value * 1000, 3) for key, value in latency.items()},
+    }
+
+
+@asynccontextmanager
+async def inprocess_client() -> AsyncIterator[httpx.AsyncClient]:
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            yield client
+
+
+@asynccontextmanager
+async def uvicorn_client(port: int, workers: int, limits: httpx.Limits) -> AsyncIterator[httpx.AsyncClient]:
+    server = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+    ], stdout=subprocess.DEVNULL, start_new_session=True)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            await wait_until_ready(client, server)
+            yield client
+    finally:
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            # Take worker processes down with the supervisor.
+            os.killpg(server.pid, signal.SIGKILL)
+
+
+async def wait_until_ready(client: httpx.AsyncClient, server: subprocess.Popen) -> None:
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"uvicorn exited with code {server.returncode}")
+        try:
+            if (await client.get("/openapi.json")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("uvicorn did not start within 30 seconds")
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print(f"{'operation':>12} {'rps':>18} {'p50 ms':>22} {'p99 ms':>22}", file=sys.stderr)
+    rows = {**report["operations"], "total": report["total"]}
+    base_rows = {**baseline["operations"], "total": baseline["total"]}
+    for name, row in rows.items():
+        base = base_rows.get(name)
+        if base is None or not base["requests"]:
+            continue
+        cells = [change(base["rps"], row["rps"])]
+        cells += [change(base["latency_ms"][key], row["latency_ms"][key]) for key in ("p50", "p99")]
+        print(f"{name:>12} {cells[0]:>18} {cells[1]:>22} {cells[2]:>22}", file=sys.stderr)
+
+
+def change(before: float, after: float) -> str:
+    percent = (after - before) / before * 100 if before else 0.0
+    return f"{before:g} -> {after:g} ({percent:+.1f}%)"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--url", help="benchmark a running server instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before --duration")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="comma-separated operation=weight")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--reviews", type=int, default=2000, help="approved reviews")
+    parser.add_argument("--pending", type=int, default=500, help="reviews waiting for moderation")
+    parser.add_argument("--no-seed", action="store_true", help="keep the existing database")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the request mix")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON report to print changes against")
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    if not args.no_seed and not args.url:
+        seed(args.users, args.reviews, args.pending)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.url:
+        client_context = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30)
+        server = "external"
+    elif args.server == "uvicorn":
+        client_context = uvicorn_client(args.port, args.workers, limits)
+        server = f"uvicorn x{args.workers}"
+    else:
+        client_context = inprocess_client()
+        server = "inprocess"
+
+    async with client_context as client:
+        workload = Workload(client, args.users, args.reviews, args.pending)
+        results = await run_load(workload, weights, args.concurrency, args.duration, args.warmup, args.seed)
+
+    report = {
+        "config": {
+            "server": server,
+            "database": make_url(settings.DATABASE_URL).get_backend_name(),
+            "like_counter_mode": settings.LIKE_COUNTER_MODE.value,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "mix": weights,
+            "users": args.users,
+            "reviews": args.reviews,
+            "pending": args.pending,
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        **results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare) as baseline:
+            compare(report, json.load(baseline))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""Per-page CPU cost of serializing a review list response.
+
+Compares the keyword-built models that FastAPI re-validated against
+response_model with the model_construct + compiled-serializer path now used
+by the list endpoints. Run from backend/:
+
+    python -m scripts.benchmark_serialization [--rows 100] [--repeat 200]
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+import app.db.models as models  # noqa: E402
+import app.schemas.review as review_schemas  # noqa: E402
+from app.api.responses import model_json  # noqa: E402
+from app.services.review_service import ReviewService  # noqa: E402
+
+
+def make_reviews(count: int):
+    author = models.User(id=1, username="benchmark_author", role=models.Role.USER)
+    return [
+        models.Review(
+            id=index,
+            user_id=author.id,
+            author=author,
+            title=f"Review number {index}",
+            movie_title="Stalker",
+            content="A slow, hypnotic journey through the Zone. " * 40,
+            status=models.ReviewStatus.APPROVED,
+            likes=index * 3,
+            created_at=datetime(2026, 10, 18, tzinfo=timezone.utc),
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def pagination(count: int) -> review_schemas.PaginationInfo:
+    return review_schemas.PaginationInfo(
+        current_page=1, total_pages=1, total_items=count, items_per_page=count
+    )
+
+
+def validated_page(reviews, liked):
+    page = review_schemas.PaginatedReviewsResponse(
+        reviews=[
+            review_schemas.ReviewResponse(
+                id=review.id,
+                title=review.title,
+                movie_title=review.movie_title,
+                content=review.content,
+                content_length=review.content_length,
+                status=review.status,
+                likes=review.likes,
+                created_at=review.created_at,
+                author=review_schemas.AuthorInfo(id=review.author.id, username=review.author.username),
+                is_liked=review.id in liked,
+            )
+            for review in reviews
+        ],
+        pagination=pagination(len(reviews)),
+    )
+    return page
+
+
+def fast_page(service: ReviewService, reviews, liked):
+    return review_schemas.PaginatedReviewsResponse(
+        reviews=[service._build_review_response(review, liked, {}) for review in reviews],
+        pagination=pagination(len(reviews)),
+    )
+
+
+def measure(fn, repeat: int) -> float:
+    fn()
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    reviews = make_reviews(args.rows)
+    liked = {review.id for review in reviews[::2]}
+    service = ReviewService(db=None)
+    field = create_model_field("Response", review_schemas.PaginatedReviewsResponse, mode="serialization")
+
+    loop = asyncio.new_event_loop()
+
+    def before():
+        # What the endpoint used to cost: keyword construction, then FastAPI
+        # validating and encoding the returned model against response_model.
+        content = loop.run_until_complete(serialize_response(
+            field=field, response_content=validated_page(reviews, liked), is_coroutine=True
+        ))
+        return JSONResponse(content).body
+
+    def after():
+        return model_json(fast_page(service, reviews, liked))
+
+    assert before() == after(), "both paths must produce the same JSON"
+
+    before_ms = measure(before, args.repeat)
+    after_ms = measure(after, args.repeat)
+    loop.close()
+    print(f"rows per page:   {args.rows}")
+    print(f"before (ms/page): {before_ms:.3f}")
+    print(f"after  (ms/page): {after_ms:.3f}")
+    print(f"CPU saved:        {(1 - after_ms / before_ms) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
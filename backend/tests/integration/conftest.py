@@ -11,9 +11,13 @@ from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
+from app.core.config import settings
 from app.db.base import Base
 import app.db.models as models
-from app.db.session import get_db
+from app.db.search import review_title_index
+from app.db.session import get_async_db, get_db
+from app.utils.feed_cache import public_feed_cache
+from app.utils.token_denylist import token_denylist
 from app.utils.security import hash_password
 
 
@@ -29,6 +33,30 @@ def engine():
     Base.metadata.drop_all(bind=test_engine)
 
 
+@pytest.fixture(autouse=True)
+def strict_query_budgets(monkeypatch):
+    # Any request over its endpoint's @query_budget fails the test.
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET_STRICT", True)
+
+
+@pytest.fixture(autouse=True)
+def reset_review_title_index():
+    yield
+    review_title_index.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_public_feed_cache():
+    yield
+    public_feed_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_token_denylist():
+    yield
+    token_denylist.clear()
+
+
 @pytest.fixture()
 def db_connection(engine):
     connection = engine.connect()
@@ -49,6 +77,24 @@ def db_session(db_connection):
         session.close()
 
 
+class SyncBackedAsyncSession:
+    # Exposes the part of AsyncSession the app uses on top of a sync Session,
+    # so async endpoints share the per-test connection and its rollback.
+    def __init__(self, sync_session: Session):
+        self.sync_session = sync_session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.sync_session, *args, **kwargs)
+
+    async def get(self, entity, ident):
+        return self.sync_session.get(entity, ident)
+
+    async def rollback(self):
+        # The per-test transaction has to outlive the request; expiring the
+        # loaded objects is the part of a rollback the app can observe.
+        self.sync_session.expire_all()
+
+
 @pytest.fixture()
 def client(db_connection):
     def override_get_db():
@@ -58,7 +104,15 @@ def client(db_connection):
         finally:
             db.close()
 
+    async def override_get_async_db():
+        db = Session(bind=db_connection)
+        try:
+            yield SyncBackedAsyncSession(db)
+        finally:
+            db.close()
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -1,6 +1,34 @@
-from datetime import timedelta
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
 import pytest
+import app.api.endpoints.reviews as reviews_endpoint
+import app.crud.like as like_crud
 import app.db.models as models
+import app.schemas.review as review_schemas
+from app.main import app
+from app.core.config import settings, CountStrategy, LikeCounterMode
+from app.crud.like import CRUDLike
+from app.crud.like_delta import CRUDLikeDelta
+from app.crud.moderation_claim import CRUDModerationClaim
+from app.crud.review import CRUDReview
+from app.db.base import Base
+from app.db.search import review_title_index
+from app.db.routing import ReplicaSet
+from app.db.session import async_database_url, get_async_db, read_your_writes
+from app.utils.security import create_access_token
+from app.utils.token_denylist import token_denylist
+from app.utils.count_cache import review_count_cache
+from app.utils.feed_cache import InMemorySharedFeedCache, public_feed_cache
+from app.utils.password_hasher import password_hasher
+from app.utils.query_budget import QueryBudgetExceeded
 
 
 REVIEW_PAYLOAD = {
@@ -216,6 +244,115 @@ def test_admin_cannot_approve_already_processed_review(client, make_user, make_r
     assert res.json()["detail"] == "Review has already been processed"
 
 
+def test_admin_bulk_approves_pending_reviews(client, make_user, make_review, monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_REVIEWS_COUNT_STRATEGY", CountStrategy.COUNTERS)
+    admin = make_user("admin1051", role=models.Role.ADMIN)
+    author = make_user("user1052")
+    pending = [make_review(user_id=author.id, status=models.ReviewStatus.PENDING) for _ in range(3)]
+    rejected = make_review(user_id=author.id, status=models.ReviewStatus.REJECTED)
+    headers = auth_headers(login_and_get_token(client, admin.username))
+    public_before = client.get("/api/reviews/public").json()["pagination"]["total_items"]
+
+    res = client.post(
+        "/api/reviews/moderation/bulk",
+        json={
+            "review_ids": [review.id for review in pending] + [rejected.id, 999999],
+            "action": "approve",
+        },
+        headers=headers,
+    )
+    public = client.get("/api/reviews/public").json()
+
+    assert res.status_code == 200
+    body = res.json()
+    assert body["applied"] == 3
+    assert [item["outcome"] for item in body["results"]] == [
+        "applied", "applied", "applied", "already_processed", "not_found"
+    ]
+    assert public["pagination"]["total_items"] == public_before + 3
+    assert {review.id for review in pending} <= {review["id"] for review in public["reviews"]}
+
+
+def _claim(client, headers, limit=2):
+    res = client.post(f"/api/reviews/moderation/claim?limit={limit}", headers=headers)
+    assert res.status_code == 200
+    return [review["id"] for review in res.json()["reviews"]]
+
+
+def test_moderators_claim_disjoint_batches(client, make_user, make_review, db_session):
+    first = auth_headers(login_and_get_token(client, make_user("admin1054", role=models.Role.ADMIN).username))
+    second = auth_headers(login_and_get_token(client, make_user("admin1055", role=models.Role.ADMIN).username))
+    author = make_user("user1056")
+    pending = [make_review(user_id=author.id, status=models.ReviewStatus.PENDING) for _ in range(5)]
+    oldest_first = [review.id for review in pending]
+
+    first_batch = _claim(client, first)
+    second_batch = _claim(client, second)
+    first_again = _claim(client, first)
+
+    assert first_batch == oldest_first[:2]
+    assert second_batch == oldest_first[2:4]
+    assert first_again == first_batch
+
+    client.post(f"/api/reviews/{first_batch[0]}/approve", headers=first)
+    db_session.query(models.ModerationClaim).filter(
+        models.ModerationClaim.review_id == second_batch[0]
+    ).update({"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)})
+    db_session.commit()
+
+    assert _claim(client, first, limit=5) == [first_batch[1], second_batch[0], oldest_first[4]]
+    assert client.delete("/api/reviews/moderation/claim", headers=first).status_code == 204
+    assert _claim(client, second, limit=5) == oldest_first[1:]
+
+
+def test_concurrent_claims_never_overlap(tmp_path):
+    url = f"sqlite:///{tmp_path / 'claims.db'}"
+
+    def seed(db):
+        _seed_author_with_review("Queued review")(db)
+        db.add_all(
+            models.User(id=user_id, username=f"admin{user_id}", password_hash="x", role=models.Role.ADMIN)
+            for user_id in range(2, 8)
+        )
+        db.add_all(
+            models.Review(
+                user_id=1, title="Queued review", movie_title="Solaris", content="A" * 120,
+                status=models.ReviewStatus.PENDING,
+            )
+            for _ in range(20)
+        )
+
+    _create_sqlite_database(url, seed)
+    sync_engine = create_engine(url, connect_args={"timeout": 30})
+    now = datetime.now(timezone.utc)
+
+    def claim(moderator_id):
+        with Session(sync_engine) as db:
+            return CRUDModerationClaim.claim(
+                db, moderator_id=moderator_id, limit=3, now=now, expires_at=now + timedelta(minutes=5)
+            )
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        batches = list(pool.map(claim, range(2, 8)))
+    sync_engine.dispose()
+
+    claimed = [review_id for batch in batches for review_id in batch]
+    assert claimed
+    assert len(claimed) == len(set(claimed))
+
+
+def test_bulk_moderation_requires_admin(client):
+    token = register_and_get_token(client, "user1053")
+
+    res = client.post(
+        "/api/reviews/moderation/bulk",
+        json={"review_ids": [1], "action": "reject"},
+        headers=auth_headers(token),
+    )
+
+    assert res.status_code == 403
+
+
 def test_admin_rejects_pending_review_and_it_is_not_public(client, make_user, make_review):
     author = make_user("user1014")
     admin = make_user("admin1014", role=models.Role.ADMIN)
@@ -253,6 +390,314 @@ def test_toggle_like_on_approved_review(client, make_user, make_review):
     assert second.json() == {"likes": 0, "is_liked": False}
 
 
+def test_like_missing_review_returns_404(client):
+    token = register_and_get_token(client, "user1047")
+
+    res = client.post("/api/reviews/999999/like", headers=auth_headers(token))
+
+    assert res.status_code == 404
+
+
+@pytest.mark.parametrize("buffered", [False, True])
+def test_concurrent_like_toggles_keep_counter_consistent(tmp_path, buffered):
+    url = f"sqlite:///{tmp_path / 'likes.db'}"
+
+    def seed(db):
+        _seed_author_with_review("Contended review")(db)
+        db.add_all(
+            models.User(id=user_id, username=f"liker{user_id}", password_hash="x")
+            for user_id in range(2, 10)
+        )
+
+    _create_sqlite_database(url, seed)
+    sync_engine = create_engine(url, connect_args={"timeout": 30})
+
+    def toggle(user_id):
+        with Session(sync_engine) as db:
+            return CRUDLike.toggle_like(db, user_id=user_id, review_id=1, buffered=buffered)
+
+    # Every liker toggles once; user 2 toggles twice more (a double click).
+    user_ids = list(range(2, 10)) + [2, 2]
+    with ThreadPoolExecutor(max_workers=len(user_ids)) as pool:
+        results = list(pool.map(toggle, user_ids))
+
+    with Session(sync_engine) as db:
+        stored_before_flush = db.get(models.Review, 1).likes
+        CRUDLikeDelta.flush(db, batch_size=4)
+        CRUDLikeDelta.flush(db, batch_size=100)
+        likes = db.get(models.Review, 1).likes
+        like_rows = db.query(models.Like).count()
+        pending_rows = db.query(models.ReviewLikeDelta).count()
+    sync_engine.dispose()
+
+    assert all(result is not None for result in results)
+    assert stored_before_flush == (0 if buffered else 8)
+    assert likes == like_rows == 8
+    assert pending_rows == 0
+
+
+def test_like_conflict_retry_does_not_move_the_version(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'likes.db'}"
+    _create_sqlite_database(url, _seed_author_with_review("Contended review"))
+    sync_engine = create_engine(url)
+    real_toggle = like_crud._toggle_stepwise
+    attempts = []
+
+    def conflicting_once(db, user_id, review_id, buffered):
+        attempts.append(user_id)
+        if len(attempts) == 1:
+            # What a lost insert race leaves behind: nothing deleted, nothing
+            # inserted, and the counter UPDATE run with a zero change.
+            likes = db.execute(like_crud._bump_likes(review_id, 0)).scalar()
+            return 0, 0, likes
+        return real_toggle(db, user_id, review_id, buffered)
+
+    monkeypatch.setattr(like_crud, "_toggle_stepwise", conflicting_once)
+    with Session(sync_engine) as db:
+        result = CRUDLike.toggle_like(db, user_id=1, review_id=1)
+        review = db.get(models.Review, 1)
+        version, likes = review.version, review.likes
+    sync_engine.dispose()
+
+    assert len(attempts) == 2
+    assert result == (True, 1)
+    assert (version, likes) == (2, 1)
+
+
+def test_buffered_likes_are_visible_before_flush(client, make_user, make_review, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "LIKE_COUNTER_MODE", LikeCounterMode.BUFFERED)
+    monkeypatch.setattr(public_feed_cache, "enabled", False)
+    author = make_user("user1048")
+    review = make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    tokens = [register_and_get_token(client, f"user{n}") for n in (1049, 1050)]
+
+    toggles = [
+        client.post(f"/api/reviews/{review.id}/like", headers=auth_headers(token)).json()
+        for token in tokens
+    ]
+    detail = client.get(f"/api/reviews/{review.id}").json()
+    feed = client.get("/api/reviews/public").json()
+    db_session.refresh(review)
+    stored = review.likes
+
+    CRUDLikeDelta.flush(db_session, batch_size=100)
+    db_session.refresh(review)
+
+    assert toggles == [{"likes": 1, "is_liked": True}, {"likes": 2, "is_liked": True}]
+    assert stored == 0
+    assert detail["likes"] == 2
+    assert feed["reviews"][0]["likes"] == 2
+    assert review.likes == 2
+    assert client.get(f"/api/reviews/{review.id}").json()["likes"] == 2
+
+
+def test_flush_between_page_and_likes_read_does_not_double_count(
+    client, make_user, make_review, db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "LIKE_COUNTER_MODE", LikeCounterMode.BUFFERED)
+    author = make_user("user1051")
+    review = make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    for n in (1052, 1053):
+        client.post(f"/api/reviews/{review.id}/like", headers=auth_headers(register_and_get_token(client, f"user{n}")))
+    db_session.refresh(review)
+    page_likes = review.likes
+
+    CRUDLikeDelta.flush(db_session, batch_size=100)
+
+    assert page_likes == 0
+    assert CRUDLikeDelta.get_likes(db_session, [review.id]) == {review.id: 2}
+
+
+def test_review_detail_conditional_get(client, engine, make_user, make_review):
+    author = make_user("user1064")
+    review = make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    token = register_and_get_token(client, "user1065")
+    url = f"/api/reviews/{review.id}"
+
+    first = client.get(url, headers=auth_headers(token))
+    etag = first.headers["ETag"]
+    statements = _count_statements(
+        engine,
+        lambda: client.get(url, headers={**auth_headers(token), "If-None-Match": etag}),
+    )
+    revalidated = client.get(url, headers={**auth_headers(token), "If-None-Match": etag})
+    anonymous = client.get(url, headers={"If-None-Match": etag})
+    client.post(f"{url}/like", headers=auth_headers(token))
+    after_like = client.get(url, headers={**auth_headers(token), "If-None-Match": etag})
+
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.content == b""
+    assert not any("reviews.content" in sql for sql in statements)
+    assert anonymous.status_code == 200
+    assert after_like.status_code == 200
+    assert after_like.json()["is_liked"] is True
+    assert after_like.headers["ETag"] != etag
+
+
+def test_review_version_moves_on_every_write(db_session, make_user, make_review):
+    author = make_user("user1071")
+    review = make_review(user_id=author.id, status=models.ReviewStatus.PENDING)
+    versions = [review.version]
+
+    CRUDReview.update(db_session, review, title="A retitled review")
+    versions.append(review.version)
+    CRUDReview.change_pending_status(db_session, [review.id], models.ReviewStatus.APPROVED)
+    db_session.refresh(review)
+    versions.append(review.version)
+    CRUDLike.toggle_like(db_session, user_id=author.id, review_id=review.id)
+    db_session.refresh(review)
+    versions.append(review.version)
+
+    assert versions == [1, 2, 3, 4]
+
+
+def test_buffered_like_changes_review_etag(client, make_user, make_review, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "LIKE_COUNTER_MODE", LikeCounterMode.BUFFERED)
+    author = make_user("user1066")
+    review = make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    token = register_and_get_token(client, "user1067")
+    url = f"/api/reviews/{review.id}"
+
+    before = client.get(url).headers["ETag"]
+    client.post(f"{url}/like", headers=auth_headers(token))
+    buffered = client.get(url).headers["ETag"]
+    CRUDLikeDelta.flush(db_session, batch_size=100)
+    flushed = client.get(url, headers={"If-None-Match": buffered})
+
+    assert buffered != before
+    assert flushed.status_code == 200
+    assert flushed.json()["likes"] == 1
+
+
+def test_hidden_review_is_not_revealed_by_conditional_get(client, make_user, make_review):
+    author = make_user("user1068")
+    review = make_review(user_id=author.id, status=models.ReviewStatus.PENDING)
+
+    response = client.get(f"/api/reviews/{review.id}", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 404
+
+
+def test_public_feed_conditional_get(client, make_user, make_review, monkeypatch):
+    monkeypatch.setattr(public_feed_cache, "shared", InMemorySharedFeedCache())
+    author = make_user("user1069")
+    make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    pending = make_review(user_id=author.id, status=models.ReviewStatus.PENDING)
+    admin = make_user("admin1070", role=models.Role.ADMIN)
+    admin_token = login_and_get_token(client, admin.username)
+
+    etag = client.get("/api/reviews/public").headers["ETag"]
+    revalidated = client.get("/api/reviews/public", headers={"If-None-Match": etag})
+    other_page = client.get("/api/reviews/public?limit=5", headers={"If-None-Match": etag})
+    client.post(f"/api/reviews/{pending.id}/approve", headers=auth_headers(admin_token))
+    after_approve = client.get("/api/reviews/public", headers={"If-None-Match": etag})
+
+    assert revalidated.status_code == 304
+    assert other_page.status_code == 200
+    assert after_approve.status_code == 200
+    assert len(after_approve.json()["reviews"]) == 2
+
+
+def test_public_feed_has_no_etag_without_shared_version(client, make_user, make_review):
+    author = make_user("user1090")
+    make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+
+    response = client.get("/api/reviews/public", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_anonymous_feed_is_cached_compressed(client, make_user, make_review, monkeypatch):
+    author = make_user("user1072")
+    for _ in range(5):
+        make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    compressions = []
+    real_compress = reviews_endpoint.compress
+    monkeypatch.setattr(
+        reviews_endpoint, "compress",
+        lambda body, encoding: compressions.append(encoding) or real_compress(body, encoding)
+    )
+
+    responses = [
+        client.get("/api/reviews/public", headers={"Accept-Encoding": encoding})
+        for encoding in ("br", "br", "gzip", "identity")
+    ]
+
+    assert [response.headers.get("Content-Encoding") for response in responses] == [
+        "br", "br", "gzip", None
+    ]
+    assert [response.headers["X-Cache"] for response in responses] == ["MISS", "HIT", "HIT", "HIT"]
+    assert compressions == ["br", "gzip"]
+    assert all(response.json() == responses[-1].json() for response in responses)
+
+
+def test_metrics_report_route_templates_and_sql(client, make_user, make_review):
+    author = make_user("user1073")
+    review = make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    labels = {"method": "GET", "route": "/api/reviews/{review_id}"}
+    queries_before = REGISTRY.get_sample_value("http_request_db_queries_sum", labels) or 0
+
+    client.get(f"/api/reviews/{review.id}")
+    client.get("/api/reviews/999999")
+    client.get("/no/such/path")
+    body = client.get("/metrics").text
+
+    assert REGISTRY.get_sample_value("http_request_db_queries_sum", labels) > queries_before
+    assert 'route="/api/reviews/{review_id}",status="200"' in body
+    assert 'route="/api/reviews/{review_id}",status="404"' in body
+    assert 'route="unmatched",status="404"' in body
+    assert f"/api/reviews/{review.id}" not in body
+    assert 'db_pool{field="checked_out",pool="async"}' in body
+    assert 'threadpool_threads{state="capacity"}' in body
+
+
+def test_endpoint_over_query_budget_fails(client, make_user, make_review, monkeypatch):
+    author = make_user("user1074")
+    make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    monkeypatch.setattr(reviews_endpoint.get_public_reviews, "__query_budget__", 1)
+
+    with pytest.raises(QueryBudgetExceeded, match=r"GET /api/reviews/public: \d+ queries, budget is 1"):
+        client.get("/api/reviews/public")
+
+
+def test_over_budget_is_logged_when_not_strict(client, make_user, make_review, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET_STRICT", False)
+    monkeypatch.setattr(reviews_endpoint.get_public_reviews, "__query_budget__", 1)
+    author = make_user("user1075")
+    make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+
+    with caplog.at_level("WARNING", logger="app.utils.query_budget"):
+        response = client.get("/api/reviews/public")
+
+    assert response.status_code == 200
+    assert any(
+        "GET /api/reviews/public:" in record.getMessage() and "budget is 1" in record.getMessage()
+        for record in caplog.records
+    )
+
+
+def test_bulk_moderation_does_not_repeat_statements_per_author(client, make_user, make_review, monkeypatch):
+    # Strict mode: a per-author counter statement would raise here.
+    monkeypatch.setattr(settings, "SQL_REPEAT_WARNING_THRESHOLD", 3)
+    admin = make_user("admin1076", role=models.Role.ADMIN)
+    review_ids = [
+        make_review(user_id=make_user(f"user{n}").id, status=models.ReviewStatus.PENDING).id
+        for n in (1077, 1078, 1079)
+    ]
+    admin_token = login_and_get_token(client, admin.username)
+
+    response = client.post(
+        "/api/reviews/moderation/bulk",
+        json={"review_ids": review_ids, "action": "approve"},
+        headers=auth_headers(admin_token),
+    )
+
+    assert response.status_code == 200
+    assert response.json()["applied"] == 3
+
+
 @pytest.mark.parametrize("status", [models.ReviewStatus.PENDING, models.ReviewStatus.REJECTED])
 def test_like_disallowed_for_non_approved_review(client, make_user, make_review, status):
     author = make_user(f"userlike{status.value}")
@@ -328,3 +773,809 @@ def test_user_cannot_delete_other_users_review(client, make_user, make_review):
 
     assert res.status_code == 403
     assert res.json()["detail"] == "You can only delete your own reviews"
+
+
+def test_public_reviews_is_liked_for_logged_in_user(client, make_user, make_review):
+    author = make_user("user1023")
+    token = register_and_get_token(client, "user1024")
+    liked = make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    not_liked = make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    client.post(f"/api/reviews/{liked.id}/like", headers=auth_headers(token))
+
+    res = client.get("/api/reviews/public", headers=auth_headers(token))
+
+    assert res.status_code == 200
+    is_liked = {item["id"]: item["is_liked"] for item in res.json()["reviews"]}
+    assert is_liked == {liked.id: True, not_liked.id: False}
+
+
+def _count_statements(engine, fn):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def test_list_responses_match_their_response_models(client, make_user, make_review):
+    admin = make_user("admin1057", role=models.Role.ADMIN)
+    author = make_user("user1058")
+    make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    make_review(user_id=author.id, status=models.ReviewStatus.PENDING)
+    author_token = login_and_get_token(client, author.username)
+    admin_token = login_and_get_token(client, admin.username)
+
+    pages = [
+        (client.get("/api/reviews/public"), review_schemas.PaginatedReviewsResponse),
+        (client.get("/api/reviews/public", headers=auth_headers(author_token)),
+         review_schemas.PaginatedReviewsResponse),
+        (client.get("/api/reviews/my", headers=auth_headers(author_token)),
+         review_schemas.PaginatedMyReviewsResponse),
+        (client.get("/api/reviews/moderation", headers=auth_headers(admin_token)),
+         review_schemas.PaginatedReviewsResponse),
+    ]
+
+    for res, response_model in pages:
+        assert res.status_code == 200
+        assert res.headers["content-type"] == "application/json"
+        body = res.json()
+        assert body["reviews"]
+        assert response_model.model_validate(body).model_dump(mode="json") == body
+
+
+def test_excerpt_listing_defers_full_content(client, engine, make_user, make_review):
+    author = make_user("user1059")
+    content = "Slow cinema at its best. " * 100
+    review = make_review(user_id=author.id, status=models.ReviewStatus.APPROVED, content=content)
+
+    statements = _count_statements(
+        engine, lambda: client.get("/api/reviews/public?content=excerpt")
+    )
+    feed = client.get("/api/reviews/public?content=excerpt").json()
+    detail = client.get(f"/api/reviews/{review.id}").json()
+
+    listed = feed["reviews"][0]
+    assert listed["content"] == models.make_excerpt(content)
+    assert listed["content"].endswith("…")
+    assert listed["content_length"] == len(content)
+    assert detail["content"] == content
+    assert detail["content_length"] == len(content)
+    feed_select = next(sql for sql in statements if "FROM reviews" in sql and "LIMIT" in sql)
+    assert re.search(r"reviews\.content\b", feed_select) is None
+    assert "reviews.excerpt" in feed_select
+
+
+def test_sparse_fields_narrow_query_and_payload(client, engine, make_user, make_review):
+    token = register_and_get_token(client, "user1061")
+    author = make_user("user1062")
+    review = make_review(user_id=author.id, status=models.ReviewStatus.APPROVED, likes=3)
+    client.get("/api/auth/me", headers=auth_headers(token))
+
+    statements = _count_statements(
+        engine,
+        lambda: client.get("/api/reviews/public?fields=title,likes", headers=auth_headers(token)),
+    )
+    feed = client.get("/api/reviews/public?fields=title,likes", headers=auth_headers(token)).json()
+    detail = client.get(f"/api/reviews/{review.id}?fields=movie_title").json()
+
+    assert feed["reviews"] == [{"id": review.id, "title": review.title, "likes": 3}]
+    assert set(feed["pagination"]) >= {"current_page", "total_items"}
+    assert detail == {"id": review.id, "movie_title": review.movie_title}
+    feed_select = next(sql for sql in statements if "FROM reviews" in sql and "LIMIT" in sql)
+    assert "users" not in feed_select
+    assert re.search(r"reviews\.content\b", feed_select) is None
+    assert not any("FROM likes" in sql for sql in statements)
+
+
+@pytest.mark.parametrize("url", [
+    "/api/reviews/public?fields=title,password_hash",
+    "/api/reviews/1?fields=secret",
+])
+def test_unknown_fields_are_rejected(client, url):
+    response = client.get(url)
+
+    assert response.status_code == 400
+    assert "Unknown fields" in response.json()["detail"]
+
+
+def test_my_reviews_reject_author_field(client):
+    token = register_and_get_token(client, "user1063")
+
+    response = client.get("/api/reviews/my?fields=author", headers=auth_headers(token))
+
+    assert response.status_code == 400
+
+
+def test_public_feed_query_count_does_not_grow_with_page_size(
+    client, engine, make_user, make_review
+):
+    token = register_and_get_token(client, "user1025")
+    for index in range(5):
+        author = make_user(f"feedauthor{index}")
+        make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    # Warm-up: the first authenticated request also loads the token deny-list.
+    client.get("/api/auth/me", headers=auth_headers(token))
+
+    small_page = _count_statements(
+        engine,
+        lambda: client.get("/api/reviews/public?limit=1", headers=auth_headers(token)),
+    )
+    full_page = _count_statements(
+        engine,
+        lambda: client.get("/api/reviews/public?limit=5", headers=auth_headers(token)),
+    )
+
+    assert len(full_page) == len(small_page)
+    assert not any(
+        "FROM users" in statement and "users.password_hash" in statement
+        and "reviews" in statement
+        for statement in full_page
+    )
+
+
+@pytest.mark.parametrize("sort", ["created_at", "likes"])
+def test_public_feed_cursor_walk_returns_every_review_once(
+    client, make_user, make_review, sort
+):
+    author = make_user(f"cursorauthor{sort}")
+    created = [
+        make_review(user_id=author.id, status=models.ReviewStatus.APPROVED, likes=index % 2)
+        for index in range(5)
+    ]
+
+    seen = []
+    res = client.get(f"/api/reviews/public?limit=2&sort={sort}")
+    while True:
+        assert res.status_code == 200
+        body = res.json()
+        seen.extend(item["id"] for item in body["reviews"])
+        if not body["cursor"]["next_cursor"]:
+            break
+        res = client.get(
+            f"/api/reviews/public?limit=2&sort={sort}&cursor={body['cursor']['next_cursor']}"
+        )
+
+    assert sorted(seen) == sorted(review.id for review in created)
+    assert len(seen) == len(set(seen))
+
+
+def test_public_feed_cursor_stops_when_last_page_is_full(client, make_user, make_review):
+    author = make_user("cursorfullpage")
+    for _ in range(4):
+        make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+
+    first = client.get("/api/reviews/public?limit=2").json()
+    assert first["cursor"]["has_more"] is True
+
+    second = client.get(f"/api/reviews/public?limit=2&cursor={first['cursor']['next_cursor']}").json()
+    assert len(second["reviews"]) == 2
+    assert second["cursor"] == {"next_cursor": None, "has_more": False}
+
+
+@pytest.mark.parametrize("search", ["%20%20", "%20a%20"])
+def test_public_feed_rejects_blank_search(client, search):
+    res = client.get(f"/api/reviews/public?search={search}")
+
+    assert res.status_code == 422
+
+
+def test_public_feed_search_ignores_surrounding_whitespace(client, make_user, make_review):
+    author = make_user("searchtrim")
+    review = make_review(user_id=author.id, status=models.ReviewStatus.APPROVED, title="Solaris revisited")
+
+    res = client.get("/api/reviews/public?search=%20solaris%20")
+
+    assert res.status_code == 200
+    assert [item["id"] for item in res.json()["reviews"]] == [review.id]
+
+
+def test_public_feed_rejects_cursor_for_other_sort(client, make_user, make_review):
+    author = make_user("user1026")
+    for _ in range(2):
+        make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    first = client.get("/api/reviews/public?limit=1&sort=created_at").json()
+
+    res = client.get(
+        f"/api/reviews/public?limit=1&sort=likes&cursor={first['cursor']['next_cursor']}"
+    )
+
+    assert res.status_code == 400
+
+
+def test_counters_strategy_tracks_review_lifecycle(client, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_REVIEWS_COUNT_STRATEGY", CountStrategy.COUNTERS)
+    monkeypatch.setattr(settings, "MY_REVIEWS_COUNT_STRATEGY", CountStrategy.COUNTERS)
+    monkeypatch.setattr(settings, "MODERATION_COUNT_STRATEGY", CountStrategy.COUNTERS)
+    token = register_and_get_token(client, "user1027")
+    admin = make_user("admin1027", role=models.Role.ADMIN)
+    admin_token = login_and_get_token(client, admin.username)
+
+    def totals():
+        public = client.get("/api/reviews/public").json()["pagination"]
+        my = client.get("/api/reviews/my", headers=auth_headers(token)).json()["pagination"]
+        pending = client.get(
+            "/api/reviews/moderation", headers=auth_headers(admin_token)
+        ).json()["pagination"]
+        assert public["total_is_exact"] and my["total_is_exact"] and pending["total_is_exact"]
+        return public["total_items"], my["total_items"], pending["total_items"]
+
+    first_id = client.post("/api/reviews/", json=REVIEW_PAYLOAD, headers=auth_headers(token)).json()["id"]
+    second_id = client.post("/api/reviews/", json=REVIEW_PAYLOAD, headers=auth_headers(token)).json()["id"]
+    assert totals() == (0, 2, 2)
+
+    client.post(f"/api/reviews/{first_id}/approve", headers=auth_headers(admin_token))
+    client.post(f"/api/reviews/{second_id}/reject", headers=auth_headers(admin_token))
+    assert totals() == (1, 2, 0)
+
+    client.put(f"/api/reviews/{first_id}", json=REVIEW_PAYLOAD, headers=auth_headers(token))
+    assert totals() == (0, 2, 1)
+
+    client.delete(f"/api/reviews/{first_id}", headers=auth_headers(token))
+    assert totals() == (0, 1, 0)
+
+
+def test_cached_strategy_reports_inexact_total_on_hit(client, make_user, make_review, monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_REVIEWS_COUNT_STRATEGY", CountStrategy.CACHED)
+    monkeypatch.setattr(public_feed_cache, "enabled", False)
+    review_count_cache.clear()
+    author = make_user("user1028")
+    make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+
+    first = client.get("/api/reviews/public?search=Great").json()["pagination"]
+    make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    second = client.get("/api/reviews/public?search=great").json()["pagination"]
+    review_count_cache.clear()
+
+    assert (first["total_items"], first["total_is_exact"]) == (1, True)
+    assert (second["total_items"], second["total_is_exact"]) == (1, False)
+
+
+def test_search_matches_content_and_stems_words(client, make_user, make_review):
+    author = make_user("user1029")
+    in_content = make_review(
+        user_id=author.id,
+        title="Quiet evening",
+        movie_title="Paterson",
+        content="The poems in this film are read slowly. " * 4,
+        status=models.ReviewStatus.APPROVED,
+    )
+    make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+
+    res = client.get("/api/reviews/public?search=poem")
+
+    assert res.status_code == 200
+    assert [item["id"] for item in res.json()["reviews"]] == [in_content.id]
+
+
+def test_search_is_case_insensitive_for_cyrillic(client, make_user, make_review):
+    author = make_user("user1030")
+    review = make_review(
+        user_id=author.id,
+        title="Отличный фильм",
+        movie_title="Сталкер",
+        status=models.ReviewStatus.APPROVED,
+    )
+
+    res = client.get("/api/reviews/public?search=сталкер")
+
+    assert [item["id"] for item in res.json()["reviews"]] == [review.id]
+
+
+def test_search_sorted_by_relevance(client, make_user, make_review):
+    author = make_user("user1031")
+    mentions_once = make_review(
+        user_id=author.id,
+        title="Space drama",
+        content="A long review about pacing and sound. " * 3 + "Solaris is mentioned once.",
+        status=models.ReviewStatus.APPROVED,
+    )
+    about_solaris = make_review(
+        user_id=author.id,
+        title="Solaris review",
+        movie_title="Solaris",
+        content="Solaris, Solaris and more Solaris. " * 4,
+        status=models.ReviewStatus.APPROVED,
+    )
+
+    res = client.get("/api/reviews/public?search=solaris&sort=relevance")
+
+    assert res.status_code == 200
+    assert [item["id"] for item in res.json()["reviews"]] == [about_solaris.id, mentions_once.id]
+
+
+def test_search_index_follows_review_edits(client, make_review):
+    token = register_and_get_token(client, "user1032")
+    me = client.get("/api/auth/me", headers=auth_headers(token)).json()
+    review = make_review(user_id=me["id"], title="Before edit")
+
+    client.put(
+        f"/api/reviews/{review.id}",
+        json={**REVIEW_PAYLOAD, "title": "Edited about Tarkovsky"},
+        headers=auth_headers(token),
+    )
+    res = client.get("/api/reviews/my?search=tarkovsky", headers=auth_headers(token))
+
+    assert [item["id"] for item in res.json()["reviews"]] == [review.id]
+
+
+def test_search_treats_query_syntax_literally(client, make_user, make_review):
+    author = make_user("user1033")
+    make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+
+    res = client.get('/api/reviews/public?search="great" OR NEAR(')
+
+    assert res.status_code == 200
+
+
+def test_fuzzy_search_tolerates_typos_in_movie_title(client, make_user, make_review):
+    author = make_user("user1034")
+    interstellar = make_review(
+        user_id=author.id,
+        title="Space and time",
+        movie_title="Interstellar",
+        status=models.ReviewStatus.APPROVED,
+    )
+    make_review(user_id=author.id, movie_title="Inception", status=models.ReviewStatus.APPROVED)
+
+    exact = client.get("/api/reviews/public?search=interstelar")
+    fuzzy = client.get("/api/reviews/public?search=interstelar&search_mode=fuzzy")
+
+    assert exact.json()["reviews"] == []
+    assert [item["id"] for item in fuzzy.json()["reviews"]] == [interstellar.id]
+    assert fuzzy.json()["pagination"]["total_items"] == 1
+    assert fuzzy.json()["cursor"]["next_cursor"] is None
+
+
+def test_fuzzy_search_ranks_closer_titles_first(client, make_user, make_review):
+    author = make_user("user1035")
+    partial = make_review(
+        user_id=author.id,
+        title="Notes on Solar power",
+        movie_title="Sunshine",
+        status=models.ReviewStatus.APPROVED,
+    )
+    exact = make_review(
+        user_id=author.id,
+        title="Thoughts",
+        movie_title="Solaris",
+        status=models.ReviewStatus.APPROVED,
+    )
+
+    res = client.get("/api/reviews/public?search=solaris&search_mode=fuzzy")
+
+    assert [item["id"] for item in res.json()["reviews"]] == [exact.id, partial.id]
+
+
+def test_fuzzy_search_caps_candidates_after_author_filter(client, make_user, make_review, monkeypatch):
+    monkeypatch.setattr(settings, "FUZZY_SEARCH_MAX_CANDIDATES", 1)
+    author = make_user("user1091")
+    other = make_user("user1092")
+    mine = make_review(user_id=author.id, movie_title="Solaris", status=models.ReviewStatus.APPROVED)
+    # Same score and a higher id: ranked ahead of the author's review.
+    make_review(user_id=other.id, movie_title="Solaris", status=models.ReviewStatus.APPROVED)
+
+    res = client.get(f"/api/reviews/public?search=solaris&search_mode=fuzzy&author_id={author.id}")
+
+    assert [item["id"] for item in res.json()["reviews"]] == [mine.id]
+    assert res.json()["pagination"]["total_items"] == 1
+
+
+def test_fuzzy_search_index_follows_review_edits(client, make_review):
+    token = register_and_get_token(client, "user1036")
+    me = client.get("/api/auth/me", headers=auth_headers(token)).json()
+    review = make_review(user_id=me["id"], title="Before edit")
+    client.get("/api/reviews/my?search=anything&search_mode=fuzzy", headers=auth_headers(token))
+
+    client.put(
+        f"/api/reviews/{review.id}",
+        json={**REVIEW_PAYLOAD, "title": "Edited about Tarkovsky"},
+        headers=auth_headers(token),
+    )
+    res = client.get(
+        "/api/reviews/my?search=tarkovski&search_mode=fuzzy",
+        headers=auth_headers(token),
+    )
+
+    assert [item["id"] for item in res.json()["reviews"]] == [review.id]
+
+
+def test_fuzzy_search_index_reloads_writes_from_other_workers(
+    client, db_connection, make_user, monkeypatch
+):
+    author = make_user("user1037")
+    client.get("/api/reviews/public?search=anything&search_mode=fuzzy")
+    # A Core insert skips this process's session events, like a write
+    # committed by another worker.
+    content = "B" * 120
+    db_connection.execute(insert(models.Review).values(
+        user_id=author.id,
+        title="Nostalghia notes",
+        movie_title="Nostalghia",
+        content=content,
+        excerpt=models.make_excerpt(content),
+        content_length=len(content),
+        status=models.ReviewStatus.APPROVED,
+    ))
+
+    stale = client.get("/api/reviews/public?search=nostalgia&search_mode=fuzzy")
+    monkeypatch.setattr(review_title_index, "refresh_seconds", 0)
+    public_feed_cache.clear()
+    reloaded = client.get("/api/reviews/public?search=nostalgia&search_mode=fuzzy")
+
+    assert stale.json()["reviews"] == []
+    assert [item["movie_title"] for item in reloaded.json()["reviews"]] == ["Nostalghia"]
+
+
+def _feed_query_plan(engine, db_session, fn):
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM reviews" in statement and "ORDER BY" in statement:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    statement, parameters = captured[-1]
+    rows = db_session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    "url, role, expected_index",
+    [
+        ("/api/reviews/public?sort=created_at", models.Role.USER, "ix_reviews_approved_created_at"),
+        ("/api/reviews/public?sort=likes", models.Role.USER, "ix_reviews_approved_likes"),
+        ("/api/reviews/public?author_id={user_id}", models.Role.USER, "ix_reviews_user_created_at"),
+        ("/api/reviews/my?sort=created_at", models.Role.USER, "ix_reviews_user_created_at"),
+        ("/api/reviews/my?sort=likes", models.Role.USER, "ix_reviews_user_likes"),
+        ("/api/reviews/moderation", models.Role.ADMIN, "ix_reviews_pending_created_at"),
+    ],
+)
+def test_feed_queries_use_matching_index(
+    client, engine, db_session, make_user, make_review, url, role, expected_index
+):
+    user = make_user("user1037", role=role)
+    for status in models.ReviewStatus:
+        make_review(user_id=user.id, status=status)
+    token = login_and_get_token(client, user.username)
+
+    plan = _feed_query_plan(
+        engine,
+        db_session,
+        lambda: client.get(url.format(user_id=user.id), headers=auth_headers(token)),
+    )
+
+    assert f"USING INDEX {expected_index}" in plan or f"USING COVERING INDEX {expected_index}" in plan
+
+
+def test_likes_lookup_by_review_uses_index(db_session):
+    rows = db_session.connection().exec_driver_sql(
+        "EXPLAIN QUERY PLAN SELECT id FROM likes WHERE review_id = ?", (1,)
+    )
+
+    assert "ix_likes_review_id" in " | ".join(row[-1] for row in rows)
+
+
+def _create_sqlite_database(url, seed):
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(sync_engine)
+    with Session(sync_engine) as db:
+        seed(db)
+        db.commit()
+    sync_engine.dispose()
+
+
+def _seed_author_with_review(title):
+    def seed(db):
+        author = models.User(id=1, username="user1038", password_hash="x")
+        db.add(author)
+        db.add(models.Review(
+            id=1,
+            user_id=author.id,
+            title=title,
+            movie_title="Solaris",
+            content="A" * 120,
+            status=models.ReviewStatus.APPROVED,
+        ))
+    return seed
+
+
+def _async_session_override(async_engine):
+    session_factory = async_sessionmaker(async_engine)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    return override_get_async_db
+
+
+def test_endpoints_run_on_a_real_async_session(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    _create_sqlite_database(url, _seed_author_with_review("Async review"))
+    async_engine = create_async_engine(async_database_url(url), poolclass=NullPool)
+
+    app.dependency_overrides[get_async_db] = _async_session_override(async_engine)
+    try:
+        with TestClient(app) as async_client:
+            headers = auth_headers(create_access_token({"sub": "1"}))
+            review_id = async_client.get("/api/reviews/public").json()["reviews"][0]["id"]
+            like = async_client.post(f"/api/reviews/{review_id}/like", headers=headers)
+            feed = async_client.get("/api/reviews/public", headers=headers)
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(async_engine.dispose())
+
+    assert like.status_code == 200
+    assert feed.json()["reviews"][0]["is_liked"] is True
+    assert feed.json()["reviews"][0]["likes"] == 1
+
+
+def test_reads_use_replica_until_the_user_writes(tmp_path, monkeypatch):
+    primary_url = f"sqlite:///{tmp_path / 'primary.db'}"
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+
+    def seed_primary(db):
+        _seed_author_with_review("Fresh title")(db)
+        db.add(models.User(id=2, username="user1040", password_hash="x"))
+
+    _create_sqlite_database(primary_url, seed_primary)
+    # The replica lags behind: old title and no second user yet.
+    _create_sqlite_database(replica_url, _seed_author_with_review("Stale title"))
+    primary_engine = create_async_engine(async_database_url(primary_url), poolclass=NullPool)
+    replica_engine = create_async_engine(async_database_url(replica_url), poolclass=NullPool)
+    monkeypatch.setattr("app.dependencies.read_replicas", ReplicaSet([replica_engine]))
+
+    app.dependency_overrides[get_async_db] = _async_session_override(primary_engine)
+    try:
+        with TestClient(app) as routed_client:
+            author_headers = auth_headers(create_access_token({"sub": "1"}))
+            anonymous_before = routed_client.get("/api/reviews/public").json()
+            author_before = routed_client.get("/api/reviews/1", headers=author_headers).json()
+            like = routed_client.post("/api/reviews/1/like", headers=author_headers)
+            # The client echoes the write marker; any worker honours it.
+            write_marker = {"X-Last-Write": like.headers["X-Last-Write"]}
+            author_without_marker = routed_client.get("/api/reviews/1", headers=author_headers).json()
+            author_after = routed_client.get(
+                "/api/reviews/1", headers={**author_headers, **write_marker}
+            ).json()
+            anonymous_after = routed_client.get("/api/reviews/public", headers=write_marker).json()
+            new_user = routed_client.get(
+                "/api/auth/me",
+                headers=auth_headers(create_access_token({"sub": "2"})),
+            )
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(primary_engine.dispose())
+        asyncio.run(replica_engine.dispose())
+
+    assert anonymous_before["reviews"][0]["title"] == "Stale title"
+    assert author_before["title"] == "Stale title"
+    assert author_without_marker["title"] == "Stale title"
+    assert author_after["title"] == "Fresh title"
+    assert author_after["is_liked"] is True
+    assert anonymous_after["reviews"][0]["title"] == "Stale title"
+    assert new_user.status_code == 200
+    assert new_user.json()["username"] == "user1040"
+
+
+def test_tagged_feed_is_read_from_the_primary(tmp_path, monkeypatch):
+    primary_url = f"sqlite:///{tmp_path / 'primary.db'}"
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    _create_sqlite_database(primary_url, _seed_author_with_review("Fresh title"))
+    _create_sqlite_database(replica_url, _seed_author_with_review("Stale title"))
+    primary_engine = create_async_engine(async_database_url(primary_url), poolclass=NullPool)
+    replica_engine = create_async_engine(async_database_url(replica_url), poolclass=NullPool)
+    monkeypatch.setattr("app.dependencies.read_replicas", ReplicaSet([replica_engine]))
+
+    app.dependency_overrides[get_async_db] = _async_session_override(primary_engine)
+    try:
+        with TestClient(app) as routed_client:
+            untagged = routed_client.get("/api/reviews/public")
+            monkeypatch.setattr(public_feed_cache, "shared", InMemorySharedFeedCache())
+            public_feed_cache.clear()
+            tagged = routed_client.get("/api/reviews/public")
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(primary_engine.dispose())
+        asyncio.run(replica_engine.dispose())
+
+    assert "ETag" not in untagged.headers
+    assert untagged.json()["reviews"][0]["title"] == "Stale title"
+    assert "ETag" in tagged.headers
+    assert tagged.json()["reviews"][0]["title"] == "Fresh title"
+
+
+def test_denylist_refresh_ignores_a_lagging_replica(tmp_path, monkeypatch):
+    primary_url = f"sqlite:///{tmp_path / 'primary.db'}"
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    _create_sqlite_database(primary_url, _seed_author_with_review("Title"))
+    # The replica has not received the revocation yet.
+    _create_sqlite_database(replica_url, _seed_author_with_review("Title"))
+    primary_engine = create_async_engine(async_database_url(primary_url), poolclass=NullPool)
+    replica_engine = create_async_engine(async_database_url(replica_url), poolclass=NullPool)
+    monkeypatch.setattr("app.dependencies.read_replicas", ReplicaSet([replica_engine]))
+
+    app.dependency_overrides[get_async_db] = _async_session_override(primary_engine)
+    try:
+        with TestClient(app) as routed_client:
+            headers = auth_headers(create_access_token({"sub": "1"}))
+            routed_client.post("/api/auth/logout", headers=headers)
+            monkeypatch.setattr(token_denylist, "refresh_seconds", 0)
+            after_refresh = routed_client.get("/api/auth/me", headers=headers)
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(primary_engine.dispose())
+        asyncio.run(replica_engine.dispose())
+
+    assert after_refresh.status_code == 401
+
+
+def test_writes_return_a_read_your_writes_marker(client, make_user):
+    admin = make_user("admin1041", role=models.Role.ADMIN)
+    token = login_and_get_token(client, admin.username)
+
+    created = client.post("/api/reviews", json=REVIEW_PAYLOAD, headers=auth_headers(token))
+    claimed = client.post("/api/reviews/moderation/claim", headers=auth_headers(token))
+    preflight = client.options(
+        "/api/reviews/public",
+        headers={"Origin": "http://localhost:3000", "Access-Control-Request-Method": "GET"},
+    )
+    read = client.get(
+        "/api/reviews/public",
+        headers={**auth_headers(token), "Origin": "http://localhost:3000"},
+    )
+
+    assert read_your_writes.is_recent(created.headers["X-Last-Write"], admin.id)
+    assert read_your_writes.is_recent(claimed.headers["X-Last-Write"], admin.id)
+    assert preflight.status_code == 200
+    assert "X-Last-Write" not in read.headers
+    assert "X-Last-Write" in read.headers["Access-Control-Expose-Headers"]
+
+
+def test_admin_can_read_database_pool_stats(client, make_user):
+    admin = make_user("admin1039", role=models.Role.ADMIN)
+    user_token = register_and_get_token(client, "user1039")
+
+    admin_res = client.get(
+        "/api/system/db-pools",
+        headers=auth_headers(login_and_get_token(client, admin.username)),
+    )
+    user_res = client.get("/api/system/db-pools", headers=auth_headers(user_token))
+
+    assert admin_res.status_code == 200
+    assert set(admin_res.json()["pools"]) == {"sync", "async"}
+    assert user_res.status_code == 403
+
+
+def test_saturated_password_hasher_returns_503(client, make_user, monkeypatch):
+    make_user("user1044")
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    login_res = client.post(
+        "/api/auth/login",
+        json={"username": "user1044", "password": "password123"},
+    )
+    register_res = client.post(
+        "/api/auth/register",
+        json={"username": "user1045", "password": "password123"},
+    )
+
+    assert login_res.status_code == 503
+    assert login_res.headers["Retry-After"] == "1"
+    assert register_res.status_code == 503
+
+
+def test_admin_can_read_password_hasher_stats(client, make_user):
+    admin = make_user("admin1046", role=models.Role.ADMIN)
+    token = login_and_get_token(client, admin.username)
+
+    res = client.get("/api/system/password-hasher", headers=auth_headers(token))
+
+    assert res.status_code == 200
+    body = res.json()
+    assert body["workers"] == settings.PASSWORD_HASH_WORKERS
+    assert body["operations"]["verify"]["count"] >= 1
+    assert body["pending"] == 0
+
+
+def test_anonymous_feed_is_served_from_cache_without_database(client, engine, make_user, make_review):
+    author = make_user("user1041")
+    make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+
+    first = client.get("/api/reviews/public?search=Great")
+    statements = _count_statements(engine, lambda: client.get("/api/reviews/public?search=great "))
+    second = client.get("/api/reviews/public?search=great")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert statements == []
+    assert second.json() == first.json()
+
+
+def test_logged_in_feed_bypasses_cache(client, make_user, make_review):
+    token = register_and_get_token(client, "user1042")
+    author = make_user("user1043")
+    make_review(user_id=author.id, status=models.ReviewStatus.APPROVED)
+    client.get("/api/reviews/public")
+
+    res = client.get("/api/reviews/public", headers=auth_headers(token))
+
+    assert "X-Cache" not in res.headers
+    assert res.json()["reviews"][0]["is_liked"] is False
+
+
+@pytest.mark.parametrize("action", ["like", "approve", "reject", "edit", "delete"])
+def test_feed_changes_invalidate_cached_pages(client, make_user, make_review, action):
+    token = register_and_get_token(client, "user1044")
+    me = client.get("/api/auth/me", headers=auth_headers(token)).json()
+    admin = make_user("admin1044", role=models.Role.ADMIN)
+    admin_headers = auth_headers(login_and_get_token(client, admin.username))
+    approved = make_review(user_id=me["id"], status=models.ReviewStatus.APPROVED)
+    pending = make_review(user_id=me["id"], status=models.ReviewStatus.PENDING)
+    client.get("/api/reviews/public")
+
+    if action == "like":
+        client.post(f"/api/reviews/{approved.id}/like", headers=auth_headers(token))
+    elif action == "approve":
+        client.post(f"/api/reviews/{pending.id}/approve", headers=admin_headers)
+    elif action == "reject":
+        client.post(f"/api/reviews/{pending.id}/reject", headers=admin_headers)
+    elif action == "edit":
+        client.put(f"/api/reviews/{approved.id}", json=REVIEW_PAYLOAD, headers=auth_headers(token))
+    else:
+        client.delete(f"/api/reviews/{approved.id}", headers=auth_headers(token))
+    res = client.get("/api/reviews/public")
+
+    assert res.headers["X-Cache"] == "MISS"
+
+
+def test_logout_revokes_the_token(client):
+    token = register_and_get_token(client, "user1045")
+    other_token = login_and_get_token(client, "user1045")
+
+    logout = client.post("/api/auth/logout", headers=auth_headers(token))
+    revoked = client.get("/api/auth/me", headers=auth_headers(token))
+    other = client.get("/api/auth/me", headers=auth_headers(other_token))
+
+    assert logout.status_code == 204
+    assert revoked.status_code == 401
+    assert other.status_code == 200
+
+
+def test_logout_is_seen_by_other_workers_after_refresh(client, db_session):
+    token = register_and_get_token(client, "user1046")
+    client.get("/api/auth/me", headers=auth_headers(token))
+    client.post("/api/auth/logout", headers=auth_headers(token))
+    # Another worker only has the table: drop the local copy and force a reload.
+    token_denylist.clear()
+
+    res = client.get("/api/auth/me", headers=auth_headers(token))
+
+    assert res.status_code == 401
+
+
+def test_claims_mode_authenticates_without_user_lookup(client, engine, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "JWT_CLAIMS_AUTH", True)
+    admin = make_user("admin1047", role=models.Role.ADMIN)
+    token = login_and_get_token(client, admin.username)
+    client.get("/api/auth/me", headers=auth_headers(token))
+
+    statements = _count_statements(
+        engine,
+        lambda: client.get("/api/auth/me", headers=auth_headers(token)),
+    )
+    moderation = client.get("/api/reviews/moderation", headers=auth_headers(token))
+
+    assert not any("FROM users" in statement for statement in statements)
+    assert moderation.status_code == 200
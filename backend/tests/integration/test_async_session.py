@@ -0,0 +1,132 @@
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy.orm import Session
+
+import app.db.models as models
+from app.main import app
+from app.core.config import settings
+from app.db.base import Base
+from app.db.session import async_engine, engine
+from app.utils.password_hasher import password_hasher
+from app.utils.security import create_access_token
+
+# These tests run the application's own engines (sqlite+aiosqlite for async
+# endpoints) instead of the per-test connection the other integration tests
+# share, so they only run against the throwaway database conftest sets up.
+BOOTSTRAP_DATABASE_URL = "sqlite:///./test_bootstrap.db"
+
+REVIEW_PAYLOAD = {
+    "title": "Async written review",
+    "movie_title": "Stalker",
+    "content": "A review written through the real async session, long enough to pass "
+    "schema validation and to be stored with an excerpt and a content length.",
+}
+
+
+@pytest.fixture()
+def app_database():
+    if settings.DATABASE_URL != BOOTSTRAP_DATABASE_URL:
+        pytest.skip("runs only against the bootstrap SQLite database")
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        author = models.User(id=1, username="asyncauthor", password_hash="x")
+        reader = models.User(id=2, username="asyncreader", password_hash="x")
+        db.add_all([author, reader])
+        db.add(models.Review(
+            id=1,
+            user_id=author.id,
+            title="Seeded async review",
+            movie_title="Solaris",
+            content="A" * 120,
+            status=models.ReviewStatus.APPROVED,
+        ))
+        db.commit()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture()
+def real_client(app_database):
+    assert not app.dependency_overrides
+    with TestClient(app) as client:
+        yield client
+
+
+def _headers(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+def test_feed_read_runs_on_aiosqlite(real_client):
+    assert async_engine.dialect.driver == "aiosqlite"
+    labels = {"method": "GET", "route": "/api/reviews/public"}
+    queries_before = REGISTRY.get_sample_value("http_request_db_queries_sum", labels) or 0
+
+    res = real_client.get("/api/reviews/public")
+
+    assert res.status_code == 200
+    assert [item["title"] for item in res.json()["reviews"]] == ["Seeded async review"]
+    # Statements run inside run_sync's greenlet are still attributed to the
+    # request that issued them.
+    assert REGISTRY.get_sample_value("http_request_db_queries_sum", labels) > queries_before
+
+
+def test_write_then_read_after_write(real_client):
+    author = _headers(1)
+
+    created = real_client.post("/api/reviews", json=REVIEW_PAYLOAD, headers=author)
+    review_id = created.json()["id"]
+    detail = real_client.get(f"/api/reviews/{review_id}", headers=author)
+    mine = real_client.get("/api/reviews/my", headers=author)
+
+    assert created.status_code == 201
+    assert detail.status_code == 200
+    assert detail.json()["title"] == REVIEW_PAYLOAD["title"]
+    assert detail.json()["status"] == "pending"
+    assert {item["id"] for item in mine.json()["reviews"]} == {1, review_id}
+    assert mine.json()["pagination"]["total_items"] == 2
+
+
+def test_like_is_visible_on_the_next_read(real_client):
+    reader = _headers(2)
+
+    like = real_client.post("/api/reviews/1/like", headers=reader)
+    feed = real_client.get("/api/reviews/public", headers=reader)
+    detail = real_client.get("/api/reviews/1", headers=reader)
+
+    assert like.json() == {"likes": 1, "is_liked": True}
+    assert feed.json()["reviews"][0]["likes"] == 1
+    assert feed.json()["reviews"][0]["is_liked"] is True
+    assert detail.json()["likes"] == 1
+
+
+def test_lifespan_disposes_the_async_pool(app_database):
+    with TestClient(app) as client:
+        client.get("/api/reviews/public")
+        pool = async_engine.pool
+
+    assert async_engine.pool is not pool
+
+
+def test_no_connection_is_held_while_hashing(real_client, monkeypatch):
+    checked_out = []
+
+    async def fake_hash(password):
+        checked_out.append(async_engine.pool.checkedout())
+        return "hashed"
+
+    async def fake_verify(password, password_hash):
+        checked_out.append(async_engine.pool.checkedout())
+        return True
+
+    monkeypatch.setattr(password_hasher, "hash", fake_hash)
+    monkeypatch.setattr(password_hasher, "verify", fake_verify)
+    credentials = {"username": "asynchasher", "password": "password123"}
+
+    register = real_client.post("/api/auth/register", json=credentials)
+    login = real_client.post("/api/auth/login", json=credentials)
+
+    assert register.status_code == 201
+    assert login.status_code == 200
+    assert checked_out == [0, 0]
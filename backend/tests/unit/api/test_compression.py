@@ -0,0 +1,97 @@
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.api.compression import CompressionMiddleware, choose_encoding, compress
+
+
+PAYLOAD = b'{"reviews": [' + b'{"title": "Stalker"},' * 200 + b'{}]}'
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    def large():
+        return Response(PAYLOAD, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    def small():
+        return Response(b'{"ok": true}', media_type="application/json")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(
+            gzip.compress(PAYLOAD), media_type="application/json", headers={"Content-Encoding": "gzip"}
+        )
+
+    @app.get("/binary")
+    def binary():
+        return Response(PAYLOAD, media_type="image/png")
+
+    return TestClient(app)
+
+
+class TestChooseEncoding:
+    @pytest.mark.parametrize("header, expected", [
+        (None, None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0.1", "gzip"),
+        ("*", "br"),
+        ("gzip;q=bogus", None),
+    ])
+    def test_negotiation(self, header, expected):
+
+        assert choose_encoding(header) == expected
+
+
+class TestCompress:
+    def test_round_trip(self):
+
+        assert gzip.decompress(compress(PAYLOAD, "gzip")) == PAYLOAD
+        assert brotli.decompress(compress(PAYLOAD, "br")) == PAYLOAD
+
+    def test_gzip_output_is_deterministic(self):
+
+        assert compress(PAYLOAD, "gzip") == compress(PAYLOAD, "gzip")
+
+
+class TestCompressionMiddleware:
+    @pytest.mark.parametrize("encoding", ["gzip", "br"])
+    def test_large_response_is_compressed(self, client, encoding):
+
+        response = client.get("/large", headers={"Accept-Encoding": encoding})
+
+        assert response.headers["Content-Encoding"] == encoding
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.headers["ETag"] == 'W/"v1"'
+        assert int(response.headers["Content-Length"]) < len(PAYLOAD)
+        assert response.content == PAYLOAD
+
+    @pytest.mark.parametrize("path", ["/small", "/binary"])
+    def test_small_and_binary_responses_pass_through(self, client, path):
+
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in response.headers
+
+    def test_client_without_accept_encoding_gets_identity(self, client):
+
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["ETag"] == '"v1"'
+
+    def test_already_encoded_response_is_not_recompressed(self, client):
+
+        response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+        assert response.content == PAYLOAD
@@ -1,8 +1,11 @@
+import pytest
 from unittest.mock import Mock, patch
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
-from app.crud.like import CRUDLike
-from app.db.models import Like, Review
+from app.crud.like import CRUDLike, LIKE_TOGGLE_ATTEMPTS
+from app.db.models import Like
+from app.exceptions import LikeConflictError
 
 
 class TestCRUDLike:
@@ -38,6 +41,34 @@ class TestCRUDLike:
         # Assert
         assert result is None
     
+    def test_get_liked_review_ids(self):
+        """Тест пакетного получения лайкнутых рецензий одним запросом"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        row_1, row_3 = Mock(review_id=1), Mock(review_id=3)
+        mock_db.query.return_value.filter.return_value.all.return_value = [row_1, row_3]
+        
+        # Act
+        result = CRUDLike.get_liked_review_ids(mock_db, 1, [1, 2, 3])
+        
+        # Assert
+        assert result == {1, 3}
+        mock_db.query.assert_called_once_with(Like.review_id)
+        filter_args = mock_db.query.return_value.filter.call_args[0]
+        assert "likes.review_id IN" in str(filter_args[1])
+    
+    def test_get_liked_review_ids_empty_page(self):
+        """Тест что для пустой страницы запрос не выполняется"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        
+        # Act
+        result = CRUDLike.get_liked_review_ids(mock_db, 1, [])
+        
+        # Assert
+        assert result == set()
+        mock_db.query.assert_not_called()
+    
     def test_create_like_success(self):
         """Тест успешного создания лайка"""
         # Arrange
@@ -88,148 +119,91 @@ class TestCRUDLike:
         """Тест добавления лайка (лайка нет)"""
         # Arrange
         mock_db = Mock(spec=Session)
-        user_id = 1
-        review_id = 1
         
-        review = Mock(spec=Review)
-        review.likes = 0
-        review.id = review_id
-        
-        # Mock что лайка нет
-        with patch.object(CRUDLike, 'get_like', return_value=None) as mock_get_like:
-            mock_db.add = Mock()
-            mock_db.commit = Mock()
-            
+        with patch('app.crud.like._toggle_stepwise', return_value=(0, 1, 1)) as mock_toggle:
             # Act
-            is_liked, likes_count = CRUDLike.toggle_like(
-                db=mock_db,
-                user_id=user_id,
-                review_id=review_id,
-                review=review
-            )
-            
-            # Assert
-            assert is_liked is True
-            assert likes_count == 1
-            assert review.likes == 1
-            
-            mock_get_like.assert_called_once_with(mock_db, user_id, review_id)
-            mock_db.add.assert_called_once()
-            mock_db.commit.assert_called_once()
-            
-            # Проверяем что был создан новый лайк
-            like_arg = mock_db.add.call_args[0][0]
-            assert like_arg.user_id == user_id
-            assert like_arg.review_id == review_id
+            result = CRUDLike.toggle_like(db=mock_db, user_id=1, review_id=1)
+        
+        # Assert
+        assert result == (True, 1)
+        mock_toggle.assert_called_once_with(mock_db, 1, 1, False)
+        mock_db.commit.assert_called_once()
     
     def test_toggle_like_remove_like(self):
         """Тест удаления лайка (лайк есть)"""
         # Arrange
         mock_db = Mock(spec=Session)
-        user_id = 1
-        review_id = 1
         
-        review = Mock(spec=Review)
-        review.likes = 1
-        review.id = review_id
+        with patch('app.crud.like._toggle_stepwise', return_value=(1, 0, 4)):
+            # Act
+            result = CRUDLike.toggle_like(db=mock_db, user_id=1, review_id=1)
         
-        # Mock существующий лайк
-        mock_existing_like = Mock(spec=Like)
+        # Assert
+        assert result == (False, 4)
+        mock_db.commit.assert_called_once()
+    
+    def test_toggle_like_not_approved_review(self):
+        """Тест лайка неодобренной или несуществующей рецензии"""
+        # Arrange
+        mock_db = Mock(spec=Session)
         
-        with patch.object(CRUDLike, 'get_like', return_value=mock_existing_like) as mock_get_like:
-            mock_db.delete = Mock()
-            mock_db.commit = Mock()
-            
+        with patch('app.crud.like._toggle_stepwise', return_value=None):
             # Act
-            is_liked, likes_count = CRUDLike.toggle_like(
-                db=mock_db,
-                user_id=user_id,
-                review_id=review_id,
-                review=review
-            )
-            
-            # Assert
-            assert is_liked is False
-            assert likes_count == 0
-            assert review.likes == 0
-            
-            mock_get_like.assert_called_once_with(mock_db, user_id, review_id)
-            mock_db.delete.assert_called_once_with(mock_existing_like)
-            mock_db.commit.assert_called_once()
+            result = CRUDLike.toggle_like(db=mock_db, user_id=1, review_id=1)
+        
+        # Assert
+        assert result is None
+        mock_db.commit.assert_not_called()
     
-    def test_toggle_like_return_values(self):
-        """Тест возвращаемых значений toggle_like"""
+    def test_toggle_like_retries_concurrent_insert(self):
+        """Тест повтора, если лайк одновременно вставил другой запрос"""
         # Arrange
         mock_db = Mock(spec=Session)
-        user_id = 1
-        review_id = 1
         
-        # Сценарий 1: Добавление лайка
-        review1 = Mock(spec=Review)
-        review1.likes = 0
-        
-        with patch.object(CRUDLike, 'get_like', return_value=None):
-            mock_db.add = Mock()
-            mock_db.commit = Mock()
-            
-            is_liked1, likes_count1 = CRUDLike.toggle_like(
-                db=mock_db,
-                user_id=user_id,
-                review_id=review_id,
-                review=review1
-            )
-            
-            assert is_liked1 is True
-            assert likes_count1 == 1
-        
-        # Сценарий 2: Удаление лайка
-        review2 = Mock(spec=Review)
-        review2.likes = 5
-        
-        mock_existing_like = Mock(spec=Like)
-        
-        with patch.object(CRUDLike, 'get_like', return_value=mock_existing_like):
-            mock_db.delete = Mock()
-            mock_db.commit = Mock()
-            
-            is_liked2, likes_count2 = CRUDLike.toggle_like(
-                db=mock_db,
-                user_id=user_id,
-                review_id=review_id,
-                review=review2
-            )
-            
-            assert is_liked2 is False
-            assert likes_count2 == 4
+        with patch('app.crud.like._toggle_stepwise', side_effect=[(0, 0, 1), (1, 0, 0)]):
+            # Act
+            result = CRUDLike.toggle_like(db=mock_db, user_id=1, review_id=1)
+        
+        # Assert
+        assert result == (False, 0)
+        mock_db.rollback.assert_called_once()
+        mock_db.commit.assert_called_once()
     
-    def test_toggle_like_immutable_review_likes(self):
-        """Тест что likes у review изменяется корректно"""
+    def test_toggle_like_retries_locked_database(self):
+        """Тест повтора при блокировке базы"""
         # Arrange
         mock_db = Mock(spec=Session)
-        user_id = 1
-        review_id = 1
+        locked = OperationalError("DELETE", {}, Exception("database is locked"))
+        
+        with patch('app.crud.like._toggle_stepwise', side_effect=[locked, (0, 1, 1)]):
+            # Act
+            result = CRUDLike.toggle_like(db=mock_db, user_id=1, review_id=1)
+        
+        # Assert
+        assert result == (True, 1)
+        mock_db.rollback.assert_called_once()
+    
+    def test_toggle_like_gives_up_after_repeated_conflicts(self):
+        """Тест ошибки 409 после исчерпания попыток"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        
+        with patch('app.crud.like._toggle_stepwise', return_value=(0, 0, 1)) as mock_toggle:
+            # Act & Assert
+            with pytest.raises(LikeConflictError):
+                CRUDLike.toggle_like(db=mock_db, user_id=1, review_id=1)
+        
+        assert mock_toggle.call_count == LIKE_TOGGLE_ATTEMPTS
+    
+    def test_toggle_like_does_not_retry_other_errors(self):
+        """Тест что прочие ошибки базы не повторяются"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        failure = OperationalError("DELETE", {}, Exception("disk I/O error"))
+        
+        with patch('app.crud.like._toggle_stepwise', side_effect=failure) as mock_toggle:
+            # Act & Assert
+            with pytest.raises(OperationalError):
+                CRUDLike.toggle_like(db=mock_db, user_id=1, review_id=1)
         
-        # Создаем реальный mock с атрибутом likes
-        review = Mock()
-        review.likes = 3
-        review.id = review_id
-        
-        # Mock: лайк уже существует
-        mock_existing_like = Mock()
-        
-        with patch.object(CRUDLike, 'get_like', return_value=mock_existing_like):
-            mock_db.delete = Mock()
-            mock_db.commit = Mock()
-            
-            # Act - удаляем лайк
-            is_liked, likes_count = CRUDLike.toggle_like(
-                db=mock_db,
-                user_id=user_id,
-                review_id=review_id,
-                review=review
-            )
-            
-            # Assert
-            assert is_liked is False
-            assert likes_count == 2
-            assert review.likes == 2  # Проверяем что изменилось с 3 на 2
+        mock_toggle.assert_called_once()
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+from sqlalchemy.orm import Session
+
+from app.crud.moderation_claim import CRUDModerationClaim
+
+
+class TestCRUDModerationClaim:
+    
+    def test_claim_without_candidates(self):
+        """Тест захвата, когда свободных рецензий нет"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+        query = mock_db.query.return_value.outerjoin.return_value.filter.return_value
+        query.order_by.return_value.limit.return_value.with_for_update.return_value.all.return_value = []
+        
+        # Act
+        result = CRUDModerationClaim.claim(
+            mock_db, moderator_id=1, limit=20, now=now, expires_at=now + timedelta(minutes=10)
+        )
+        
+        # Assert
+        assert result == []
+        mock_db.execute.assert_not_called()
+        mock_db.commit.assert_called_once()
+    
+    def test_release_all(self):
+        """Тест освобождения всех заявок модератора"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        mock_db.query.return_value.filter.return_value.delete.return_value = 3
+        
+        # Act
+        result = CRUDModerationClaim.release(mock_db, moderator_id=1)
+        
+        # Assert
+        assert result == 3
+        mock_db.commit.assert_called_once()
+    
+    def test_clear_does_not_commit(self):
+        """Тест что очистка заявок остаётся в транзакции вызывающего"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        
+        # Act
+        CRUDModerationClaim.clear(mock_db, [1, 2])
+        
+        # Assert
+        mock_db.query.return_value.filter.return_value.delete.assert_called_once_with(
+            synchronize_session=False
+        )
+        mock_db.commit.assert_not_called()
+    
+    def test_clear_without_ids(self):
+        """Тест очистки пустого списка"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        
+        # Act
+        CRUDModerationClaim.clear(mock_db, [])
+        
+        # Assert
+        mock_db.query.assert_not_called()
@@ -0,0 +1,84 @@
+from unittest.mock import Mock
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+
+from app.crud.review_counter import CRUDReviewCounter
+from app.db.models import ReviewStatus
+
+
+def upserted_rows(mock_db):
+    params = mock_db.execute.call_args[0][0].compile(dialect=sqlite.dialect()).params
+    count = len([key for key in params if key.startswith("scope_m")])
+    return [(params[f"scope_m{index}"], params[f"count_m{index}"]) for index in range(count)]
+
+
+class TestCRUDReviewCounter:
+    
+    def test_scopes(self):
+        """Тест формирования ключей счётчиков"""
+        assert CRUDReviewCounter.status_scope(ReviewStatus.APPROVED) == "status:approved"
+        assert CRUDReviewCounter.user_scope(5) == "user:5"
+        assert CRUDReviewCounter.user_scope(5, ReviewStatus.PENDING) == "user:5:status:pending"
+    
+    def test_apply_aggregates_changes_per_scope(self):
+        """Тест что изменения одного ключа схлопываются в одну строку upsert"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        
+        # Act
+        CRUDReviewCounter.apply(mock_db, [
+            (1, ReviewStatus.PENDING, -1),
+            (1, ReviewStatus.APPROVED, 1),
+        ])
+        
+        # Assert
+        # user:1 суммарно не меняется, остаются 4 ключа со статусами
+        mock_db.execute.assert_called_once()
+        assert upserted_rows(mock_db) == [
+            ("status:approved", 1),
+            ("status:pending", -1),
+            ("user:1:status:approved", 1),
+            ("user:1:status:pending", -1),
+        ]
+        mock_db.add.assert_not_called()
+    
+    def test_apply_upserts_counters_in_scope_order(self):
+        """Тест что счётчики создаются upsert-ом в порядке ключей"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        
+        # Act
+        CRUDReviewCounter.apply(mock_db, [(7, ReviewStatus.PENDING, 1), (3, ReviewStatus.PENDING, 1)])
+        
+        # Assert
+        statement = mock_db.execute.call_args[0][0]
+        assert "ON CONFLICT (scope) DO UPDATE SET count = (review_counters.count + excluded.count)" in str(
+            statement.compile(dialect=sqlite.dialect())
+        )
+        assert upserted_rows(mock_db) == [
+            ("status:pending", 2),
+            ("user:3", 1),
+            ("user:3:status:pending", 1),
+            ("user:7", 1),
+            ("user:7:status:pending", 1),
+        ]
+    
+    def test_apply_without_net_change_runs_nothing(self):
+        """Тест что взаимно погашенные изменения не пишут в базу"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        
+        # Act
+        CRUDReviewCounter.apply(mock_db, [(1, ReviewStatus.PENDING, 1), (1, ReviewStatus.PENDING, -1)])
+        
+        # Assert
+        mock_db.execute.assert_not_called()
+    
+    def test_get_missing_counter_is_zero(self):
+        """Тест что отсутствующий счётчик равен нулю"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        mock_db.query.return_value.filter.return_value.first.return_value = None
+        
+        # Act & Assert
+        assert CRUDReviewCounter.get(mock_db, "status:approved") == 0
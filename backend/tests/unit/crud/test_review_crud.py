@@ -1,6 +1,7 @@
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from sqlalchemy.orm import Session
 
+from app.core.config import CountStrategy
 from app.crud.review import CRUDReview
 from app.db.models import Review, User, ReviewStatus
 import app.schemas.review as review_schemas
@@ -161,7 +162,7 @@ class TestCRUDReview:
         """Тест успешного удаления рецензии"""
         # Arrange
         mock_db = Mock(spec=Session)
-        review = Review(id=1, title="Test Review")
+        review = Review(id=1, title="Test Review", user_id=1, status=ReviewStatus.APPROVED)
         
         mock_db.delete = Mock()
         mock_db.commit = Mock()
@@ -194,6 +195,28 @@ class TestCRUDReview:
         mock_db.commit.assert_called_once()
         mock_db.refresh.assert_called_once_with(review)
     
+    def test_change_pending_status_returns_updated_ids(self):
+        """Тест массовой смены статуса одним UPDATE ... RETURNING"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        mock_db.get_bind.return_value.dialect.name = "sqlite"
+        mock_db.execute.return_value.all.return_value = [
+            Mock(id=1, user_id=7),
+            Mock(id=3, user_id=7),
+        ]
+        
+        # Act
+        with patch("app.crud.review.CRUDReviewCounter.apply") as mock_apply:
+            result = CRUDReview.change_pending_status(mock_db, [1, 2, 3], ReviewStatus.APPROVED)
+        
+        # Assert
+        assert result == [1, 3]
+        mock_db.execute.assert_called_once()
+        mock_db.commit.assert_called_once()
+        changes = mock_apply.call_args[0][1]
+        assert changes.count((7, ReviewStatus.PENDING, -1)) == 2
+        assert changes.count((7, ReviewStatus.APPROVED, 1)) == 2
+    
     def test_get_public_reviews_no_filters(self):
         """Тест получения публичных рецензий без фильтров"""
         # Arrange
@@ -214,13 +237,15 @@ class TestCRUDReview:
         mock_query = Mock()
         mock_filter = Mock()
         mock_order_by = Mock()
+        mock_options = Mock()
         mock_offset = Mock()
         mock_limit = Mock()
         
         mock_db.query.return_value = mock_query
         mock_query.filter.return_value = mock_filter
         mock_filter.order_by.return_value = mock_order_by
-        mock_order_by.offset.return_value = mock_offset
+        mock_order_by.options.return_value = mock_options
+        mock_options.offset.return_value = mock_offset
         mock_offset.limit.return_value = mock_limit
         mock_limit.all.return_value = [mock_review]
         
@@ -242,6 +267,9 @@ class TestCRUDReview:
         # Проверяем фильтр по статусу APPROVED
         filter_call = mock_query.filter.call_args[0][0]
         assert "reviews.status" in str(filter_call)
+        
+        # Автор подгружается вместе со страницей, а не отдельным запросом на строку
+        mock_order_by.options.assert_called_once()
     
     def test_get_public_reviews_with_search(self):
         """Тест получения публичных рецензий с поиском"""
@@ -368,7 +396,7 @@ class TestCRUDReview:
         )
         
         mock_db.query.return_value.filter.return_value.count.return_value = 1
-        mock_db.query.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [mock_review]
+        mock_db.query.return_value.filter.return_value.order_by.return_value.options.return_value.offset.return_value.limit.return_value.all.return_value = [mock_review]
         
         # Act
         reviews, total = CRUDReview.get_pending_reviews(
@@ -383,3 +411,38 @@ class TestCRUDReview:
         # Проверяем фильтр по статусу PENDING
         filter_call = mock_db.query.return_value.filter.call_args[0][0]
         assert "reviews.status" in str(filter_call).lower()
+
+    def test_estimated_count_with_search_falls_back_to_cache(self):
+        """Тест: оценка через EXPLAIN не применяется к полнотекстовому поиску"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        mock_db.get_bind.return_value.dialect.name = "postgresql"
+        mock_db.query.return_value.filter.return_value.filter.return_value.count.return_value = 4
+        count_cache = Mock()
+        count_cache.get.return_value = None
+        
+        # Act
+        with patch("app.crud.review.review_count_cache", count_cache), \
+                patch.object(CRUDReview, "_estimate_count") as estimate_count:
+            total, is_exact = CRUDReview.count_public_reviews(
+                mock_db, CountStrategy.ESTIMATED, search="Alien:Romulus"
+            )
+        
+        # Assert
+        assert (total, is_exact) == (4, True)
+        estimate_count.assert_not_called()
+        count_cache.set.assert_called_once()
+
+    def test_estimated_count_without_search_uses_explain(self):
+        """Тест: без поиска количество оценивается по плану запроса"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        mock_db.get_bind.return_value.dialect.name = "postgresql"
+        
+        # Act
+        with patch.object(CRUDReview, "_estimate_count", return_value=1000) as estimate_count:
+            total, is_exact = CRUDReview.count_public_reviews(mock_db, CountStrategy.ESTIMATED)
+        
+        # Assert
+        assert (total, is_exact) == (1000, False)
+        estimate_count.assert_called_once()
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+from unittest.mock import Mock
+from sqlalchemy.orm import Session
+
+from app.crud.revoked_token import CRUDRevokedToken
+from app.db.models import RevokedToken
+
+
+class TestCRUDRevokedToken:
+    
+    def test_add(self):
+        """Тест сохранения отозванного токена"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        expires_at = datetime(2026, 10, 19, tzinfo=timezone.utc)
+        
+        # Act
+        token = CRUDRevokedToken.add(mock_db, jti="abc", user_id=1, expires_at=expires_at)
+        
+        # Assert
+        assert isinstance(token, RevokedToken)
+        assert (token.jti, token.user_id, token.expires_at) == ("abc", 1, expires_at)
+        mock_db.merge.assert_called_once_with(token)
+        mock_db.commit.assert_called_once()
+    
+    def test_get_active(self):
+        """Тест получения ещё не истёкших токенов"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        expires_at = datetime(2026, 10, 19, tzinfo=timezone.utc)
+        mock_db.query.return_value.filter.return_value.all.return_value = [("abc", expires_at)]
+        
+        # Act
+        result = CRUDRevokedToken.get_active(mock_db, datetime(2026, 10, 18, tzinfo=timezone.utc))
+        
+        # Assert
+        assert result == [("abc", expires_at)]
+    
+    def test_purge_expired(self):
+        """Тест удаления истёкших записей"""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        mock_db.query.return_value.filter.return_value.delete.return_value = 3
+        
+        # Act
+        deleted = CRUDRevokedToken.purge_expired(mock_db, datetime(2026, 10, 18, tzinfo=timezone.utc))
+        
+        # Assert
+        assert deleted == 3
+        mock_db.query.assert_called_once_with(RevokedToken)
+        mock_db.commit.assert_called_once()
@@ -0,0 +1,27 @@
+import app.db.models as models
+
+
+class TestReviewExcerpt:
+    def test_short_content_is_its_own_excerpt(self):
+
+        review = models.Review(content="Short and sweet")
+
+        assert review.excerpt == "Short and sweet"
+        assert review.content_length == 15
+
+    def test_long_content_is_cut_with_ellipsis(self):
+
+        content = "word " * 100
+        review = models.Review(content=content)
+
+        assert review.excerpt == ("word " * 60).rstrip(" ") + "…"
+        assert len(review.excerpt) <= models.REVIEW_EXCERPT_LENGTH + 1
+        assert review.content_length == 500
+
+    def test_editing_content_refreshes_excerpt(self):
+
+        review = models.Review(content="A" * 400)
+        review.content = "Rewritten"
+
+        assert review.excerpt == "Rewritten"
+        assert review.content_length == 9
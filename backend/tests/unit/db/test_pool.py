@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import exc
+
+from app.db.pool import InstrumentedQueuePool, pool_status
+
+
+def _pool(**kwargs) -> InstrumentedQueuePool:
+    return InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), **kwargs)
+
+
+class TestInstrumentedQueuePool:
+    def test_checkouts_and_overflow_are_counted(self):
+
+        pool = _pool(pool_size=1, max_overflow=1)
+
+        first = pool.connect()
+        second = pool.connect()
+        status = pool_status(pool)
+
+        assert status["checkouts"] == 2
+        assert status["overflow_events"] == 1
+        assert status["checked_out"] == 2
+        assert status["overflow"] == 1
+        first.close()
+        second.close()
+
+    def test_reused_connection_is_not_an_overflow(self):
+
+        pool = _pool(pool_size=1, max_overflow=1)
+
+        pool.connect().close()
+        pool.connect().close()
+
+        assert pool.stats.checkouts == 2
+        assert pool.stats.overflow_events == 0
+
+    def test_exhausted_pool_records_timeout_and_wait(self):
+
+        pool = _pool(pool_size=1, max_overflow=0, timeout=0.05)
+        held = pool.connect()
+
+        with pytest.raises(exc.TimeoutError):
+            pool.connect()
+
+        snapshot = pool.stats.snapshot()
+        assert snapshot["timeouts"] == 1
+        assert snapshot["wait_seconds_max"] >= 0.05
+        held.close()
+
+    def test_recreated_pool_keeps_instrumentation(self):
+
+        pool = _pool(pool_size=2, max_overflow=3)
+
+        recreated = pool.recreate()
+
+        assert isinstance(recreated, InstrumentedQueuePool)
+        assert pool_status(recreated)["size"] == 2
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db import query_tracker
+from app.db.query_tracker import fingerprint
+
+
+class TestFingerprint:
+    @pytest.mark.parametrize("statement, expected", [
+        ("SELECT *\n  FROM likes WHERE id = ?", "SELECT * FROM likes WHERE id = ?"),
+        ("SELECT * FROM t WHERE status = 'APPROVED' LIMIT 20", "SELECT * FROM t WHERE status = ? LIMIT ?"),
+        ("SELECT * FROM t WHERE id IN (?, ?, ?)", "SELECT * FROM t WHERE id IN (...)"),
+        ("SELECT * FROM t WHERE id IN ($1::INTEGER, $2::INTEGER)", "SELECT * FROM t WHERE id IN (...)"),
+        ("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s)", "SELECT * FROM t WHERE id IN (...)"),
+    ])
+    def test_normalizes_statement(self, statement, expected):
+
+        assert fingerprint(statement) == expected
+
+
+class TestTracking:
+    def test_statements_are_attributed_to_the_request(self):
+
+        engine = create_engine("sqlite://")
+        queries, token = query_tracker.start()
+        with engine.connect() as connection:
+            for value in (1, 2, 3):
+                connection.execute(text("SELECT :value"), {"value": value})
+        query_tracker.finish(token)
+
+        assert queries.count == 3
+        assert queries.seconds > 0
+        assert queries.most_repeated() == ("SELECT ?", 3)
+
+    def test_statements_outside_requests_are_ignored(self):
+
+        engine = create_engine("sqlite://")
+        queries, token = query_tracker.start()
+        query_tracker.finish(token)
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        assert queries.count == 0
+        assert query_tracker.current() is None
+
+    def test_failed_statement_does_not_skew_timing(self):
+
+        engine = create_engine("sqlite://")
+        queries, token = query_tracker.start()
+        with engine.connect() as connection:
+            with pytest.raises(Exception):
+                connection.execute(text("SELECT * FROM missing_table"))
+            connection.execute(text("SELECT 1"))
+        query_tracker.finish(token)
+
+        assert queries.count == 1
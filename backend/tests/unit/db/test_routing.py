@@ -0,0 +1,69 @@
+from unittest.mock import Mock, patch
+
+from app.db.routing import ReadYourWrites, ReplicaSet
+
+
+class TestReadYourWrites:
+    def test_marker_is_recent_for_its_user_within_window(self):
+
+        markers = ReadYourWrites("secret", window_seconds=5)
+        with patch("app.db.routing.time.time", return_value=100.0):
+            marker = markers.issue(7)
+        with patch("app.db.routing.time.time", return_value=104.0):
+            assert markers.is_recent(marker, 7)
+            assert not markers.is_recent(marker, 8)
+            assert not markers.is_recent(marker, None)
+            assert not markers.is_recent(None, 7)
+
+    def test_window_expires(self):
+
+        markers = ReadYourWrites("secret", window_seconds=5)
+        with patch("app.db.routing.time.time", return_value=100.0):
+            marker = markers.issue(7)
+        with patch("app.db.routing.time.time", return_value=105.5):
+            assert not markers.is_recent(marker, 7)
+
+    def test_marker_from_another_worker_is_accepted(self):
+
+        marker = ReadYourWrites("secret", window_seconds=5).issue(7)
+
+        assert ReadYourWrites("secret", window_seconds=5).is_recent(marker, 7)
+
+    def test_tampered_or_foreign_markers_are_rejected(self):
+
+        markers = ReadYourWrites("secret", window_seconds=5)
+        marker = markers.issue(7)
+        _, written_at, signature = marker.split(".")
+
+        assert not markers.is_recent(f"8.{written_at}.{signature}", 8)
+        assert not ReadYourWrites("other", window_seconds=5).is_recent(marker, 7)
+        assert not markers.is_recent("garbage", 7)
+        assert not markers.is_recent("7.x.y", 7)
+
+
+class TestReplicaSet:
+    def test_empty_set_is_disabled(self):
+
+        assert not ReplicaSet().enabled
+
+    @patch("app.db.routing.async_sessionmaker")
+    def test_sessions_rotate_over_replicas(self, mock_sessionmaker):
+
+        first, second = Mock(), Mock()
+        mock_sessionmaker.side_effect = [first, second]
+        replicas = ReplicaSet([Mock(), Mock()])
+
+        replicas.session()
+        replicas.session()
+        replicas.session()
+
+        assert first.call_count == 2
+        assert second.call_count == 1
+
+    def test_owns_sessions_bound_to_replica_engines(self):
+
+        replica_engine = Mock()
+        replicas = ReplicaSet([replica_engine])
+
+        assert replicas.owns(Mock(bind=replica_engine))
+        assert not replicas.owns(Mock(bind=Mock()))
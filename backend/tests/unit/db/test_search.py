@@ -0,0 +1,66 @@
+from unittest.mock import Mock
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+import app.db.models as models
+from app.db.search import (
+    ReviewSearch, PostgresFuzzyReviewSearch, PostgresReviewSearch, SQLiteReviewSearch, review_search
+)
+
+
+def _session_for(dialect_name: str) -> Mock:
+    db = Mock(spec=Session)
+    db.get_bind.return_value.dialect.name = dialect_name
+    return db
+
+
+class TestReviewSearchBackend:
+    def test_backend_is_picked_by_dialect(self):
+
+        assert isinstance(review_search(_session_for("postgresql"), "x"), PostgresReviewSearch)
+        assert isinstance(review_search(_session_for("sqlite"), "x"), SQLiteReviewSearch)
+        assert type(review_search(_session_for("mysql"), "x")) is ReviewSearch
+
+    def test_sqlite_match_expression_quotes_words(self):
+
+        expression = SQLiteReviewSearch('great "film" OR')._match_expression()
+
+        assert expression == '"great"* """film"""* "OR"*'
+
+    def test_sqlite_filter_skips_match_without_words(self):
+
+        query = Mock()
+
+        assert SQLiteReviewSearch("   ").filter(query) is query
+        query.join.assert_not_called()
+
+    def test_postgres_filter_uses_both_configurations(self):
+
+        searcher = PostgresReviewSearch("фильмы")
+        condition = searcher.search_vector.op("@@")(searcher._tsquery())
+
+        sql = str(condition.compile(dialect=postgresql.dialect()))
+
+        assert "reviews.search_vector @@" in sql
+        assert sql.count("websearch_to_tsquery(") == 2
+
+    def test_sqlite_rank_is_negated_bm25(self):
+
+        sql = str(SQLiteReviewSearch("x").rank().compile(dialect=sqlite.dialect()))
+
+        assert sql == "-bm25(reviews_fts)"
+
+    def test_postgres_fuzzy_caps_candidates_within_scope(self):
+
+        query = Session().query(models.Review).filter(models.Review.user_id == 7)
+
+        sql = str(
+            PostgresFuzzyReviewSearch("solaris").filter(query).statement
+            .compile(dialect=postgresql.dialect())
+        )
+
+        assert "reviews.id IN (SELECT" in sql
+        assert "ORDER BY greatest(word_similarity(" in sql
+        assert "LIMIT" in sql
+        # The scope filter is applied inside the candidate subquery too.
+        assert sql.count("reviews.user_id =") == 2
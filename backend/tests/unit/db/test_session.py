@@ -0,0 +1,52 @@
+from unittest.mock import patch
+
+from app.db.pool import InstrumentedQueuePool
+from app.db.session import async_database_url, engine_options
+
+
+class TestAsyncDatabaseUrl:
+    def test_postgres_uses_asyncpg(self):
+
+        url = async_database_url("postgresql://user:secret@db:5432/reviews")
+
+        assert url == "postgresql+asyncpg://user:secret@db:5432/reviews"
+
+    def test_psycopg2_driver_is_replaced(self):
+
+        url = async_database_url("postgresql+psycopg2://user:secret@db/reviews")
+
+        assert url == "postgresql+asyncpg://user:secret@db/reviews"
+
+    def test_sqlite_uses_aiosqlite(self):
+
+        assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+
+    def test_unknown_backend_is_left_as_is(self):
+
+        assert async_database_url("mysql://u:p@h/db") == "mysql://u:p@h/db"
+
+
+class TestEngineOptions:
+    def test_sqlite_keeps_default_pool(self):
+
+        assert engine_options("sqlite:///./app.db", InstrumentedQueuePool) == {}
+
+    @patch("app.db.session.settings")
+    def test_server_database_pool_comes_from_settings(self, mock_settings):
+
+        mock_settings.DB_POOL_SIZE = 8
+        mock_settings.DB_MAX_OVERFLOW = 2
+        mock_settings.DB_POOL_TIMEOUT_SECONDS = 5
+        mock_settings.DB_POOL_RECYCLE_SECONDS = 600
+        mock_settings.DB_POOL_PRE_PING = True
+
+        options = engine_options("postgresql://u:p@db/reviews", InstrumentedQueuePool)
+
+        assert options == {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": 8,
+            "max_overflow": 2,
+            "pool_timeout": 5,
+            "pool_recycle": 600,
+            "pool_pre_ping": True,
+        }
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from jose import JWTError
 
 from app.dependencies import (
@@ -11,10 +11,19 @@ from app.db import models
 from app.exceptions import AuthenticationError, UserNotFoundError, PermissionDeniedError
 
 
+@pytest.fixture(autouse=True)
+def mock_token_denylist():
+    with patch('app.dependencies.token_denylist') as denylist:
+        denylist.is_stale.return_value = False
+        denylist.is_revoked.return_value = False
+        yield denylist
+
+
 class TestGetCurrentUser:
     
+    @pytest.mark.asyncio
     @patch('app.dependencies.verify_token')
-    def test_valid_user(self, mock_verify_token):
+    async def test_valid_user(self, mock_verify_token):
 
         mock_credentials = Mock()
         mock_credentials.credentials = "valid_token"
@@ -22,20 +31,17 @@ class TestGetCurrentUser:
         mock_user = Mock()
         mock_user.id = 123
         mock_verify_token.return_value = {"sub": "123"}
-        query_mock = Mock()
-        filter_mock = Mock()
-        mock_db.query.return_value = query_mock
-        query_mock.filter.return_value = filter_mock
-        filter_mock.first.return_value = mock_user
+        mock_db.get = AsyncMock(return_value=mock_user)
 
-        result = get_current_user(mock_credentials, mock_db)
+        result = await get_current_user(mock_credentials, mock_db)
         
         assert result == mock_user
-        mock_db.query.assert_called_with(models.User)
+        mock_db.get.assert_awaited_with(models.User, 123)
         mock_verify_token.assert_called_with("valid_token")
     
+    @pytest.mark.asyncio
     @patch('app.dependencies.verify_token')
-    def test_invalid_token_none_payload(self, mock_verify_token):
+    async def test_invalid_token_none_payload(self, mock_verify_token):
 
         mock_credentials = Mock()
         mock_credentials.credentials = "invalid_token"
@@ -43,10 +49,11 @@ class TestGetCurrentUser:
         mock_verify_token.return_value = None
         
         with pytest.raises(AuthenticationError) as exc_info:
-            get_current_user(mock_credentials, mock_db)
+            await get_current_user(mock_credentials, mock_db)
     
+    @pytest.mark.asyncio
     @patch('app.dependencies.verify_token')
-    def test_token_with_non_numeric_sub(self, mock_verify_token):
+    async def test_token_with_non_numeric_sub(self, mock_verify_token):
 
         mock_credentials = Mock()
         mock_credentials.credentials = "token_with_string_sub"
@@ -54,10 +61,11 @@ class TestGetCurrentUser:
         mock_verify_token.return_value = {"sub": "not_a_number"}
         
         with pytest.raises(AuthenticationError):
-            get_current_user(mock_credentials, mock_db)
+            await get_current_user(mock_credentials, mock_db)
 
+    @pytest.mark.asyncio
     @patch('app.dependencies.verify_token')
-    def test_invalid_token_jwt_error(self, mock_verify_token):
+    async def test_invalid_token_jwt_error(self, mock_verify_token):
 
         mock_credentials = Mock()
         mock_credentials.credentials = "invalid_token"
@@ -65,10 +73,11 @@ class TestGetCurrentUser:
         mock_verify_token.side_effect = JWTError("Invalid token")
         
         with pytest.raises(AuthenticationError) as exc_info:
-            get_current_user(mock_credentials, mock_db)
+            await get_current_user(mock_credentials, mock_db)
     
+    @pytest.mark.asyncio
     @patch('app.dependencies.verify_token')
-    def test_token_without_sub(self, mock_verify_token):
+    async def test_token_without_sub(self, mock_verify_token):
 
         mock_credentials = Mock()
         mock_credentials.credentials = "token_without_sub"
@@ -76,23 +85,107 @@ class TestGetCurrentUser:
         mock_verify_token.return_value = {"other_field": "value"}
         
         with pytest.raises(AuthenticationError):
-            get_current_user(mock_credentials, mock_db)
+            await get_current_user(mock_credentials, mock_db)
     
+    @pytest.mark.asyncio
     @patch('app.dependencies.verify_token')
-    def test_user_not_found(self, mock_verify_token):
+    async def test_user_not_found(self, mock_verify_token):
 
         mock_credentials = Mock()
         mock_credentials.credentials = "valid_token"
         mock_db = Mock()
         mock_verify_token.return_value = {"sub": "123"}
-        query_mock = Mock()
-        filter_mock = Mock()
-        mock_db.query.return_value = query_mock
-        query_mock.filter.return_value = filter_mock
-        filter_mock.first.return_value = None
+        mock_db.get = AsyncMock(return_value=None)
         
         with pytest.raises(UserNotFoundError):
-            get_current_user(mock_credentials, mock_db)
+            await get_current_user(mock_credentials, mock_db)
+
+    @pytest.mark.asyncio
+    @patch('app.dependencies.read_replicas')
+    @patch('app.dependencies.verify_token')
+    async def test_replica_miss_falls_back_to_primary(self, mock_verify_token, mock_replicas):
+
+        mock_credentials = Mock()
+        mock_credentials.credentials = "valid_token"
+        mock_verify_token.return_value = {"sub": "123"}
+        mock_user = Mock()
+        replica_db = Mock()
+        replica_db.get = AsyncMock(return_value=None)
+        primary_db = Mock()
+        primary_db.get = AsyncMock(return_value=mock_user)
+        mock_replicas.owns.return_value = True
+
+        result = await get_current_user(mock_credentials, replica_db, primary_db)
+
+        assert result == mock_user
+        primary_db.get.assert_awaited_with(models.User, 123)
+
+
+class TestTokenClaims:
+
+    @pytest.mark.asyncio
+    @patch('app.dependencies.verify_token')
+    async def test_revoked_token_is_rejected(self, mock_verify_token, mock_token_denylist):
+
+        mock_credentials = Mock()
+        mock_credentials.credentials = "revoked_token"
+        mock_db = Mock()
+        mock_db.get = AsyncMock()
+        mock_verify_token.return_value = {"sub": "123", "jti": "abc"}
+        mock_token_denylist.is_revoked.return_value = True
+
+        with pytest.raises(AuthenticationError):
+            await get_current_user(mock_credentials, mock_db)
+
+        mock_token_denylist.is_revoked.assert_called_with("abc")
+        mock_db.get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @patch('app.dependencies.verify_token')
+    async def test_stale_denylist_is_reloaded(self, mock_verify_token, mock_token_denylist):
+
+        mock_credentials = Mock()
+        mock_credentials.credentials = "valid_token"
+        mock_db = Mock()
+        mock_db.run_sync = AsyncMock(return_value=[("abc", Mock())])
+        mock_db.get = AsyncMock(return_value=Mock())
+        mock_verify_token.return_value = {"sub": "123", "jti": "def"}
+        mock_token_denylist.is_stale.return_value = True
+
+        await get_current_user(mock_credentials, mock_db)
+
+        mock_db.run_sync.assert_awaited_once()
+        mock_token_denylist.load.assert_called_once_with([("abc", mock_db.run_sync.return_value[0][1])])
+
+    @pytest.mark.asyncio
+    @patch('app.dependencies.settings')
+    @patch('app.dependencies.verify_token')
+    async def test_claims_mode_builds_principal_without_query(self, mock_verify_token, mock_settings):
+
+        mock_credentials = Mock()
+        mock_credentials.credentials = "claims_token"
+        mock_db = Mock()
+        mock_db.get = AsyncMock()
+        mock_settings.JWT_CLAIMS_AUTH = True
+        mock_verify_token.return_value = {"sub": "7", "username": "critic", "role": "admin"}
+
+        result = await get_current_user(mock_credentials, mock_db)
+
+        assert (result.id, result.username, result.role) == (7, "critic", models.Role.ADMIN)
+        mock_db.get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @patch('app.dependencies.settings')
+    @patch('app.dependencies.verify_token')
+    async def test_claims_mode_rejects_unknown_role(self, mock_verify_token, mock_settings):
+
+        mock_credentials = Mock()
+        mock_credentials.credentials = "claims_token"
+        mock_settings.JWT_CLAIMS_AUTH = True
+        mock_verify_token.return_value = {"sub": "7", "username": "critic", "role": "owner"}
+
+        with pytest.raises(AuthenticationError):
+            await get_current_user(mock_credentials, Mock())
 
 
 class TestGetCurrentAdmin:
@@ -116,54 +209,52 @@ class TestGetCurrentAdmin:
 
 class TestGetCurrentUserOptional:
     
-    def test_no_authorization_header(self):
+    @pytest.mark.asyncio
+    async def test_no_authorization_header(self):
 
         mock_db = Mock()
         
-        result = get_current_user_optional(None, mock_db)
+        result = await get_current_user_optional(None, mock_db)
         
         assert result is None
     
-    def test_empty_authorization_header(self):
+    @pytest.mark.asyncio
+    async def test_empty_authorization_header(self):
 
         mock_db = Mock()
         
-        result = get_current_user_optional("", mock_db)
+        result = await get_current_user_optional("", mock_db)
         
         assert result is None
     
-    def test_invalid_authorization_format_no_bearer(self):
+    @pytest.mark.asyncio
+    async def test_invalid_authorization_format_no_bearer(self):
 
         mock_db = Mock()
         
-        result = get_current_user_optional("Token abc123", mock_db)
+        result = await get_current_user_optional("Token abc123", mock_db)
         
         assert result is None
     
-    def test_invalid_authorization_format_empty_token(self):
+    @pytest.mark.asyncio
+    async def test_invalid_authorization_format_empty_token(self):
 
         mock_db = Mock()
         
-        result = get_current_user_optional("Bearer ", mock_db)
+        result = await get_current_user_optional("Bearer ", mock_db)
         
         assert result is None
     
+    @pytest.mark.asyncio
     @patch('app.dependencies.verify_token')
-    @patch('app.dependencies.get_current_user')
-    def test_valid_token_user_exists(self, mock_get_current_user, mock_verify_token):
+    @patch('app.dependencies.get_current_user', new_callable=AsyncMock)
+    async def test_valid_token_user_exists(self, mock_get_current_user, mock_verify_token):
         
         mock_db = Mock()
         mock_user = Mock()
         mock_verify_token.return_value = {"sub": "123"}
         mock_get_current_user.return_value = mock_user
         
-        with patch('app.db.session') as mock_db_internal:
-            query_mock = Mock()
-            filter_mock = Mock()
-            
-            mock_db_internal.query.return_value = query_mock
-            query_mock.filter.return_value = filter_mock
-            filter_mock.first.return_value = mock_user
-        
-        result = get_current_user_optional("Bearer valid_token", mock_db)
+        result = await get_current_user_optional("Bearer valid_token", mock_db)
         assert result == mock_user
+        mock_get_current_user.assert_awaited_once()
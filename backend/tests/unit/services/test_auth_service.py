@@ -0,0 +1,94 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.db.models import User
+from app.exceptions import AuthenticationError, ServiceUnavailableError, UserAlreadyExistsError
+from app.schemas.user import Token, UserCreate
+from app.services.auth_service import AuthService
+from app.services.user_service import UserService
+
+
+class TestAuthService:
+    def setup_method(self):
+        self.users = Mock()
+        self.users.call = AsyncMock()
+        self.users.release = AsyncMock()
+        self.hasher = Mock()
+        self.hasher.hash = AsyncMock(return_value="hashed_password")
+        self.hasher.verify = AsyncMock(return_value=True)
+        self.service = AuthService(self.users, self.hasher)
+
+    @pytest.mark.asyncio
+    async def test_register_hashes_before_creating_user(self):
+
+        user_data = UserCreate(username="newuser", password="password123")
+        token = Token(access_token="test_token", token_type="bearer")
+        self.users.call.side_effect = [None, token]
+
+        result = await self.service.register_user(user_data)
+
+        assert result is token
+        self.hasher.hash.assert_awaited_once_with("password123")
+        assert self.users.call.await_args_list[0].args == (
+            UserService.ensure_username_available, "newuser"
+        )
+        assert self.users.call.await_args_list[1].args == (
+            UserService.register_user, user_data, "hashed_password"
+        )
+
+    @pytest.mark.asyncio
+    async def test_register_skips_hashing_for_taken_username(self):
+
+        self.users.call.side_effect = UserAlreadyExistsError()
+
+        with pytest.raises(UserAlreadyExistsError):
+            await self.service.register_user(UserCreate(username="taken", password="password123"))
+
+        self.hasher.hash.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_login_success(self):
+
+        user = User(id=1, username="testuser", password_hash="hashed_password")
+        token = Token(access_token="test_token", token_type="bearer")
+        self.users.call.side_effect = [user, token]
+
+        result = await self.service.login_user(UserCreate(username="testuser", password="password123"))
+
+        assert result is token
+        self.hasher.verify.assert_awaited_once_with("password123", "hashed_password")
+        assert self.users.call.await_args_list[1].args == (UserService.issue_token, user)
+
+    @pytest.mark.asyncio
+    async def test_login_invalid_password(self):
+
+        user = User(id=1, username="testuser", password_hash="hashed_password")
+        self.users.call.side_effect = [user]
+        self.hasher.verify.return_value = False
+
+        with pytest.raises(AuthenticationError):
+            await self.service.login_user(UserCreate(username="testuser", password="wrongpassword"))
+
+    @pytest.mark.asyncio
+    async def test_login_propagates_saturated_hasher(self):
+
+        user = User(id=1, username="testuser", password_hash="hashed_password")
+        self.users.call.side_effect = [user]
+        self.hasher.verify.side_effect = ServiceUnavailableError()
+
+        with pytest.raises(ServiceUnavailableError):
+            await self.service.login_user(UserCreate(username="testuser", password="password123"))
+
+    @pytest.mark.asyncio
+    async def test_connection_is_released_before_hashing(self):
+
+        user = User(id=1, username="testuser", password_hash="hashed_password")
+        token = Token(access_token="t", token_type="bearer")
+        self.users.call.side_effect = [user, token, None, token]
+        self.hasher.verify.side_effect = lambda *args: self.users.release.await_count == 1
+        self.hasher.hash.side_effect = lambda *args: f"hashed after {self.users.release.await_count} releases"
+
+        await self.service.login_user(UserCreate(username="testuser", password="password123"))
+        await self.service.register_user(UserCreate(username="newuser", password="password123"))
+
+        assert self.users.call.await_args_list[3].args[2] == "hashed after 2 releases"
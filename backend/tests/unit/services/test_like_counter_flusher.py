@@ -0,0 +1,85 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.like_counter_flusher import LikeCounterFlusher
+
+
+def _session_factory(batches):
+    db = MagicMock()
+    db.run_sync = AsyncMock(side_effect=batches)
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=db)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory, db
+
+
+class TestLikeCounterFlusher:
+    @pytest.mark.asyncio
+    async def test_flush_drains_full_batches(self):
+
+        factory, db = _session_factory([100, 100, 7])
+        flusher = LikeCounterFlusher(factory, interval_seconds=1, batch_size=100)
+
+        flusher.feed_cache = MagicMock()
+
+        flushed = await flusher.flush()
+
+        assert flushed == 207
+        assert db.run_sync.await_count == 3
+        flusher.feed_cache.bump.assert_called_once_with()
+
+    @pytest.mark.asyncio
+    async def test_empty_flush_keeps_the_feed_cache(self):
+
+        factory, db = _session_factory([0])
+        flusher = LikeCounterFlusher(factory, interval_seconds=1, batch_size=100)
+        flusher.feed_cache = MagicMock()
+
+        assert await flusher.flush() == 0
+        flusher.feed_cache.bump.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_remaining_deltas(self):
+
+        factory, db = _session_factory([3])
+        flusher = LikeCounterFlusher(factory, interval_seconds=3600, batch_size=100)
+
+        flusher.start()
+        await asyncio.sleep(0)
+        await flusher.stop()
+
+        db.run_sync.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_the_loop_running(self):
+
+        recovered = asyncio.Event()
+        outcomes = iter([RuntimeError("database is down"), 0])
+
+        def next_outcome(*args):
+            outcome = next(outcomes, 0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            recovered.set()
+            return outcome
+
+        factory, db = _session_factory(next_outcome)
+        flusher = LikeCounterFlusher(factory, interval_seconds=0, batch_size=100)
+
+        flusher.start()
+        await asyncio.wait_for(recovered.wait(), timeout=1)
+        await flusher.stop()
+
+        assert db.run_sync.await_count >= 3
+
+    @pytest.mark.asyncio
+    async def test_stop_without_start_does_nothing(self):
+
+        factory, db = _session_factory([])
+        flusher = LikeCounterFlusher(factory, interval_seconds=1, batch_size=100)
+
+        await flusher.stop()
+
+        db.run_sync.assert_not_awaited()
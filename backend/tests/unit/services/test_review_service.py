@@ -4,12 +4,15 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 import app.db.models as models
 import app.schemas.review as review_schemas
+from app.core.config import settings, LikeCounterMode
 from app.services.review_service import ReviewService
 from app.exceptions import (
+    InvalidFieldsError,
     ReviewNotFoundError,
     PermissionDeniedError,
     InvalidReviewStateError
 )
+from app.utils.pagination import encode_cursor
 from math import ceil
 
 @pytest.fixture
@@ -30,6 +33,11 @@ def mock_like_crud(review_service):
     review_service.like_crud = Mock()
     return review_service.like_crud
 
+@pytest.fixture
+def mock_feed_cache(review_service):
+    review_service.feed_cache = Mock()
+    return review_service.feed_cache
+
 @pytest.fixture
 def sample_user():
     return models.User(
@@ -97,11 +105,63 @@ class TestGetPublicReviews:
         
         assert result.reviews[0].is_liked is None
     
+    def test_get_public_reviews_resolves_likes_with_single_lookup(
+        self, review_service, mock_review_crud, mock_like_crud, sample_user
+    ):
+        pagination = review_schemas.PublicPaginationParams(page=1, limit=10)
+        reviews = [
+            models.Review(
+                id=review_id,
+                title="Test Review",
+                movie_title="Test Movie",
+                content="Test content " * 10,
+                status=models.ReviewStatus.APPROVED,
+                likes=0,
+                user_id=1,
+                created_at=datetime.now(),
+                author=sample_user
+            )
+            for review_id in (1, 2, 3)
+        ]
+        mock_review_crud.get_public_reviews.return_value = (reviews, 3)
+        mock_like_crud.get_liked_review_ids.return_value = {2}
+        
+        result = review_service.get_public_reviews(pagination, sample_user)
+        
+        assert [item.is_liked for item in result.reviews] == [False, True, False]
+        mock_like_crud.get_liked_review_ids.assert_called_once_with(
+            review_service.db, sample_user.id, [1, 2, 3]
+        )
+        mock_like_crud.get_like.assert_not_called()
+
+
+    def test_sparse_fields_skip_like_lookup(
+        self, review_service, mock_review_crud, mock_like_crud, sample_review, sample_user
+    ):
+        pagination = review_schemas.PublicPaginationParams(fields="title, created_at")
+        mock_review_crud.get_public_reviews.return_value = ([sample_review], 1)
+        
+        result = review_service.get_public_reviews(pagination, sample_user)
+        
+        assert result.reviews[0].model_fields_set == {"id", "title", "created_at"}
+        assert mock_review_crud.get_public_reviews.call_args.kwargs["fields"] == {
+            "id", "title", "created_at"
+        }
+        mock_like_crud.get_liked_review_ids.assert_not_called()
+    
+    def test_unknown_field_raises_invalid_fields(self, review_service, mock_review_crud):
+        pagination = review_schemas.PublicPaginationParams(fields="title,password_hash")
+        
+        with pytest.raises(InvalidFieldsError):
+            review_service.get_public_reviews(pagination, None)
+        
+        mock_review_crud.get_public_reviews.assert_not_called()
+
 
 class TestGetMyReviews:
     
     def test_get_my_reviews_success(
-        self, review_service, mock_review_crud, sample_user, sample_review
+        self, review_service, mock_review_crud, mock_like_crud, sample_user, sample_review
     ):
         pagination = review_schemas.PaginationParams(
             page=1,
@@ -111,12 +171,16 @@ class TestGetMyReviews:
             search=None
         )
         mock_review_crud.get_user_reviews.return_value = ([sample_review] * 5, 5)
-        review_service._is_review_liked_by_user = Mock(return_value=True)
+        mock_like_crud.get_liked_review_ids.return_value = {sample_review.id}
         
         result = review_service.get_my_reviews(pagination, sample_user)
         
         assert len(result.reviews) == 5
         assert result.pagination.total_items == 5
+        assert all(item.is_liked is True for item in result.reviews)
+        mock_like_crud.get_liked_review_ids.assert_called_once_with(
+            review_service.db, sample_user.id, [sample_review.id] * 5
+        )
 
 
 class TestGetModerationReviews:
@@ -144,9 +208,62 @@ class TestGetModerationReviews:
         mock_review_crud.get_pending_reviews.assert_called_once_with(
             db=review_service.db,
             skip=0,
-            limit=10
+            limit=11,
+            after=None,
+            content_mode=review_schemas.ContentMode.FULL,
+            fields=None,
+            with_total=True
         )
     
+    def test_get_moderation_reviews_with_cursor_skips_offset(
+        self, review_service, mock_review_crud, sample_pending_review
+    ):
+        created_at = datetime(2026, 1, 1, 12, 0, 0)
+        cursor = encode_cursor("created_at", "desc", (created_at, 7))
+        pagination = review_schemas.PublicPaginationParams(page=5, limit=1, cursor=cursor)
+        next_review = models.Review(
+            id=1,
+            title="Older Review",
+            movie_title="Test Movie",
+            content="Pending content " * 10,
+            status=models.ReviewStatus.PENDING,
+            likes=0,
+            user_id=1,
+            created_at=datetime(2025, 1, 1)
+        )
+        
+        mock_review_crud.get_pending_reviews.return_value = ([sample_pending_review, next_review], 3)
+        
+        result = review_service.get_moderation_reviews(pagination)
+        
+        mock_review_crud.get_pending_reviews.assert_called_once_with(
+            db=review_service.db,
+            skip=0,
+            limit=2,
+            after=(created_at, 7),
+            content_mode=review_schemas.ContentMode.FULL,
+            fields=None,
+            with_total=True
+        )
+        assert result.cursor.has_more is True
+        assert result.cursor.next_cursor == encode_cursor(
+            "created_at", "desc", (sample_pending_review.created_at, sample_pending_review.id)
+        )
+        assert [review.id for review in result.reviews] == [sample_pending_review.id]
+    
+    def test_get_moderation_reviews_full_last_page_has_no_more(
+        self, review_service, mock_review_crud, sample_pending_review
+    ):
+        pagination = review_schemas.PublicPaginationParams(page=1, limit=1)
+        
+        mock_review_crud.get_pending_reviews.return_value = ([sample_pending_review], 1)
+        
+        result = review_service.get_moderation_reviews(pagination)
+        
+        assert len(result.reviews) == 1
+        assert result.cursor.has_more is False
+        assert result.cursor.next_cursor is None
+    
     def test_get_moderation_reviews_empty(
         self, review_service, mock_review_crud
     ):
@@ -188,6 +305,19 @@ class TestGetReviewDetail:
         assert result.status == models.ReviewStatus.APPROVED
         assert result.is_liked is None
     
+    def test_get_review_detail_sparse_fields(
+        self, review_service, mock_review_crud, mock_like_crud, sample_review, sample_user
+    ):
+        mock_review_crud.get_with_author.return_value = sample_review
+        
+        result = review_service.get_review_detail(1, sample_user, "likes")
+        
+        assert result.model_fields_set == {"id", "likes"}
+        mock_review_crud.get_with_author.assert_called_once_with(
+            review_service.db, 1, frozenset({"id", "likes"})
+        )
+        mock_like_crud.get_like.assert_not_called()
+    
     def test_get_review_detail_pending_for_author(
         self, review_service, mock_review_crud, sample_pending_review, sample_user
     ):
@@ -286,6 +416,41 @@ class TestGetReviewDetail:
                 review_service.get_review_detail(1, user)
 
 
+class TestReviewEtag:
+    
+    def test_etag_follows_version_and_viewer(
+        self, review_service, mock_review_crud, sample_user, sample_admin
+    ):
+        mock_review_crud.get_version.return_value = Mock(
+            version=3, status=models.ReviewStatus.APPROVED, user_id=1, pending_likes_marker=0
+        )
+        
+        etag = review_service.get_review_etag(1, sample_user)
+        
+        assert review_service.get_review_etag(1, sample_user) == etag
+        assert review_service.get_review_etag(1, sample_admin) != etag
+        assert review_service.get_review_etag(1, sample_user, "title") != etag
+        mock_review_crud.get_version.return_value.version = 4
+        assert review_service.get_review_etag(1, sample_user) != etag
+    
+    def test_hidden_review_raises_not_found(
+        self, review_service, mock_review_crud, sample_admin
+    ):
+        mock_review_crud.get_version.return_value = Mock(
+            version=1, status=models.ReviewStatus.PENDING, user_id=1, pending_likes_marker=0
+        )
+        
+        with pytest.raises(ReviewNotFoundError):
+            review_service.get_review_etag(1, None)
+        assert review_service.get_review_etag(1, sample_admin)
+    
+    def test_missing_review_raises_not_found(self, review_service, mock_review_crud):
+        mock_review_crud.get_version.return_value = None
+        
+        with pytest.raises(ReviewNotFoundError):
+            review_service.get_review_etag(1, None)
+
+
 class TestCreateReview:
     
     def test_create_review_success(
@@ -404,6 +569,91 @@ class TestModerateReview:
                 review_service.reject_review(1)
             mock_review_crud.change_status.assert_not_called()
 
+class TestBulkModeration:
+    
+    def test_reports_outcome_per_id(
+        self, review_service, mock_review_crud, mock_feed_cache
+    ):
+        mock_review_crud.change_pending_status.return_value = [1, 3]
+        mock_review_crud.get_existing_ids.return_value = {1, 2, 3}
+        request = review_schemas.BulkModerationRequest(
+            review_ids=[1, 2, 3, 4, 1],
+            action=review_schemas.ModerationAction.APPROVE
+        )
+        
+        result = review_service.bulk_moderate(request)
+        
+        assert result.applied == 2
+        assert [(item.id, item.outcome) for item in result.results] == [
+            (1, review_schemas.ModerationOutcome.APPLIED),
+            (2, review_schemas.ModerationOutcome.ALREADY_PROCESSED),
+            (3, review_schemas.ModerationOutcome.APPLIED),
+            (4, review_schemas.ModerationOutcome.NOT_FOUND),
+        ]
+        mock_review_crud.change_pending_status.assert_called_once_with(
+            review_service.db, [1, 2, 3, 4], models.ReviewStatus.APPROVED
+        )
+        mock_feed_cache.bump.assert_called_once()
+    
+    def test_skips_existence_check_when_all_applied(
+        self, review_service, mock_review_crud, mock_feed_cache
+    ):
+        mock_review_crud.change_pending_status.return_value = [5, 6]
+        request = review_schemas.BulkModerationRequest(
+            review_ids=[5, 6],
+            action=review_schemas.ModerationAction.REJECT
+        )
+        
+        result = review_service.bulk_moderate(request)
+        
+        assert result.applied == 2
+        mock_review_crud.get_existing_ids.assert_not_called()
+        assert mock_review_crud.change_pending_status.call_args[0][2] == models.ReviewStatus.REJECTED
+    
+    def test_nothing_applied_keeps_feed_cache(
+        self, review_service, mock_review_crud, mock_feed_cache
+    ):
+        mock_review_crud.change_pending_status.return_value = []
+        mock_review_crud.get_existing_ids.return_value = set()
+        request = review_schemas.BulkModerationRequest(
+            review_ids=[9],
+            action=review_schemas.ModerationAction.APPROVE
+        )
+        
+        result = review_service.bulk_moderate(request)
+        
+        assert result.applied == 0
+        mock_feed_cache.bump.assert_not_called()
+
+
+class TestModerationClaims:
+    
+    def test_claim_returns_leased_reviews(
+        self, review_service, mock_review_crud, sample_pending_review, sample_user
+    ):
+        review_service.claim_crud = Mock()
+        review_service.claim_crud.claim.return_value = [sample_pending_review.id]
+        mock_review_crud.get_many_with_author.return_value = [sample_pending_review]
+        
+        result = review_service.claim_moderation_reviews(sample_user, 10)
+        
+        claim_kwargs = review_service.claim_crud.claim.call_args.kwargs
+        assert claim_kwargs["moderator_id"] == sample_user.id
+        assert claim_kwargs["limit"] == 10
+        assert result.lease_expires_at == claim_kwargs["expires_at"]
+        assert (result.lease_expires_at - claim_kwargs["now"]).total_seconds() == \
+            settings.MODERATION_CLAIM_LEASE_SECONDS
+        assert [review.id for review in result.reviews] == [sample_pending_review.id]
+        assert result.reviews[0].is_liked is None
+    
+    def test_release_claims(self, review_service, sample_user):
+        review_service.claim_crud = Mock()
+        
+        review_service.release_moderation_claims(sample_user)
+        
+        review_service.claim_crud.release.assert_called_once_with(review_service.db, sample_user.id)
+
+
 class TestDeleteReview:
     
     def test_delete_own_review_success(
@@ -462,6 +712,7 @@ class TestEditReview:
             title="Updated Title",
             movie_title="Updated Movie",
             content="Updated content " * 10,
+            content_length=160,
             status=models.ReviewStatus.PENDING,
             likes=5,
             author=review_schemas.AuthorInfo(id=1, username="testuser"),
@@ -517,12 +768,42 @@ class TestEditReview:
             review_service.edit_review(999, review_data, sample_user)
 
 
+class TestBufferedLikeCounters:
+    
+    @pytest.fixture(autouse=True)
+    def buffered_mode(self, monkeypatch):
+        monkeypatch.setattr(settings, "LIKE_COUNTER_MODE", LikeCounterMode.BUFFERED)
+    
+    def test_toggle_like_records_delta(
+        self, review_service, mock_like_crud, sample_user
+    ):
+        mock_like_crud.toggle_like.return_value = (True, 6)
+        
+        review_service.toggle_like(1, sample_user)
+        
+        assert mock_like_crud.toggle_like.call_args.kwargs["buffered"] is True
+    
+    def test_review_detail_includes_pending_likes(
+        self, review_service, mock_review_crud, sample_review, sample_user
+    ):
+        mock_review_crud.get_with_author.return_value = sample_review
+        review_service._is_review_liked_by_user = Mock(return_value=False)
+        review_service.like_delta_crud = Mock()
+        review_service.like_delta_crud.get_likes.return_value = {sample_review.id: sample_review.likes + 3}
+        
+        result = review_service.get_review_detail(sample_review.id, sample_user)
+        
+        assert result.likes == sample_review.likes + 3
+        review_service.like_delta_crud.get_likes.assert_called_once_with(
+            review_service.db, [sample_review.id]
+        )
+
+
 class TestToggleLike:
     
     def test_toggle_like_on_approved_review(
         self, review_service, mock_review_crud, mock_like_crud, sample_review, sample_user
     ):
-        mock_review_crud.get.return_value = sample_review
         mock_like_crud.toggle_like.return_value = (True, 6)  # is_liked, likes_count
         
         result = review_service.toggle_like(1, sample_user)
@@ -534,13 +815,13 @@ class TestToggleLike:
             db=review_service.db,
             user_id=1,
             review_id=1,
-            review=sample_review
+            buffered=False
         )
+        mock_review_crud.get.assert_not_called()
     
     def test_toggle_like_off_approved_review(
         self, review_service, mock_review_crud, mock_like_crud, sample_review, sample_user
     ):
-        mock_review_crud.get.return_value = sample_review
         mock_like_crud.toggle_like.return_value = (False, 4)
         
         result = review_service.toggle_like(1, sample_user)
@@ -549,8 +830,9 @@ class TestToggleLike:
         assert result.likes == 4
     
     def test_toggle_like_on_pending_review_raises_error(
-        self, review_service, mock_review_crud, sample_pending_review, sample_user
+        self, review_service, mock_review_crud, mock_like_crud, sample_pending_review, sample_user
     ):
+        mock_like_crud.toggle_like.return_value = None
         mock_review_crud.get.return_value = sample_pending_review
         
         with pytest.raises(InvalidReviewStateError) as exc_info:
@@ -559,8 +841,9 @@ class TestToggleLike:
         assert "only like approved reviews" in str(exc_info.value)
     
     def test_toggle_like_on_rejected_review_raises_error(
-        self, review_service, mock_review_crud, sample_user
+        self, review_service, mock_review_crud, mock_like_crud, sample_user
     ):
+        mock_like_crud.toggle_like.return_value = None
         rejected_review = models.Review(
             id=3,
             title="Rejected",
@@ -578,8 +861,9 @@ class TestToggleLike:
             review_service.toggle_like(3, sample_user)
     
     def test_toggle_like_nonexistent_review(
-        self, review_service, mock_review_crud, sample_user
+        self, review_service, mock_review_crud, mock_like_crud, sample_user
     ):
+        mock_like_crud.toggle_like.return_value = None
         mock_review_crud.get.return_value = None
         
         with pytest.raises(ReviewNotFoundError):
@@ -612,6 +896,7 @@ class TestToggleLike:
             result = review_service.toggle_like(1, sample_user)
             assert result.is_liked is True
         else:
+            mock_like_crud.toggle_like.return_value = None
             with pytest.raises(InvalidReviewStateError):
                 review_service.toggle_like(1, sample_user)
 
@@ -619,11 +904,9 @@ class TestToggleLike:
 class TestPrivateMethods:
     
     def test_build_review_response_with_user(
-        self, review_service, sample_review, sample_user
+        self, review_service, sample_review
     ):
-        review_service._is_review_liked_by_user = Mock(return_value=True)
-        
-        result = review_service._build_review_response(sample_review, sample_user)
+        result = review_service._build_review_response(sample_review, {sample_review.id}, {})
         
         assert result.id == 1
         assert result.title == "Test Review"
@@ -631,15 +914,29 @@ class TestPrivateMethods:
         assert result.author.username == "testuser"
         assert result.is_liked is True
     
+    def test_build_review_response_excerpt(self, review_service, sample_review):
+        sample_review.content = "Long content " * 40
+        
+        result = review_service._build_review_response(sample_review, None, {}, excerpt=True)
+        
+        assert result.content == sample_review.excerpt
+        assert result.content_length == len("Long content " * 40)
+    
     def test_build_review_response_without_user(
         self, review_service, sample_review
     ):
-        review_service._is_review_liked_by_user = Mock(return_value=None)
-        
-        result = review_service._build_review_response(sample_review, None)
+        result = review_service._build_review_response(sample_review, None, {})
         
         assert result.is_liked is None
     
+    def test_get_liked_review_ids_without_user(
+        self, review_service, mock_like_crud, sample_review
+    ):
+        result = review_service._get_liked_review_ids([sample_review], None)
+        
+        assert result is None
+        mock_like_crud.get_liked_review_ids.assert_not_called()
+    
     def test_is_review_liked_by_user_with_user_id(
         self, review_service, mock_like_crud
     ):
@@ -688,3 +985,43 @@ class TestPrivateMethods:
         assert result.total_items == total
         assert result.total_pages == expected_pages
 
+
+class TestFeedCacheInvalidation:
+    def test_approve_bumps_feed_version(
+        self, review_service, mock_review_crud, mock_feed_cache, sample_pending_review
+    ):
+        mock_review_crud.get.return_value = sample_pending_review
+
+        review_service.approve_review(2)
+
+        mock_feed_cache.bump.assert_called_once()
+
+    def test_rejected_transition_does_not_bump(
+        self, review_service, mock_review_crud, mock_feed_cache, sample_review
+    ):
+        mock_review_crud.get.return_value = sample_review
+
+        with pytest.raises(InvalidReviewStateError):
+            review_service.reject_review(1)
+
+        mock_feed_cache.bump.assert_not_called()
+
+    def test_toggle_like_bumps_feed_version(
+        self, review_service, mock_review_crud, mock_like_crud, mock_feed_cache,
+        sample_review, sample_user
+    ):
+        mock_review_crud.get.return_value = sample_review
+        mock_like_crud.toggle_like.return_value = (True, 6)
+
+        review_service.toggle_like(1, sample_user)
+
+        mock_feed_cache.bump.assert_called_once()
+
+    def test_delete_bumps_feed_version(
+        self, review_service, mock_review_crud, mock_feed_cache, sample_review, sample_user
+    ):
+        mock_review_crud.get.return_value = sample_review
+
+        review_service.delete_review(1, sample_user)
+
+        mock_feed_cache.bump.assert_called_once()
@@ -37,23 +37,21 @@ class TestUserService:
         self.service.user_crud.get_by_username = Mock(return_value=None)
         self.service.user_crud.create = Mock(return_value=mock_user)
         
-        with patch('app.services.user_service.hash_password') as mock_hash:
-            mock_hash.return_value = "hashed_password"
-            with patch('app.services.user_service.create_access_token') as mock_token:
-                mock_token.return_value = "test_token"
-                
-                result = self.service.register_user(user_data)
-                
-                assert isinstance(result, Token)
-                assert result.access_token == "test_token"
-                assert result.token_type == "bearer"
-                
-                self.service.user_crud.create.assert_called_once_with(
-                    db=self.mock_db,
-                    username="newuser",
-                    password_hash="hashed_password",
-                    role=Role.USER
-                )
+        with patch('app.services.user_service.create_access_token') as mock_token:
+            mock_token.return_value = "test_token"
+            
+            result = self.service.register_user(user_data, "hashed_password")
+            
+            assert isinstance(result, Token)
+            assert result.access_token == "test_token"
+            assert result.token_type == "bearer"
+            
+            self.service.user_crud.create.assert_called_once_with(
+                db=self.mock_db,
+                username="newuser",
+                password_hash="hashed_password",
+                role=Role.USER
+            )
     
     def test_register_user_already_exists(self):
 
@@ -62,40 +60,39 @@ class TestUserService:
         self.service.user_crud.get_by_username = Mock(return_value=mock_user)
         
         with pytest.raises(UserAlreadyExistsError):
-            self.service.register_user(user_data)
+            self.service.register_user(user_data, "hashed_password")
+    
+    def test_ensure_username_available_rejects_taken_name(self):
+
+        self.service.user_crud.get_by_username = Mock(return_value=User(id=1, username="taken"))
+        
+        with pytest.raises(UserAlreadyExistsError):
+            self.service.ensure_username_available("taken")
     
-    def test_login_user_success(self):
+    def test_get_login_user_success(self):
         
-        credentials = UserCreate(username="testuser", password="password123")
         mock_user = User(id=1, username="testuser", password_hash="hashed_password")
         self.service.user_crud.get_by_username = Mock(return_value=mock_user)
-        with patch('app.services.user_service.verify_password') as mock_verify:
-            mock_verify.return_value = True
-            with patch('app.services.user_service.create_access_token') as mock_token:
-                mock_token.return_value = "test_token"
-                
-                result = self.service.login_user(credentials)
-                
-                assert result.access_token == "test_token"
+        
+        assert self.service.get_login_user("testuser") is mock_user
     
-    def test_login_user_not_found(self):
+    def test_get_login_user_not_found(self):
         
-        credentials = UserCreate(username="nonexistent", password="password123")
         self.service.user_crud.get_by_username = Mock(return_value=None)
         
         with pytest.raises(AuthenticationError):
-            self.service.login_user(credentials)
+            self.service.get_login_user("nonexistent")
 
-    def test_login_user_invalid_credentials(self):
+    def test_issue_token(self):
         
-        credentials = UserCreate(username="testuser", password="wrongpassword")
-        mock_user = User(id=1, username="testuser", password_hash="hashed_password")
-        self.service.user_crud.get_by_username = Mock(return_value=mock_user)
-        with patch('app.services.user_service.verify_password') as mock_verify:
-            mock_verify.return_value = False
+        mock_user = User(id=1, username="testuser")
+        with patch('app.services.user_service.create_access_token') as mock_token:
+            mock_token.return_value = "test_token"
             
-            with pytest.raises(AuthenticationError):
-                self.service.login_user(credentials)
+            result = self.service.issue_token(mock_user)
+            
+        assert result.access_token == "test_token"
+        mock_token.assert_called_once_with(data={"sub": "1"})
     
     def test_get_current_user_info(self):
         
@@ -106,3 +103,41 @@ class TestUserService:
         assert result.id == 1
         assert result.username == "testuser"
         assert result.role == Role.USER
+
+    def test_token_claims_include_role_in_claims_mode(self):
+
+        user = User(id=3, username="critic", role=Role.ADMIN)
+
+        with patch('app.services.user_service.settings') as mock_settings:
+            mock_settings.JWT_CLAIMS_AUTH = True
+            claims = self.service._token_claims(user)
+
+        assert claims == {"sub": "3", "username": "critic", "role": "admin"}
+
+    def test_token_claims_only_carry_subject_by_default(self):
+
+        user = User(id=3, username="critic", role=Role.ADMIN)
+
+        with patch('app.services.user_service.settings') as mock_settings:
+            mock_settings.JWT_CLAIMS_AUTH = False
+            claims = self.service._token_claims(user)
+
+        assert claims == {"sub": "3"}
+
+    def test_logout_revokes_token(self):
+
+        self.service.revoked_token_crud = Mock()
+
+        with patch('app.services.user_service.token_denylist') as mock_denylist:
+            self.service.logout({"sub": "3", "jti": "abc", "exp": 1792281600})
+
+        add_kwargs = self.service.revoked_token_crud.add.call_args.kwargs
+        assert add_kwargs["jti"] == "abc"
+        assert add_kwargs["user_id"] == 3
+        assert add_kwargs["expires_at"].timestamp() == 1792281600
+        mock_denylist.add.assert_called_once_with("abc", add_kwargs["expires_at"])
+
+    def test_logout_without_jti_is_rejected(self):
+
+        with pytest.raises(AuthenticationError):
+            self.service.logout({"sub": "3", "exp": 1792281600})
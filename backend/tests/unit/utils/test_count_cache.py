@@ -0,0 +1,32 @@
+from unittest.mock import patch
+
+from app.utils.count_cache import TTLCountCache
+
+
+class TestTTLCountCache:
+    def test_hit_before_expiry(self):
+
+        cache = TTLCountCache(ttl_seconds=10, max_entries=10)
+        cache.set(("public", None, None), 42)
+
+        assert cache.get(("public", None, None)) == 42
+
+    def test_entry_expires(self):
+
+        cache = TTLCountCache(ttl_seconds=10, max_entries=10)
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("key", 1)
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=111.0):
+            assert cache.get("key") is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+
+        cache = TTLCountCache(ttl_seconds=10, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
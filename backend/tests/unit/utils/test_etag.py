@@ -0,0 +1,30 @@
+import pytest
+
+from app.utils.etag import etag_matches, make_etag
+
+
+class TestMakeEtag:
+    def test_is_quoted_and_stable(self):
+
+        etag = make_etag("review", 1, 3)
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert make_etag("review", 1, 3) == etag
+        assert make_etag("review", 1, 4) != etag
+
+
+class TestEtagMatches:
+    @pytest.mark.parametrize("header", [
+        '"abc"',
+        'W/"abc"',
+        '"other", "abc"',
+        "*",
+    ])
+    def test_matching_headers(self, header):
+
+        assert etag_matches(header, '"abc"')
+
+    @pytest.mark.parametrize("header", [None, "", '"other"', "abc"])
+    def test_non_matching_headers(self, header):
+
+        assert not etag_matches(header, '"abc"')
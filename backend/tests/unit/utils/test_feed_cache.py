@@ -0,0 +1,133 @@
+from unittest.mock import patch
+
+import app.schemas.review as review_schemas
+from app.utils.feed_cache import InMemorySharedFeedCache, PublicFeedCache, load_shared_backend
+
+
+def _params(**overrides) -> review_schemas.PublicPaginationParams:
+    return review_schemas.PublicPaginationParams(**overrides)
+
+
+class TestPublicFeedCache:
+    def test_miss_then_hit(self):
+
+        cache = PublicFeedCache(ttl_seconds=10, max_entries=10)
+        key, value = cache.lookup(_params())
+        cache.store(key, '{"reviews": []}')
+
+        assert value is None
+        assert cache.lookup(_params())[1] == '{"reviews": []}'
+
+    def test_search_is_normalized(self):
+
+        cache = PublicFeedCache(ttl_seconds=10, max_entries=10)
+
+        assert cache.lookup(_params(search=" Solaris"))[0] == cache.lookup(_params(search="solaris"))[0]
+        assert cache.lookup(_params(page=2))[0] != cache.lookup(_params(page=1))[0]
+
+    def test_bump_orphans_cached_pages(self):
+
+        cache = PublicFeedCache(ttl_seconds=10, max_entries=10)
+        key, _ = cache.lookup(_params())
+        cache.store(key, "page")
+
+        cache.bump()
+
+        assert cache.lookup(_params())[1] is None
+
+    def test_local_entries_expire(self):
+
+        cache = PublicFeedCache(ttl_seconds=10, max_entries=10)
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=100.0):
+            key, _ = cache.lookup(_params())
+            cache.store(key, "page")
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=111.0):
+            assert cache.lookup(_params())[1] is None
+
+    def test_disabled_cache_never_hits(self):
+
+        cache = PublicFeedCache(ttl_seconds=10, max_entries=10, enabled=False)
+        key, _ = cache.lookup(_params())
+        cache.store(key, "page")
+
+        assert cache.lookup(_params())[1] is None
+
+
+    def test_validator_moves_with_version(self):
+
+        cache = PublicFeedCache(ttl_seconds=10, max_entries=10, shared=InMemorySharedFeedCache())
+        before = cache.validator()
+
+        cache.bump()
+
+        assert cache.validator() != before
+
+    def test_no_validator_without_shared_tier(self):
+
+        cache = PublicFeedCache(ttl_seconds=10, max_entries=10)
+
+        assert not cache.issues_validators
+        assert cache.validator() is None
+
+    def test_shared_validator_is_common_to_workers(self):
+
+        shared = InMemorySharedFeedCache()
+        first = PublicFeedCache(ttl_seconds=10, max_entries=10, shared=shared)
+        second = PublicFeedCache(ttl_seconds=10, max_entries=10, shared=shared)
+
+        first.bump()
+
+        assert first.validator() == second.validator()
+
+
+class TestSharedTier:
+    def test_shared_hit_fills_local_tier(self):
+
+        shared = InMemorySharedFeedCache()
+        writer = PublicFeedCache(ttl_seconds=10, max_entries=10, shared=shared)
+        reader = PublicFeedCache(ttl_seconds=10, max_entries=10, shared=shared)
+        key, _ = writer.lookup(_params())
+        writer.store(key, "page")
+
+        assert reader.lookup(_params())[1] == "page"
+        shared.set(key, "changed", 10)
+        assert reader.lookup(_params())[1] == "page"
+
+    def test_bump_is_seen_by_every_worker(self):
+
+        shared = InMemorySharedFeedCache()
+        first = PublicFeedCache(ttl_seconds=10, max_entries=10, shared=shared)
+        second = PublicFeedCache(ttl_seconds=10, max_entries=10, shared=shared)
+        key, _ = second.lookup(_params())
+        second.store(key, "page")
+
+        first.bump()
+
+        assert second.lookup(_params())[1] is None
+
+    def test_in_memory_backend_expires_entries(self):
+
+        shared = InMemorySharedFeedCache()
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=100.0):
+            shared.set("key", "page", 10)
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=109.0):
+            assert shared.get("key") == "page"
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=110.0):
+            assert shared.get("key") is None
+
+    def test_in_memory_backend_is_bounded(self):
+
+        shared = InMemorySharedFeedCache(ttl_seconds=10, max_entries=2)
+        for version in range(5):
+            shared.set(f"{version}:page", "page", 10)
+
+        assert shared.get("3:page") == "page"
+        assert shared.get("0:page") is None
+        assert len(shared._values._entries) == 2
+
+    def test_backend_is_loaded_from_import_path(self):
+
+        backend = load_shared_backend("app.utils.feed_cache:InMemorySharedFeedCache")
+
+        assert isinstance(backend, InMemorySharedFeedCache)
+        assert load_shared_backend(None) is None
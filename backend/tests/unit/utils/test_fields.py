@@ -0,0 +1,30 @@
+import pytest
+
+from app.schemas.review import MyReviewResponse, ReviewResponse
+from app.utils.fields import parse_fields, selects
+from app.exceptions import InvalidFieldsError
+
+
+class TestParseFields:
+    def test_none_selects_everything(self):
+
+        assert parse_fields(None, ReviewResponse) is None
+        assert selects(None, "author")
+
+    def test_id_is_always_selected(self):
+
+        fields = parse_fields(" title ,likes,title", ReviewResponse)
+
+        assert fields == {"id", "title", "likes"}
+        assert selects(fields, "likes")
+        assert not selects(fields, "author")
+
+    @pytest.mark.parametrize("fields, model", [
+        ("title,secret", ReviewResponse),
+        ("author", MyReviewResponse),
+        (" , ", ReviewResponse),
+    ])
+    def test_invalid_selection_is_rejected(self, fields, model):
+
+        with pytest.raises(InvalidFieldsError):
+            parse_fields(fields, model)
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from prometheus_client import REGISTRY
+
+from app.db.query_tracker import RequestQueries
+from app.utils import metrics
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[3]
+
+
+class TestObserveRequest:
+    def test_request_and_sql_samples(self):
+
+        queries = RequestQueries()
+        queries.record("SELECT 1", 0.002)
+        queries.record("SELECT 2", 0.003)
+
+        metrics.observe_request("GET", "/unit/stats", 200, 0.01, queries)
+
+        labels = {"method": "GET", "route": "/unit/stats"}
+        assert REGISTRY.get_sample_value("http_request_db_queries_sum", labels) == 2
+        assert REGISTRY.get_sample_value("http_request_db_seconds_sum", labels) == 0.005
+        assert REGISTRY.get_sample_value(
+            "http_requests_total", {**labels, "status": "200"}
+        ) == 1
+
+    def test_untracked_request_skips_sql_samples(self):
+
+        metrics.observe_request("GET", "/unit/untracked", 204, 0.01, None)
+
+        labels = {"method": "GET", "route": "/unit/untracked"}
+        assert REGISTRY.get_sample_value("http_request_db_queries_count", labels) is None
+        assert REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) == 1
+
+
+class TestMultiprocess:
+    def test_workers_are_aggregated(self, tmp_path):
+
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        worker = (
+            "from app.utils import metrics\n"
+            "metrics.observe_request('GET', '/api/reviews/{review_id}', 200, 0.02, None)\n"
+        )
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", worker], cwd=BACKEND_DIR, env=env, check=True)
+        scrape = subprocess.run(
+            [sys.executable, "-c", "from app.utils import metrics; print(metrics.render()[0].decode())"],
+            cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True
+        )
+
+        assert (
+            'http_requests_total{method="GET",route="/api/reviews/{review_id}",status="200"} 2.0'
+            in scrape.stdout
+        )
@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+from app.utils.ngram import NGramIndex, trigrams
+
+
+def test_trigrams_pad_each_word():
+
+    assert trigrams("Cat") == {"  c", " ca", "cat", "at "}
+
+
+class TestNGramIndex:
+    def test_search_tolerates_a_missing_letter(self):
+
+        index = NGramIndex()
+        index.add(1, ["Interstellar", ""])
+        index.add(2, ["Inception", ""])
+
+        results = index.search("interstelar", threshold=0.3, limit=10)
+
+        assert [doc_id for doc_id, _ in results] == [1]
+
+    def test_best_field_is_used_for_score(self):
+
+        index = NGramIndex()
+        index.add(1, ["Review", "Solaris"])
+        index.add(2, ["Solar notes", "Sunshine"])
+
+        results = index.search("solaris", threshold=0.3, limit=10)
+
+        assert [doc_id for doc_id, _ in results] == [1, 2]
+        assert results[0][1] == 1.0
+
+    def test_readding_document_replaces_old_fields(self):
+
+        index = NGramIndex()
+        index.add(1, ["Stalker"])
+        index.add(1, ["Mirror"])
+
+        assert index.search("stalker", threshold=0.3, limit=10) == []
+        assert [doc_id for doc_id, _ in index.search("mirror", threshold=0.3, limit=10)] == [1]
+
+    def test_remove_and_limit(self):
+
+        index = NGramIndex()
+        for doc_id in range(1, 4):
+            index.add(doc_id, ["Solaris"])
+        index.remove(2)
+
+        results = index.search("solaris", threshold=0.3, limit=1)
+
+        assert len(index) == 2
+        assert results == [(3, 1.0)]
+
+    def test_load_replaces_documents(self):
+
+        index = NGramIndex()
+        index.add(1, ["Interstellar", ""])
+
+        index.load([(2, ["Interstellar", ""])])
+
+        assert [doc_id for doc_id, _ in index.search("interstellar", threshold=0.3, limit=10)] == [2]
+        assert len(index) == 1
+
+    def test_stale_until_loaded_and_after_refresh_interval(self):
+
+        index = NGramIndex(refresh_seconds=60)
+        assert index.is_stale()
+
+        with patch("app.utils.ngram.time.monotonic", return_value=100.0):
+            index.load([])
+        with patch("app.utils.ngram.time.monotonic", return_value=159.0):
+            assert not index.is_stale()
+        with patch("app.utils.ngram.time.monotonic", return_value=160.0):
+            assert index.is_stale()
+
+    def test_without_refresh_interval_loads_once(self):
+
+        index = NGramIndex()
+        index.load([])
+
+        assert not index.is_stale()
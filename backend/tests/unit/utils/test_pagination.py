@@ -0,0 +1,40 @@
+import pytest
+from datetime import datetime, timezone
+
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.exceptions import InvalidCursorError
+
+
+class TestCursorEncoding:
+    @pytest.mark.parametrize("sort, value", [
+        ("created_at", datetime(2026, 3, 1, 10, 30, 15, 123456, tzinfo=timezone.utc)),
+        ("likes", 42),
+    ])
+    def test_round_trip(self, sort, value):
+
+        cursor = encode_cursor(sort, "desc", (value, 17))
+
+        assert decode_cursor(cursor, sort, "desc") == (value, 17)
+
+    def test_cursor_is_url_safe(self):
+
+        cursor = encode_cursor("likes", "asc", (10 ** 9, 10 ** 9))
+
+        assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+    @pytest.mark.parametrize("sort, order", [
+        ("created_at", "desc"),
+        ("likes", "asc"),
+    ])
+    def test_mismatched_sort_is_rejected(self, sort, order):
+
+        cursor = encode_cursor("likes", "desc", (3, 1))
+
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, sort, order)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "W10", "!!!"])
+    def test_garbage_is_rejected(self, cursor):
+
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "created_at", "desc")
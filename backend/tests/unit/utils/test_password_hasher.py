@@ -0,0 +1,106 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.exceptions import ServiceUnavailableError
+from app.utils.password_hasher import PasswordHasher
+
+
+def _thread_backed(hasher: PasswordHasher) -> ThreadPoolExecutor:
+    executor = ThreadPoolExecutor(max_workers=hasher.workers)
+    hasher._get_executor = lambda: executor
+    return executor
+
+
+class TestPasswordHasher:
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_in_worker_process(self):
+
+        hasher = PasswordHasher(workers=1, max_pending=4)
+        try:
+            password_hash = await hasher.hash("password123")
+
+            assert await hasher.verify("password123", password_hash)
+            assert not await hasher.verify("wrong", password_hash)
+        finally:
+            hasher.shutdown()
+
+        stats = hasher.stats.snapshot()
+        assert stats["operations"]["hash"]["count"] == 1
+        assert stats["operations"]["verify"]["count"] == 2
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_work_beyond_max_pending(self):
+
+        hasher = PasswordHasher(workers=1, max_pending=2)
+        executor = _thread_backed(hasher)
+        release = threading.Event()
+        blocked = [
+            asyncio.create_task(hasher._run("hash", release.wait))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            await hasher._run("hash", release.wait)
+
+        release.set()
+        await asyncio.gather(*blocked)
+        executor.shutdown()
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "1"
+        stats = hasher.stats.snapshot()
+        assert stats["rejected"] == 1
+        assert stats["pending_max"] == 2
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_call_releases_its_slot(self):
+
+        hasher = PasswordHasher(workers=1, max_pending=1)
+        executor = _thread_backed(hasher)
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await hasher._run("verify", fail)
+        assert await hasher._run("verify", lambda: True)
+        executor.shutdown()
+
+        stats = hasher.stats.snapshot()
+        assert stats["pending"] == 0
+        assert stats["operations"]["verify"]["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_replaces_broken_pool(self):
+
+        hasher = PasswordHasher(workers=1, max_pending=4)
+        try:
+            with pytest.raises(ServiceUnavailableError) as exc_info:
+                await hasher._run("hash", os._exit, 1)
+            password_hash = await hasher.hash("password123")
+        finally:
+            hasher.shutdown()
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "1"
+        assert password_hash.startswith("$2")
+        assert hasher.stats.snapshot()["pending"] == 0
+
+    def test_discard_keeps_replacement_pool(self):
+
+        hasher = PasswordHasher(workers=1, max_pending=4)
+        broken = hasher._get_executor()
+        hasher._discard_executor(broken)
+        replacement = hasher._get_executor()
+
+        hasher._discard_executor(broken)
+
+        assert hasher._executor is replacement
+        hasher.shutdown()
@@ -0,0 +1,78 @@
+import logging
+
+import pytest
+
+from app.core.config import settings
+from app.db.query_tracker import RequestQueries
+from app.utils.query_budget import QueryBudgetExceeded, check_request, query_budget
+
+
+@query_budget(2)
+def budgeted_endpoint():
+    pass
+
+
+def unbudgeted_endpoint():
+    pass
+
+
+def make_queries(*statements):
+    queries = RequestQueries()
+    for statement in statements:
+        queries.record(statement, 0.001)
+    return queries
+
+
+@pytest.fixture
+def strict(monkeypatch):
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET_STRICT", True)
+    monkeypatch.setattr(settings, "SQL_REPEAT_WARNING_THRESHOLD", 3)
+
+
+class TestQueryBudget:
+    def test_decorator_marks_endpoint_without_wrapping(self):
+
+        assert budgeted_endpoint.__query_budget__ == 2
+        assert budgeted_endpoint.__name__ == "budgeted_endpoint"
+
+    def test_within_budget_passes(self, strict):
+
+        check_request("GET", "/x", budgeted_endpoint, make_queries("SELECT 1", "SELECT now()"))
+
+    def test_over_budget_raises_in_strict_mode(self, strict):
+
+        queries = make_queries("SELECT 1", "SELECT now()", "SELECT version()")
+
+        with pytest.raises(QueryBudgetExceeded, match="GET /x: 3 queries, budget is 2"):
+            check_request("GET", "/x", budgeted_endpoint, queries)
+
+    def test_endpoint_without_budget_is_not_counted(self, strict):
+
+        queries = make_queries("SELECT 1", "SELECT now()", "SELECT version()")
+
+        check_request("GET", "/x", unbudgeted_endpoint, queries)
+        check_request("GET", "/x", None, queries)
+
+    def test_repeated_statement_raises_in_strict_mode(self, strict):
+
+        queries = make_queries(*(f"SELECT * FROM users WHERE id = {n}" for n in range(3)))
+
+        with pytest.raises(QueryBudgetExceeded, match=r"possible N\+1, ran 3 times: SELECT \* FROM users WHERE id = \?"):
+            check_request("GET", "/x", unbudgeted_endpoint, queries)
+
+    def test_zero_threshold_disables_repeat_check(self, strict, monkeypatch):
+
+        monkeypatch.setattr(settings, "SQL_REPEAT_WARNING_THRESHOLD", 0)
+        queries = make_queries(*(f"SELECT {n}" for n in range(10)))
+
+        check_request("GET", "/x", unbudgeted_endpoint, queries)
+
+    def test_logs_warning_when_not_strict(self, strict, monkeypatch, caplog):
+
+        monkeypatch.setattr(settings, "SQL_QUERY_BUDGET_STRICT", False)
+        queries = make_queries("SELECT 1", "SELECT now()", "SELECT version()")
+
+        with caplog.at_level(logging.WARNING, logger="app.utils.query_budget"):
+            check_request("POST", "/y", budgeted_endpoint, queries)
+
+        assert caplog.messages == ["SQL query budget: POST /y: 3 queries, budget is 2"]
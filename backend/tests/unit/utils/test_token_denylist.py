@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from app.utils.token_denylist import TokenDenyList
+
+
+def _future() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(hours=1)
+
+
+class TestTokenDenyList:
+    def test_new_list_is_stale_until_loaded(self):
+
+        denylist = TokenDenyList(refresh_seconds=30)
+        assert denylist.is_stale()
+
+        denylist.load([])
+
+        assert not denylist.is_stale()
+
+    def test_reload_after_refresh_interval(self):
+
+        denylist = TokenDenyList(refresh_seconds=30)
+        with patch("app.utils.token_denylist.time.monotonic", return_value=100.0):
+            denylist.load([])
+        with patch("app.utils.token_denylist.time.monotonic", return_value=130.0):
+            assert denylist.is_stale()
+
+    def test_loaded_and_added_tokens_are_revoked(self):
+
+        denylist = TokenDenyList(refresh_seconds=30)
+        denylist.load([("loaded", _future().replace(tzinfo=None))])
+        denylist.add("added", _future())
+
+        assert denylist.is_revoked("loaded")
+        assert denylist.is_revoked("added")
+        assert not denylist.is_revoked("other")
+        assert not denylist.is_revoked(None)
+
+    def test_expired_entry_is_not_revoked(self):
+
+        denylist = TokenDenyList(refresh_seconds=30)
+        denylist.add("old", datetime.now(timezone.utc) - timedelta(seconds=1))
+
+        assert not denylist.is_revoked("old")
+
+    def test_reload_keeps_local_adds_missing_from_the_table(self):
+
+        denylist = TokenDenyList(refresh_seconds=30)
+        denylist.add("revoked", _future())
+
+        denylist.load([])
+
+        assert denylist.is_revoked("revoked")
+
+    def test_local_add_is_released_once_loaded(self):
+
+        denylist = TokenDenyList(refresh_seconds=30)
+        denylist.add("revoked", _future())
+        denylist.load([("revoked", _future())])
+
+        denylist.load([])
+
+        assert not denylist.is_revoked("revoked")
@@ -8,17 +8,31 @@ const api = axios.create({
   },
 });
 
+// Метка последней записи: сервер выдаёт её в ответ на изменения, а клиент
+// возвращает её, чтобы следующие чтения шли с основной базы, а не с реплики.
+const LAST_WRITE_HEADER = 'X-Last-Write';
+
 api.interceptors.request.use((config) => {
   const token = localStorage.getItem('token');
   if (token) {
     config.headers.Authorization = `Bearer ${token}`;
   }
+  const lastWrite = sessionStorage.getItem(LAST_WRITE_HEADER);
+  if (lastWrite) {
+    config.headers[LAST_WRITE_HEADER] = lastWrite;
+  }
   return config;
 });
 
 // Перехватчик ошибок
 api.interceptors.response.use(
-  (res) => res,
+  (res) => {
+    const lastWrite = res.headers?.[LAST_WRITE_HEADER.toLowerCase()];
+    if (lastWrite) {
+      sessionStorage.setItem(LAST_WRITE_HEADER, lastWrite);
+    }
+    return res;
+  },
   (err) => {
     err.uiMessage = extractError(err);
     return Promise.reject(err);